@@ -0,0 +1,31 @@
+"""keyset pagination indexes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_campaigns_published", "campaigns", ["published_at", "id"])
+    op.create_index("ix_donations_campaign_created", "donations", ["campaign_id", "created_at", "id"])
+    op.create_index("ix_donations_user_created", "donations", ["user_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_donations_user_created", table_name="donations")
+    op.drop_index("ix_donations_campaign_created", table_name="donations")
+    op.drop_index("ix_campaigns_published", table_name="campaigns")
@@ -0,0 +1,49 @@
+"""unique campaign followers and maintained follower_count
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The old check-then-insert follow could race; keep the first row of each pair
+    op.execute("""
+        DELETE f1 FROM campaign_followers f1
+        JOIN campaign_followers f2
+          ON f2.campaign_id = f1.campaign_id AND f2.user_id = f1.user_id AND f2.id < f1.id
+    """)
+    op.create_unique_constraint(
+        "uq_campaign_followers_campaign_user", "campaign_followers", ["campaign_id", "user_id"]
+    )
+    op.create_index("ix_campaign_followers_campaign_id", "campaign_followers", ["campaign_id", "id"])
+    op.add_column(
+        "campaigns", sa.Column("follower_count", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.execute("""
+        UPDATE campaigns c
+        JOIN (
+            SELECT campaign_id, COUNT(*) AS followers FROM campaign_followers GROUP BY campaign_id
+        ) f ON f.campaign_id = c.id
+        SET c.follower_count = f.followers
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("campaigns", "follower_count")
+    op.drop_index("ix_campaign_followers_campaign_id", table_name="campaign_followers")
+    op.drop_constraint("uq_campaign_followers_campaign_user", "campaign_followers", type_="unique")
@@ -0,0 +1,49 @@
+"""hourly and daily donation rollups per campaign
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bucket = sa.Enum("hour", "day")
+    op.create_table(
+        "campaign_donation_rollups",
+        sa.Column("campaign_id", sa.BigInteger(), nullable=False),
+        sa.Column("bucket", bucket, nullable=False),
+        sa.Column("bucket_start", sa.TIMESTAMP(), nullable=False),
+        sa.Column("amount", sa.DECIMAL(16, 2), nullable=False, server_default="0"),
+        sa.Column("donations", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("donors", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("campaign_id", "bucket", "bucket_start"),
+    )
+    op.create_table(
+        "campaign_donation_rollup_donors",
+        sa.Column("campaign_id", sa.BigInteger(), nullable=False),
+        sa.Column("bucket", bucket, nullable=False),
+        sa.Column("bucket_start", sa.TIMESTAMP(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("donations", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("campaign_id", "bucket", "bucket_start", "user_id"),
+    )
+    # Fill them from existing donations with scripts/rebuild_donation_rollups.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("campaign_donation_rollup_donors")
+    op.drop_table("campaign_donation_rollups")
@@ -0,0 +1,35 @@
+"""sentinel row locking the donation rollups across processes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The aggregator flush and the rollup rebuild upsert their row first
+    # thing in every transaction, so they never interleave
+    op.create_table(
+        "campaign_donation_rollup_locks",
+        sa.Column("name", sa.String(64), nullable=False),
+        sa.Column("locked_at", sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("campaign_donation_rollup_locks")
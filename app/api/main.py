@@ -1,10 +1,69 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.admission import AdmissionMiddleware, admission
 from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.core.deps import password_pool
+from app.core.metrics import MetricsMiddleware, render_prometheus
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.pool_metrics import pool_metrics
+from app.core.replicas import ReadYourWritesMiddleware, replicas
+from app.core.roles import role_registry
+from app.services.campaign_leaderboards import campaign_leaderboards
+from app.services.campaign_search import campaign_search
+from app.services.donation_aggregator import donation_aggregator
+from app.services.hospital_geo import hospital_geo_index
+from app.services.score_snapshots import score_refresher
 from app.api.router import api_router
+from app.api.v1.scores import GENERATED_AT_HEADER
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm in-memory registries; each one also loads lazily if this fails
+    registries = (
+        ("role registry", role_registry),
+        ("hospital spatial index", hospital_geo_index),
+        ("campaign search index", campaign_search),
+        ("campaign leaderboards", campaign_leaderboards),
+    )
+    for name, registry in registries:
+        try:
+            async with SessionLocal() as db:
+                await registry.load(db)
+        except Exception:
+            logger.exception("Could not preload %s", name)
+    try:
+        await donation_aggregator.reconcile()
+    except Exception:
+        logger.exception("Could not reconcile un-applied donations")
+    await replicas.check()
+    replicas.start()
+    donation_aggregator.start()
+    score_refresher.start()
+    campaign_leaderboards.start()
+    campaign_search.start()
+    hospital_geo_index.start()
+    yield
+    await hospital_geo_index.stop()
+    await campaign_search.stop()
+    await campaign_leaderboards.stop()
+    await score_refresher.stop()
+    await donation_aggregator.stop()
+    await replicas.stop()
+    password_pool.shutdown()
 
-app = FastAPI(title=settings.app_name, debug=settings.debug)
 
+app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
+
+# Innermost, so shed and rate-limited responses still get CORS headers
+app.add_middleware(AdmissionMiddleware)
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -12,6 +71,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, GENERATED_AT_HEADER, "ETag", "Retry-After"],
 )
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware)
+# Outermost, so its latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router, prefix=settings.api_v1_prefix)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str | None = Header(default=None)):
+    """Prometheus text exposition of this worker's request, pool and admission metrics."""
+    if settings.metrics_token and authorization != f"Bearer {settings.metrics_token}":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+    body = render_prometheus(extra=[
+        *pool_metrics.prometheus_lines(engine.sync_engine.pool),
+        *admission.prometheus_lines(),
+    ])
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .v1 import health, users, hospitals, campaigns, scores, auth, donations
+from .v1 import health, users, hospitals, campaigns, scores, auth, donations, admin
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="/health", tags=["health"])
@@ -9,3 +9,4 @@ api_router.include_router(hospitals.router, prefix="/hospitals", tags=["hospital
 api_router.include_router(campaigns.router, prefix="/campaigns", tags=["campaigns"])
 api_router.include_router(donations.router, prefix="/donations", tags=["donations"])
 api_router.include_router(scores.router, prefix="/scores", tags=["scores"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,117 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.admission import admission
+from app.core.db import engine, get_db
+from app.core.deps import clear_principals, password_pool, principal_cache, require_admin
+from app.core.metrics import TimedRoute
+from app.core.pool_metrics import pool_metrics
+from app.core.query_budget import query_budget
+from app.core.replicas import replicas
+from app.core.resolvers import campaign_resolver, hospital_resolver
+from app.core.response_cache import invalidate, response_cache
+from app.core.roles import role_registry
+from app.models.user import User
+from app.services.campaign_leaderboards import campaign_leaderboards
+from app.services.campaign_search import campaign_search
+from app.services.donation_aggregator import donation_aggregator
+from app.services.hospital_geo import hospital_geo_index
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/caches")
+@query_budget(0)
+async def cache_stats(current_user: Annotated[User, Depends(require_admin)]):
+    """Report size and hit/miss counters of the in-process caches."""
+    return {
+        "principals": principal_cache.stats(),
+        "password_pool": password_pool.stats(),
+        "campaign_ids": campaign_resolver.cache.stats(),
+        "hospital_ids": hospital_resolver.cache.stats(),
+        "responses": response_cache.stats(),
+        "campaign_search": campaign_search.stats(),
+        "hospital_geo": hospital_geo_index.stats(),
+        "leaderboards": campaign_leaderboards.stats(),
+    }
+
+
+@router.post("/search/rebuild")
+@query_budget(1)
+async def rebuild_search_index(
+    current_user: Annotated[User, Depends(require_admin)],
+    db: AsyncSession = Depends(get_db)
+):
+    """Rebuild the campaign search index from the campaigns table."""
+    await campaign_search.load(db)
+    invalidate("campaigns:list")
+    return campaign_search.stats()
+
+
+@router.post("/roles/refresh")
+@query_budget(1)
+async def refresh_roles(
+    current_user: Annotated[User, Depends(require_admin)],
+    db: AsyncSession = Depends(get_db)
+):
+    """Reload the in-memory role registry from the roles table."""
+    await role_registry.load(db)
+    invalidate("roles")
+    # Cached principals were authorized against the old roles
+    clear_principals()
+    return role_registry.all()
+
+
+@router.get("/donations/aggregator")
+@query_budget(0)
+async def aggregator_stats(current_user: Annotated[User, Depends(require_admin)]):
+    """Report the write-behind amount_raised aggregator's queue and counters."""
+    return donation_aggregator.stats()
+
+
+@router.post("/donations/aggregator/flush")
+async def flush_aggregator(current_user: Annotated[User, Depends(require_admin)]):
+    """Apply queued donations to amount_raised now."""
+    deltas = await donation_aggregator.flush()
+    return {"campaigns_updated": len(deltas)}
+
+
+@router.post("/donations/rollups/rebuild")
+async def rebuild_donation_rollups(
+    current_user: Annotated[User, Depends(require_admin)],
+    campaign_id: int | None = None
+):
+    """Rebuild the hourly/daily donation rollups from the donations table, for one or all campaigns."""
+    return await donation_aggregator.rebuild_rollups(campaign_id)
+
+
+@router.get("/donations/rollups/check")
+async def check_donation_rollups(
+    current_user: Annotated[User, Depends(require_admin)],
+    campaign_id: int | None = None
+):
+    """Compare the donation rollups with the donations table and list mismatched buckets."""
+    return await donation_aggregator.check_rollups(campaign_id)
+
+
+@router.get("/db/pool")
+@query_budget(0)
+async def pool_stats(current_user: Annotated[User, Depends(require_admin)]):
+    """Report this worker's connection pool usage, checkout waits and churn."""
+    return pool_metrics.stats(engine.sync_engine.pool)
+
+
+@router.get("/db/replicas")
+@query_budget(0)
+async def replica_stats(current_user: Annotated[User, Depends(require_admin)]):
+    """Report read replica health as seen by this worker."""
+    return replicas.stats()
+
+
+@router.get("/admission")
+@query_budget(0)
+async def admission_stats(current_user: Annotated[User, Depends(require_admin)]):
+    """Report this worker's admission classes (active, queue depth, shed counts) and rate limits."""
+    return admission.stats()
@@ -10,18 +10,21 @@ from app.core.db import get_db
 from app.core.deps import (
     create_access_token,
     get_current_active_user,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     generate_uuid
 )
+from app.core.metrics import TimedRoute
+from app.core.query_budget import query_budget
+from app.core.roles import role_registry
 from app.models.user import User
-from app.models.role import Role
 from app.schemas.user import UserRegister, UserLogin, Token, User as UserSchema, UserMe
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/register", response_model=UserSchema)
+@query_budget(3)
 async def register(
     user_data: UserRegister,
     db: AsyncSession = Depends(get_db)
@@ -36,15 +39,14 @@ async def register(
         )
     
     # Verify role exists
-    role_result = await db.execute(select(Role).where(Role.id == user_data.role_id))
-    if not role_result.scalar_one_or_none():
+    if await role_registry.resolve(user_data.role_id, db) is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid role ID"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     new_user = User(
         uuid=generate_uuid(),
@@ -63,6 +65,7 @@ async def register(
 
 
 @router.post("/login", response_model=Token)
+@query_budget(1)
 async def login(
     user_credentials: UserLogin,
     db: AsyncSession = Depends(get_db)
@@ -72,7 +75,7 @@ async def login(
     result = await db.execute(select(User).where(User.email == user_credentials.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    if not user or not await verify_password_async(user_credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -89,16 +92,13 @@ async def login(
 
 
 @router.get("/me", response_model=UserMe)
+@query_budget(0)
 async def get_current_user_info(
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user information."""
-    # Get role name
-    role_result = await db.execute(select(Role).where(Role.id == current_user.role_id))
-    role = role_result.scalar_one_or_none()
-    
     user_data = UserMe.model_validate(current_user)
-    user_data.role_name = role.name if role else None
+    user_data.role_name = await role_registry.resolve(current_user.role_id, db)
     
     return user_data
\ No newline at end of file
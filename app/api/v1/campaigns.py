@@ -1,24 +1,48 @@
-from typing import List, Annotated, Optional
+import asyncio
+from datetime import datetime
+from typing import List, Annotated, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text, or_, and_
+from sqlalchemy import delete, insert, select, update, or_
 
+from app.core.config import settings
 from app.core.db import get_db
+from app.core.fast_json import FieldSelection, RowEncoder, dumps, json_response
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    set_next_cursor
+)
+from app.core.query_budget import query_budget
+from app.core.replicas import get_read_db, reads_pinned, replicas
+from app.core.resolvers import campaign_resolver, read_campaign_id, resolve_campaign_id
+from app.core.response_cache import CachedRoute, cache_response, invalidate
 from app.core.deps import (
     get_current_active_user,
     require_hospital_contact,
-    require_admin,
-    generate_uuid
+    require_admin
 )
 from app.models.user import User
 from app.models.campaign import Campaign
-from app.models.donation import CampaignImage, CampaignDocument, CampaignFollower
+from app.models.donation import (
+    CampaignDocument,
+    CampaignDonationRollup,
+    CampaignFollower,
+    CampaignImage,
+    Donation
+)
 from app.schemas.campaign import (
+    CampaignBulkCreate,
     CampaignCreate,
     CampaignUpdate,
     Campaign as CampaignSchema,
+    CampaignFull,
+    CampaignLeaderboardRanks,
     CampaignList,
+    LeaderboardEntry,
     CampaignImage as CampaignImageSchema,
     CampaignImageCreate,
     CampaignDocument as CampaignDocumentSchema,
@@ -26,116 +50,278 @@ from app.schemas.campaign import (
     CampaignFollower as CampaignFollowerSchema,
     CampaignFollowerCreate
 )
+from app.schemas.donation import DonationBucket
+from app.services.campaign_leaderboards import campaign_leaderboards
+from app.services.campaign_search import campaign_search
+from app.services.campaign_slugs import insert_campaigns
+
+router = APIRouter(route_class=CachedRoute)
+campaign_fields = FieldSelection(CampaignSchema, default=CampaignList)
+campaign_detail_fields = FieldSelection(CampaignSchema)
+follower_list_json = RowEncoder(CampaignFollowerSchema)
+donation_bucket_json = RowEncoder(DonationBucket)
+campaign_list_json = campaign_fields.default
+# Always fetched for keyset cursors and search ordering, even when not requested
+CURSOR_COLUMNS = ("published_at", "id")
+# Each /full request runs this many queries at once, each holding a connection;
+# capping concurrent fan-outs keeps them from filling the pool and waiting on each other
+FULL_VIEW_QUERIES = 3
+full_view_slots = asyncio.Semaphore(max(1, (settings.db_pool_size + settings.db_max_overflow) // FULL_VIEW_QUERIES))
+
 
-router = APIRouter()
+def campaign_tag(request) -> list[str]:
+    """Cache tag for a campaign path reference, keyed by numeric id once resolved."""
+    ref = request.path_params["campaign_id"]
+    return [f"campaign:{campaign_resolver.peek(ref, ref)}"]
 
 
 @router.get("/", response_model=List[CampaignList])
+@cache_response(ttl=30, tags=lambda request: ["campaigns:list"])
+@query_budget(1)
 async def list_campaigns(
+    response: Response,
     q: str | None = Query(default=None, description="Search query"),
     status: str | None = None,
+    urgency: str | None = None,
+    city: str | None = None,
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor of the previous page"),
+    encoder: RowEncoder = Depends(campaign_fields),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get list of campaigns with optional search and filtering."""
+    """Get list of campaigns with optional search and filtering.
+
+    With ``q`` results come from the in-process search index, best match first.
+    ``fields`` selects which campaign fields to return.
+    """
     if q:
-        # Use fulltext search for MySQL
-        stmt = text("""
-            SELECT id, uuid, slug, title, short_description, urgency, 
-                   target_amount, amount_raised, verified, status, published_at
-            FROM campaigns
-            WHERE MATCH(title, short_description, full_description) AGAINST (:q IN BOOLEAN MODE)
-              AND deleted_at IS NULL
-            ORDER BY published_at DESC NULLS LAST, id DESC
-            LIMIT :limit OFFSET :skip
-        """)
-        result = await db.execute(stmt, {"q": q, "limit": limit, "skip": skip})
-        rows = result.mappings().all()
-        return [CampaignList.model_validate(dict(row)) for row in rows]
+        return await search_campaigns(
+            response, q, skip, limit, cursor, db, encoder, status=status, urgency=urgency, city=city
+        )
     
-    # Regular filtering
-    stmt = select(Campaign).where(Campaign.deleted_at.is_(None))
+    stmt = select(*encoder.columns(Campaign, *CURSOR_COLUMNS)).where(Campaign.deleted_at.is_(None))
     
     if status:
         stmt = stmt.where(Campaign.status == status)
+    if urgency:
+        stmt = stmt.where(Campaign.urgency == urgency)
+    if city:
+        stmt = stmt.where(Campaign.city == city)
+    
+    if cursor:
+        stmt = stmt.where(
+            keyset_after(
+                Campaign.published_at, Campaign.id, decode_cursor("campaigns", cursor), nullable=True
+            )
+        )
+    elif skip:
+        stmt = stmt.offset(skip)
     
-    stmt = stmt.order_by(Campaign.published_at.desc(), Campaign.id.desc())
-    stmt = stmt.offset(skip).limit(limit)
+    stmt = stmt.order_by(Campaign.published_at.desc(), Campaign.id.desc()).limit(limit)
     
-    result = await db.execute(stmt)
-    campaigns = result.scalars().all()
-    return campaigns
+    rows = (await db.execute(stmt)).all()
+    set_next_cursor(response, "campaigns", rows, limit, "published_at", "id")
+    return json_response(encoder.encode(rows), response)
+
+
+async def search_campaigns(
+    response: Response,
+    q: str,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    db: AsyncSession,
+    encoder: RowEncoder,
+    **filters
+):
+    """Rank campaigns with the search index, then load the page's rows in one query."""
+    if not campaign_search.loaded:
+        await campaign_search.load(db)
+    
+    offset = skip
+    if cursor:
+        cursor_q, offset = decode_cursor("campaign-search", cursor)
+        if cursor_q != q:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    ids = campaign_search.search(q, limit=limit, offset=offset, **filters)
+    if not ids:
+        return []
+    result = await db.execute(
+        select(*encoder.columns(Campaign, "id")).where(Campaign.id.in_(ids), Campaign.deleted_at.is_(None))
+    )
+    by_id = {row.id: row for row in result}
+    if len(ids) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor("campaign-search", q, offset + limit)
+    rows = [by_id[campaign_id] for campaign_id in ids if campaign_id in by_id]
+    return json_response(encoder.encode(rows), response)
+
+
+@router.get("/leaderboards/{board}", response_model=List[LeaderboardEntry])
+# The boards' one streamed load, on a worker whose lifespan preload failed
+@query_budget(1)
+async def get_leaderboard(
+    board: Literal["closest_to_goal", "most_funded_today", "most_urgent_underfunded"],
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Top published campaigns on a funding leaderboard, from the in-memory ranking."""
+    if not campaign_leaderboards.loaded:
+        await campaign_leaderboards.load(db)
+    return json_response(dumps(campaign_leaderboards.page(board, skip, limit)))
+
+
+@router.get("/{campaign_id}/leaderboards", response_model=CampaignLeaderboardRanks)
+# Resolving the campaign, plus the boards' load on a worker whose preload failed
+@query_budget(2)
+async def get_campaign_leaderboard_ranks(
+    numeric_id: Annotated[int, Depends(read_campaign_id)],
+    db: AsyncSession = Depends(get_read_db)
+):
+    """A campaign's rank on each leaderboard; null where it does not take part."""
+    if not campaign_leaderboards.loaded:
+        await campaign_leaderboards.load(db)
+    return campaign_leaderboards.ranks(numeric_id)
 
 
 @router.get("/{campaign_id}", response_model=CampaignSchema)
+@cache_response(ttl=60, tags=campaign_tag)
+@query_budget(1)
 async def get_campaign(
     campaign_id: str,
-    db: AsyncSession = Depends(get_db)
+    encoder: RowEncoder = Depends(campaign_detail_fields),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get a specific campaign by ID or UUID."""
-    query = select(Campaign).where(Campaign.deleted_at.is_(None))
-    
-    if campaign_id.isdigit():
-        query = query.where(Campaign.id == int(campaign_id))
-    else:
-        query = query.where(Campaign.uuid == campaign_id)
-    
-    result = await db.execute(query)
-    campaign = result.scalar_one_or_none()
-    
-    if not campaign:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Campaign not found"
+    """Get a specific campaign by ID, UUID or slug, optionally only some ``fields``."""
+    # uuid and slug are always selected so the resolver caches every reference,
+    # which keeps campaign_tag keyed by id and invalidated by writes
+    row = await campaign_resolver.fetch_columns(campaign_id, db, encoder.columns(Campaign, "id", "uuid", "slug"))
+    return json_response(encoder.encode_one(row))
+
+
+@router.get("/{campaign_id}/full", response_model=CampaignFull)
+@cache_response(ttl=30, tags=campaign_tag)
+@query_budget(4)
+async def get_campaign_full(
+    campaign_id: str,
+    request: Request,
+    donations: int = Query(default=10, ge=0, le=100, description="Number of latest donations to include"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a campaign with its images, documents and latest donations.
+
+    The campaign is resolved once; the three sub-queries then run concurrently,
+    each on its own pooled session.
+    """
+    campaign = await campaign_resolver.fetch(campaign_id, db)
+    # End the read transaction so no connection is held while waiting for a slot
+    await db.commit()
+    primary = reads_pinned(request)
+    
+    async def read(stmt):
+        async with replicas.session(primary=primary) as session:
+            return (await session.execute(stmt)).scalars().all()
+    
+    async with full_view_slots:
+        images, documents, recent_donations = await asyncio.gather(
+            read(select(CampaignImage).where(CampaignImage.campaign_id == campaign.id)),
+            read(select(CampaignDocument).where(CampaignDocument.campaign_id == campaign.id)),
+            read(
+                select(Donation)
+                .where(Donation.campaign_id == campaign.id)
+                .order_by(Donation.created_at.desc(), Donation.id.desc())
+                .limit(donations)
+            ),
         )
     
-    return campaign
+    return {
+        "campaign": campaign,
+        "images": images,
+        "documents": documents,
+        "recent_donations": recent_donations,
+    }
+
+
+@router.get("/{campaign_id}/donations/stats", response_model=List[DonationBucket])
+@cache_response(ttl=60, tags=campaign_tag)
+@query_budget(1)
+async def get_campaign_donation_stats(
+    numeric_id: Annotated[int, Depends(read_campaign_id)],
+    bucket: Literal["hour", "day"] = "day",
+    created_from: datetime | None = Query(default=None, alias="from"),
+    created_to: datetime | None = Query(default=None, alias="to"),
+    limit: int = Query(default=500, ge=1, le=5000, description="Latest buckets to return"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Donation totals, counts and unique donors per hour or day (UTC), oldest first.
+
+    Served from the pre-aggregated rollups, which include donations once
+    they are applied to ``amount_raised``; buckets without donations are omitted.
+    """
+    stmt = select(*donation_bucket_json.columns(CampaignDonationRollup)).where(
+        CampaignDonationRollup.campaign_id == numeric_id,
+        CampaignDonationRollup.bucket == bucket,
+        CampaignDonationRollup.donations > 0,
+    )
+    if created_from is not None:
+        stmt = stmt.where(CampaignDonationRollup.bucket_start >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(CampaignDonationRollup.bucket_start < created_to)
+    
+    rows = (await db.execute(
+        stmt.order_by(CampaignDonationRollup.bucket_start.desc()).limit(limit)
+    )).all()
+    return json_response(donation_bucket_json.encode(reversed(rows)))
 
 
 @router.post("/", response_model=CampaignSchema)
+@query_budget(3)
 async def create_campaign(
     campaign_data: CampaignCreate,
     current_user: Annotated[User, Depends(require_hospital_contact)],
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new campaign. Requires admin/superadmin/hospital_contact role."""
-    # Generate slug from title if not provided
-    import re
-    slug = re.sub(r'[^a-zA-Z0-9\s]', '', campaign_data.title.lower())
-    slug = re.sub(r'\s+', '-', slug)
-    
-    # Check if slug is unique
-    counter = 1
-    original_slug = slug
-    while True:
-        result = await db.execute(
-            select(Campaign).where(
-                Campaign.slug == slug,
-                Campaign.deleted_at.is_(None)
-            )
-        )
-        if not result.scalar_one_or_none():
-            break
-        slug = f"{original_slug}-{counter}"
-        counter += 1
-    
-    # Create new campaign
-    new_campaign = Campaign(
-        uuid=generate_uuid(),
-        slug=slug,
-        created_by=current_user.id,
-        **campaign_data.model_dump()
+    [new_campaign] = await insert_campaigns(
+        db, [{"created_by": current_user.id, **campaign_data.model_dump()}]
     )
-    
-    db.add(new_campaign)
-    await db.commit()
-    await db.refresh(new_campaign)
+    campaign_search.upsert(new_campaign)
+    campaign_leaderboards.upsert(new_campaign)
+    invalidate("campaigns:list")
     
     return new_campaign
 
 
+@router.post("/bulk", response_model=List[CampaignSchema])
+@query_budget(3)
+async def bulk_create_campaigns(
+    bulk_data: CampaignBulkCreate,
+    current_user: Annotated[User, Depends(require_hospital_contact)],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create up to 500 campaigns in one transaction. Requires admin/superadmin/hospital_contact role.
+
+    Slugs for the whole batch are allocated with a single query.
+    """
+    campaigns = await insert_campaigns(
+        db, [{"created_by": current_user.id, **item.model_dump()} for item in bulk_data.campaigns]
+    )
+    for campaign in campaigns:
+        campaign_search.upsert(campaign)
+        campaign_leaderboards.upsert(campaign)
+    invalidate("campaigns:list")
+    
+    return campaigns
+
+
 @router.patch("/{campaign_id}", response_model=CampaignSchema)
+# Fetch, update and refresh, plus the principal lookup on a worker that has not seen the user
+@query_budget(4)
 async def update_campaign(
     campaign_id: str,
     campaign_data: CampaignUpdate,
@@ -143,86 +329,55 @@ async def update_campaign(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a campaign. Requires admin/superadmin/hospital_contact role."""
-    # Find campaign
-    query = select(Campaign).where(Campaign.deleted_at.is_(None))
-    
-    if campaign_id.isdigit():
-        query = query.where(Campaign.id == int(campaign_id))
-    else:
-        query = query.where(Campaign.uuid == campaign_id)
-    
-    result = await db.execute(query)
-    campaign = result.scalar_one_or_none()
-    
-    if not campaign:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Campaign not found"
-        )
+    campaign = await campaign_resolver.fetch(campaign_id, db)
     
     # Update fields
     update_data = campaign_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(campaign, field, value)
+    # Same clock as the score snapshots compare against
+    campaign.updated_at = datetime.utcnow()
     
     await db.commit()
     await db.refresh(campaign)
+    campaign_search.upsert(campaign)
+    campaign_leaderboards.upsert(campaign)
+    invalidate(f"campaign:{campaign.id}", "campaigns:list")
     
     return campaign
 
 
 @router.delete("/{campaign_id}")
+@query_budget(2)
 async def delete_campaign(
     campaign_id: str,
     current_user: Annotated[User, Depends(require_admin)],
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a campaign. Requires admin/superadmin role."""
-    # Find campaign
-    query = select(Campaign).where(Campaign.deleted_at.is_(None))
-    
-    if campaign_id.isdigit():
-        query = query.where(Campaign.id == int(campaign_id))
-    else:
-        query = query.where(Campaign.uuid == campaign_id)
-    
-    result = await db.execute(query)
-    campaign = result.scalar_one_or_none()
-    
-    if not campaign:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Campaign not found"
-        )
+    campaign = await campaign_resolver.fetch(campaign_id, db)
     
     # Soft delete
     from datetime import datetime
     campaign.deleted_at = datetime.utcnow()
     
     await db.commit()
+    campaign_resolver.forget(campaign)
+    campaign_search.remove(campaign.id)
+    campaign_leaderboards.remove(campaign.id)
+    invalidate(f"campaign:{campaign.id}", "campaigns:list")
     
     return {"message": "Campaign deleted successfully"}
 
 
 # Campaign Images endpoints
 @router.get("/{campaign_id}/images", response_model=List[CampaignImageSchema])
+@query_budget(1)
 async def get_campaign_images(
-    campaign_id: str,
-    db: AsyncSession = Depends(get_db)
+    numeric_id: Annotated[int, Depends(read_campaign_id)],
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all images for a campaign."""
-    # First verify campaign exists
-    await get_campaign(campaign_id, db)
-    
-    # Get campaign numeric ID
-    if campaign_id.isdigit():
-        numeric_id = int(campaign_id)
-    else:
-        campaign_result = await db.execute(
-            select(Campaign.id).where(Campaign.uuid == campaign_id)
-        )
-        numeric_id = campaign_result.scalar_one()
-    
     result = await db.execute(
         select(CampaignImage).where(CampaignImage.campaign_id == numeric_id)
     )
@@ -231,47 +386,35 @@ async def get_campaign_images(
 
 
 @router.post("/{campaign_id}/images", response_model=CampaignImageSchema)
+@query_budget(2)
 async def add_campaign_image(
-    campaign_id: str,
+    numeric_id: Annotated[int, Depends(resolve_campaign_id)],
     image_data: CampaignImageCreate,
     current_user: Annotated[User, Depends(require_hospital_contact)],
     db: AsyncSession = Depends(get_db)
 ):
     """Add an image to a campaign."""
-    # Verify campaign exists and get numeric ID
-    campaign = await get_campaign(campaign_id, db)
-    
     new_image = CampaignImage(
-        campaign_id=campaign.id,
+        campaign_id=numeric_id,
         **image_data.model_dump()
     )
     
     db.add(new_image)
     await db.commit()
     await db.refresh(new_image)
+    invalidate(f"campaign:{numeric_id}")
     
     return new_image
 
 
 # Campaign Documents endpoints
 @router.get("/{campaign_id}/documents", response_model=List[CampaignDocumentSchema])
+@query_budget(1)
 async def get_campaign_documents(
-    campaign_id: str,
-    db: AsyncSession = Depends(get_db)
+    numeric_id: Annotated[int, Depends(read_campaign_id)],
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all documents for a campaign."""
-    # First verify campaign exists
-    await get_campaign(campaign_id, db)
-    
-    # Get campaign numeric ID
-    if campaign_id.isdigit():
-        numeric_id = int(campaign_id)
-    else:
-        campaign_result = await db.execute(
-            select(Campaign.id).where(Campaign.uuid == campaign_id)
-        )
-        numeric_id = campaign_result.scalar_one()
-    
     result = await db.execute(
         select(CampaignDocument).where(CampaignDocument.campaign_id == numeric_id)
     )
@@ -280,87 +423,117 @@ async def get_campaign_documents(
 
 
 @router.post("/{campaign_id}/documents", response_model=CampaignDocumentSchema)
+@query_budget(2)
 async def add_campaign_document(
-    campaign_id: str,
+    numeric_id: Annotated[int, Depends(resolve_campaign_id)],
     document_data: CampaignDocumentCreate,
     current_user: Annotated[User, Depends(require_hospital_contact)],
     db: AsyncSession = Depends(get_db)
 ):
     """Add a document to a campaign."""
-    # Verify campaign exists and get numeric ID
-    campaign = await get_campaign(campaign_id, db)
-    
     new_document = CampaignDocument(
-        campaign_id=campaign.id,
+        campaign_id=numeric_id,
         **document_data.model_dump()
     )
     
     db.add(new_document)
     await db.commit()
     await db.refresh(new_document)
+    invalidate(f"campaign:{numeric_id}")
     
     return new_document
 
 
 # Campaign Followers endpoints
 @router.get("/{campaign_id}/followers", response_model=List[CampaignFollowerSchema])
+@query_budget(1)
 async def get_campaign_followers(
-    campaign_id: str,
-    db: AsyncSession = Depends(get_db)
+    numeric_id: Annotated[int, Depends(read_campaign_id)],
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all followers for a campaign."""
-    # First verify campaign exists
-    await get_campaign(campaign_id, db)
-    
-    # Get campaign numeric ID
-    if campaign_id.isdigit():
-        numeric_id = int(campaign_id)
-    else:
-        campaign_result = await db.execute(
-            select(Campaign.id).where(Campaign.uuid == campaign_id)
-        )
-        numeric_id = campaign_result.scalar_one()
-    
-    result = await db.execute(
-        select(CampaignFollower).where(CampaignFollower.campaign_id == numeric_id)
+    """Get a page of a campaign's followers, oldest first.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next
+    one. The total is the campaign's ``follower_count``.
+    """
+    stmt = select(*follower_list_json.columns(CampaignFollower)).where(
+        CampaignFollower.campaign_id == numeric_id
     )
-    followers = result.scalars().all()
-    return followers
+    if cursor:
+        (last_id,) = decode_cursor("followers", cursor)
+        stmt = stmt.where(CampaignFollower.id > last_id)
+    elif skip:
+        stmt = stmt.offset(skip)
+    
+    rows = (await db.execute(stmt.order_by(CampaignFollower.id).limit(limit))).all()
+    set_next_cursor(response, "followers", rows, limit, "id")
+    return json_response(follower_list_json.encode(rows), response)
 
 
 @router.post("/{campaign_id}/followers", response_model=CampaignFollowerSchema)
+@query_budget(3)
 async def follow_campaign(
-    campaign_id: str,
+    numeric_id: Annotated[int, Depends(resolve_campaign_id)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db)
 ):
-    """Follow a campaign. Requires authentication."""
-    # Verify campaign exists and get numeric ID
-    campaign = await get_campaign(campaign_id, db)
+    """Follow a campaign. Requires authentication.
+
+    Idempotent: following again returns the existing follow.
+    """
+    # The unique key makes a concurrent duplicate a no-op instead of a second row
+    result = await db.execute(
+        insert(CampaignFollower)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .values(campaign_id=numeric_id, user_id=current_user.id)
+    )
+    if result.rowcount:
+        await db.execute(
+            update(Campaign)
+            .where(Campaign.id == numeric_id)
+            .values(follower_count=Campaign.follower_count + 1)
+        )
     
-    # Check if already following
-    existing = await db.execute(
+    follower = (await db.execute(
         select(CampaignFollower).where(
-            and_(
-                CampaignFollower.campaign_id == campaign.id,
-                CampaignFollower.user_id == current_user.id
-            )
+            CampaignFollower.campaign_id == numeric_id,
+            CampaignFollower.user_id == current_user.id
         )
-    )
+    )).scalar_one()
+    await db.commit()
+    if result.rowcount:
+        invalidate(f"campaign:{numeric_id}")
     
-    if existing.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Already following this campaign"
+    return follower
+
+
+@router.delete("/{campaign_id}/followers")
+@query_budget(2)
+async def unfollow_campaign(
+    numeric_id: Annotated[int, Depends(resolve_campaign_id)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_db)
+):
+    """Stop following a campaign. Requires authentication; a no-op when not following."""
+    result = await db.execute(
+        delete(CampaignFollower).where(
+            CampaignFollower.campaign_id == numeric_id,
+            CampaignFollower.user_id == current_user.id
         )
-    
-    new_follower = CampaignFollower(
-        campaign_id=campaign.id,
-        user_id=current_user.id
     )
-    
-    db.add(new_follower)
+    if result.rowcount:
+        await db.execute(
+            update(Campaign)
+            .where(Campaign.id == numeric_id, Campaign.follower_count > 0)
+            .values(follower_count=Campaign.follower_count - 1)
+        )
     await db.commit()
-    await db.refresh(new_follower)
+    if result.rowcount:
+        invalidate(f"campaign:{numeric_id}")
     
-    return new_follower
+    return {"message": "Campaign unfollowed successfully"}
@@ -1,49 +1,269 @@
-from typing import List
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, AsyncIterator, List, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.core.db import get_db
+from app.core.deps import generate_uuid, require_admin, require_donor
+from app.core.fast_json import FieldSelection, RowEncoder, json_response
+from app.core.metrics import TimedRoute
+from app.core.pagination import decode_cursor, keyset_after, set_next_cursor
+from app.core.query_budget import query_budget
+from app.core.replicas import get_read_db, replicas
+from app.core.resolvers import campaign_resolver
+from app.core.response_cache import invalidate
+from app.models.campaign import Campaign
 from app.models.donation import Donation
-from app.schemas.donation import Donation as DonationSchema, DonationList
+from app.models.user import User
+from app.schemas.donation import (
+    Donation as DonationSchema,
+    DonationCreate,
+    DonationList,
+    DonationStatusUpdate
+)
+from app.services import donation_rollups
+from app.services.campaign_leaderboards import campaign_leaderboards
+from app.services.donation_aggregator import donation_aggregator
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+# Public endpoints: only DonationList fields, never the donor or payment details
+donation_fields = FieldSelection(DonationList)
+donation_list_json = donation_fields.default
+
+
+def donations_page(criterion, skip: int, limit: int, cursor: str | None, encoder: RowEncoder = donation_list_json):
+    """Build a page of ``encoder`` rows, newest first, by cursor or by offset."""
+    stmt = select(*encoder.columns(Donation, "created_at", "id")).where(criterion)
+    if cursor:
+        stmt = stmt.where(
+            keyset_after(Donation.created_at, Donation.id, decode_cursor("donations", cursor))
+        )
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.order_by(Donation.created_at.desc(), Donation.id.desc()).limit(limit)
 
 
 @router.get("/by-campaign/{campaign_id}", response_model=List[DonationList])
+@query_budget(1)
 async def get_donations_by_campaign(
     campaign_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: str | None = None,
+    encoder: RowEncoder = Depends(donation_fields),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all donations for a specific campaign."""
+    """Get all donations for a specific campaign.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next
+    one, and ``fields`` to choose which donation fields are returned.
+    """
     result = await db.execute(
-        select(Donation)
-        .where(Donation.campaign_id == campaign_id)
-        .order_by(Donation.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+        donations_page(Donation.campaign_id == campaign_id, skip, limit, cursor, encoder)
     )
-    donations = result.scalars().all()
-    return donations
+    rows = result.all()
+    set_next_cursor(response, "donations", rows, limit, "created_at", "id")
+    return json_response(encoder.encode(rows), response)
 
 
 @router.get("/by-user/{user_id}", response_model=List[DonationList])
+@query_budget(1)
 async def get_donations_by_user(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
+    encoder: RowEncoder = Depends(donation_fields),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get all donations made by a specific user.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next
+    one, and ``fields`` to choose which donation fields are returned.
+    """
+    result = await db.execute(
+        donations_page(Donation.user_id == user_id, skip, limit, cursor, encoder)
+    )
+    rows = result.all()
+    set_next_cursor(response, "donations", rows, limit, "created_at", "id")
+    return json_response(encoder.encode(rows), response)
+
+
+EXPORT_COLUMNS = (
+    Donation.id, Donation.uuid, Donation.campaign_id, Donation.user_id, Donation.amount,
+    Donation.donation_type, Donation.is_anonymous, Donation.payment_method,
+    Donation.payment_reference, Donation.status, Donation.created_at, Donation.updated_at,
+)
+EXPORT_BATCH_SIZE = 2000
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+async def _export_stream(stmt, fmt: str, compress: bool) -> AsyncIterator[bytes]:
+    """Encode rows from a server-side cursor batch by batch, optionally gzipped."""
+    names = [column.key for column in EXPORT_COLUMNS]
+    gzipper = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+
+    def drain(final: bool = False) -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        if gzipper is None:
+            return data
+        return gzipper.compress(data) + gzipper.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+    if writer is not None:
+        writer.writerow(names)
+        # send the header before the first fetch so the client sees bytes immediately
+        yield drain()
+
+    # The request's session is closed once the handler returns, so the stream owns its own
+    async with replicas.session() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            for row in batch:
+                values = [_export_value(v) for v in row]
+                if writer is not None:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(names, values)), separators=(",", ":")))
+                    buffer.write("\n")
+            yield drain()
+    yield drain(final=True)
+
+
+@router.get("/export")
+async def export_donations(
+    current_user: Annotated[User, Depends(require_admin)],
+    campaign_id: int | None = None,
+    created_from: datetime | None = Query(default=None, alias="from"),
+    created_to: datetime | None = Query(default=None, alias="to"),
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    after_id: int | None = Query(default=None, description="Resume after the last donation id received"),
+):
+    """Stream donations as CSV or NDJSON, oldest id first. Requires admin/superadmin role.
+
+    Rows come from a server-side cursor, so memory stays constant however
+    many rows match. After a disconnect, pass the last ``id`` received as
+    ``after_id`` to continue where the stream stopped. With ``gzip`` the
+    response is a ``.gz`` file rather than a compressed transfer, so clients
+    save it as sent instead of decompressing it on the fly.
+    """
+    stmt = select(*EXPORT_COLUMNS)
+    if campaign_id is not None:
+        stmt = stmt.where(Donation.campaign_id == campaign_id)
+    if created_from is not None:
+        stmt = stmt.where(Donation.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Donation.created_at < created_to)
+    if after_id is not None:
+        stmt = stmt.where(Donation.id > after_id)
+    stmt = stmt.order_by(Donation.id)
+    
+    filename = f"donations.{format}" + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        media_type = "application/gzip"
+    else:
+        media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(_export_stream(stmt, format, gzip), media_type=media_type, headers=headers)
+
+
+@router.post("/", response_model=DonationSchema, status_code=status.HTTP_201_CREATED)
+@query_budget(1)
+async def create_donation(
+    donation_data: DonationCreate,
+    current_user: Annotated[User, Depends(require_donor)],
+    db: AsyncSession = Depends(get_db)
+):
+    """Record a pending donation.
+
+    The donor's own request cannot confirm a payment, so the donation only
+    counts towards ``amount_raised`` once ``PATCH /{id}/status`` (an admin or
+    the payment callback) marks it completed.
+    """
+    await campaign_resolver.resolve(str(donation_data.campaign_id), db)
+    
+    new_donation = Donation(
+        uuid=generate_uuid(),
+        user_id=current_user.id,
+        status="pending",
+        created_at=datetime.utcnow(),
+        **donation_data.model_dump()
+    )
+    
+    db.add(new_donation)
+    await db.commit()
+    
+    return new_donation
+
+
+@router.patch("/{donation_id}/status", response_model=DonationSchema)
+@query_budget(8)
+async def update_donation_status(
+    donation_id: int,
+    status_data: DonationStatusUpdate,
+    current_user: Annotated[User, Depends(require_admin)],
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all donations made by a specific user."""
+    """Change a donation's status. Requires admin/superadmin role."""
     result = await db.execute(
-        select(Donation)
-        .where(Donation.user_id == user_id)
-        .order_by(Donation.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+        select(Donation).where(Donation.id == donation_id).with_for_update()
     )
-    donations = result.scalars().all()
-    return donations
\ No newline at end of file
+    donation = result.scalar_one_or_none()
+    
+    if not donation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Donation not found"
+        )
+    
+    was_completed = donation.status == "completed"
+    now_completed = status_data.status == "completed"
+    taken_back = False
+    
+    if was_completed and not now_completed:
+        if donation.applied_at is not None:
+            # Already counted in amount_raised: take it back in the same transaction
+            await donation_rollups.lock(db)
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.id == donation.campaign_id)
+                .values(amount_raised=Campaign.amount_raised - donation.amount)
+            )
+            await donation_rollups.apply(db, [donation], sign=-1)
+            donation.applied_at = None
+            taken_back = True
+        else:
+            donation_aggregator.discard(donation.id)
+    
+    donation.status = status_data.status
+    donation.updated_at = datetime.utcnow()
+    await db.commit()
+    invalidate(f"campaign:{donation.campaign_id}")
+    if taken_back:
+        campaign_leaderboards.record_donations([donation], sign=-1)
+    
+    if now_completed and not was_completed:
+        donation_aggregator.add(donation.id)
+    
+    return donation
@@ -1,7 +1,11 @@
 from fastapi import APIRouter
 
-router = APIRouter()
+from app.core.metrics import TimedRoute
+from app.core.query_budget import query_budget
+
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/")
+@query_budget(0)
 async def health():
     return {"status": "ok"}
@@ -1,10 +1,22 @@
-from typing import List, Annotated
+import codecs
+import csv
+import json
+from itertools import islice
+from typing import Iterator, List, Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status, Query
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import insert, select, or_
+from sqlalchemy.exc import DataError, IntegrityError
 
 from app.core.db import get_db
+from app.core.fast_json import FieldSelection, RowEncoder, json_response
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.query_budget import query_budget
+from app.core.replicas import get_read_db
+from app.core.resolvers import hospital_resolver
+from app.core.response_cache import CachedRoute, cache_response, invalidate
 from app.core.deps import (
     get_current_active_user,
     require_hospital_contact,
@@ -13,65 +25,105 @@ from app.core.deps import (
 )
 from app.models.user import User
 from app.models.hospital import Hospital
+from app.services.hospital_geo import SUMMARY_COLUMNS, hospital_geo_index
 from app.schemas.hospital import (
     HospitalCreate,
     HospitalUpdate,
     Hospital as HospitalSchema,
-    HospitalList
+    HospitalList,
+    HospitalNearby,
+    HospitalImportError,
+    HospitalImportReport
 )
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+hospital_fields = FieldSelection(HospitalSchema, default=HospitalList)
+hospital_detail_fields = FieldSelection(HospitalSchema)
+hospital_list_json = hospital_fields.default
+
+
+def hospital_tag(request) -> list[str]:
+    """Cache tag for a hospital path reference, keyed by numeric id once resolved."""
+    ref = request.path_params["hospital_id"]
+    return [f"hospital:{hospital_resolver.peek(ref, ref)}"]
 
 
 @router.get("/", response_model=List[HospitalList])
+@cache_response(ttl=300, tags=lambda request: ["hospitals:list"])
+@query_budget(1)
 async def list_hospitals(
+    response: Response,
     city: str | None = None,
     district: str | None = None,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    encoder: RowEncoder = Depends(hospital_fields),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get list of all hospitals."""
-    stmt = select(Hospital).where(Hospital.deleted_at.is_(None))
+    """Get list of all hospitals.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the next
+    one, and ``fields`` to choose which hospital fields are returned.
+    """
+    stmt = select(*encoder.columns(Hospital, "id")).where(Hospital.deleted_at.is_(None))
     
     if city:
         stmt = stmt.where(Hospital.city == city)
     if district:
         stmt = stmt.where(Hospital.district == district)
     
-    stmt = stmt.offset(skip).limit(limit)
-    result = await db.execute(stmt)
-    hospitals = result.scalars().all()
-    return hospitals
+    if cursor:
+        (last_id,) = decode_cursor("hospitals", cursor)
+        stmt = stmt.where(Hospital.id > last_id)
+    elif skip:
+        stmt = stmt.offset(skip)
+    
+    stmt = stmt.order_by(Hospital.id).limit(limit)
+    rows = (await db.execute(stmt)).all()
+    set_next_cursor(response, "hospitals", rows, limit, "id")
+    return json_response(encoder.encode(rows), response)
+
+
+@router.get("/nearby", response_model=List[HospitalNearby])
+@query_budget(0)
+async def nearby_hospitals(
+    lat: float = Query(ge=-90, le=90),
+    lng: float = Query(ge=-180, le=180),
+    radius_km: float | None = Query(default=None, gt=0, le=20000),
+    k: int = Query(default=10, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Nearest hospitals to a point, served from the in-memory spatial index.
+
+    With ``radius_km`` returns up to ``k`` hospitals inside the radius,
+    otherwise the ``k`` nearest overall.
+    """
+    if not hospital_geo_index.loaded:
+        await hospital_geo_index.load(db)
+    
+    if radius_km is not None:
+        hits = hospital_geo_index.within(lat, lng, radius_km, limit=k)
+    else:
+        hits = hospital_geo_index.nearest(lat, lng, k)
+    return [{**point, "distance_km": round(distance, 3)} for distance, point in hits]
 
 
 @router.get("/{hospital_id}", response_model=HospitalSchema)
+@cache_response(ttl=300, tags=hospital_tag)
+@query_budget(1)
 async def get_hospital(
     hospital_id: str,
-    db: AsyncSession = Depends(get_db)
+    encoder: RowEncoder = Depends(hospital_detail_fields),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get a specific hospital by ID or UUID."""
-    # Try to find by UUID first, then by ID
-    query = select(Hospital).where(Hospital.deleted_at.is_(None))
-    
-    if hospital_id.isdigit():
-        query = query.where(Hospital.id == int(hospital_id))
-    else:
-        query = query.where(Hospital.uuid == hospital_id)
-    
-    result = await db.execute(query)
-    hospital = result.scalar_one_or_none()
-    
-    if not hospital:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Hospital not found"
-        )
-    
-    return hospital
+    """Get a specific hospital by ID or UUID, optionally only some ``fields``."""
+    row = await hospital_resolver.fetch_columns(hospital_id, db, encoder.columns(Hospital, "id", "uuid"))
+    return json_response(encoder.encode_one(row))
 
 
 @router.post("/", response_model=HospitalSchema)
+@query_budget(3)
 async def create_hospital(
     hospital_data: HospitalCreate,
     current_user: Annotated[User, Depends(require_hospital_contact)],
@@ -100,11 +152,128 @@ async def create_hospital(
     db.add(new_hospital)
     await db.commit()
     await db.refresh(new_hospital)
+    invalidate("hospitals:list")
+    hospital_geo_index.upsert(new_hospital)
     
     return new_hospital
 
 
+IMPORT_CHUNK_SIZE = 500
+# Row errors kept in an import report; later ones are only counted
+IMPORT_MAX_ERRORS = 1000
+
+
+def _import_rows(upload: UploadFile, fmt: str) -> Iterator[tuple[int, dict | str]]:
+    """Yield ``(row_number, fields)`` from an uploaded CSV or NDJSON file, one line at a time.
+
+    Unparseable lines yield an error message instead of a dict.
+    """
+    lines = codecs.iterdecode(upload.file, "utf-8-sig")
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # empty cells mean "not provided"
+            yield reader.line_num, {k: v for k, v in row.items() if k and v not in ("", None)}
+        return
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"invalid JSON: {exc}"
+            continue
+        yield line_number, row if isinstance(row, dict) else "expected a JSON object"
+
+
+# No @query_budget: every chunk costs up to three statements, so the count grows with the file
+@router.post("/import", response_model=HospitalImportReport)
+async def import_hospitals(
+    current_user: Annotated[User, Depends(require_hospital_contact)],
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] | None = Query(default=None, description="Defaults from the file extension"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk-create hospitals from a CSV or NDJSON upload.
+
+    Rows are validated and inserted in chunks, each chunk with one
+    duplicate-name query and one multi-row INSERT in its own transaction,
+    so memory use does not grow with the file. A chunk the database rejects
+    is rolled back and its rows reported as failed; earlier chunks stay
+    committed. The report lists up to ``IMPORT_MAX_ERRORS`` failed rows
+    and counts the rest in ``errors_omitted``. Requires
+    admin/superadmin/hospital_contact role.
+    """
+    fmt = format or ("ndjson" if (file.filename or "").endswith((".ndjson", ".jsonl")) else "csv")
+    rows = _import_rows(file, fmt)
+    inserted = 0
+    failed = 0
+    errors: list[HospitalImportError] = []
+    
+    def fail(row_number: int, messages: list[str]) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < IMPORT_MAX_ERRORS:
+            errors.append(HospitalImportError(row=row_number, errors=messages))
+    
+    while chunk := list(islice(rows, IMPORT_CHUNK_SIZE)):
+        valid: dict[str, tuple[int, HospitalCreate]] = {}
+        for row_number, fields in chunk:
+            if isinstance(fields, str):
+                fail(row_number, [fields])
+                continue
+            try:
+                hospital = HospitalCreate.model_validate(fields)
+            except ValidationError as exc:
+                fail(row_number, [
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+                ])
+                continue
+            if hospital.name in valid:
+                fail(row_number, ["duplicate name in file"])
+                continue
+            valid[hospital.name] = (row_number, hospital)
+        
+        if valid:
+            existing = set((await db.execute(
+                select(Hospital.name).where(Hospital.name.in_(valid), Hospital.deleted_at.is_(None))
+            )).scalars())
+            for name in existing:
+                row_number, _ = valid.pop(name)
+                fail(row_number, ["Hospital with this name already exists"])
+        
+        if valid:
+            try:
+                await db.execute(
+                    insert(Hospital),
+                    [{"uuid": generate_uuid(), **hospital.model_dump()} for _, hospital in valid.values()]
+                )
+                await db.commit()
+            except (IntegrityError, DataError) as exc:
+                await db.rollback()
+                message = f"rejected by the database: {exc.orig}"
+                for row_number, _ in valid.values():
+                    fail(row_number, [message])
+                continue
+            inserted += len(valid)
+            if hospital_geo_index.loaded:
+                created = await db.execute(
+                    select(*SUMMARY_COLUMNS).where(Hospital.name.in_(valid), Hospital.deleted_at.is_(None))
+                )
+                for row in created:
+                    hospital_geo_index.upsert(row)
+    
+    if inserted:
+        invalidate("hospitals:list")
+    
+    errors.sort(key=lambda e: e.row)
+    return HospitalImportReport(
+        inserted=inserted, failed=failed, errors=errors, errors_omitted=failed - len(errors)
+    )
+
+
 @router.patch("/{hospital_id}", response_model=HospitalSchema)
+@query_budget(3)
 async def update_hospital(
     hospital_id: str,
     hospital_data: HospitalUpdate,
@@ -112,22 +281,7 @@ async def update_hospital(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a hospital. Requires admin/superadmin/hospital_contact role."""
-    # Find hospital
-    query = select(Hospital).where(Hospital.deleted_at.is_(None))
-    
-    if hospital_id.isdigit():
-        query = query.where(Hospital.id == int(hospital_id))
-    else:
-        query = query.where(Hospital.uuid == hospital_id)
-    
-    result = await db.execute(query)
-    hospital = result.scalar_one_or_none()
-    
-    if not hospital:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Hospital not found"
-        )
+    hospital = await hospital_resolver.fetch(hospital_id, db)
     
     # Update fields
     update_data = hospital_data.model_dump(exclude_unset=True)
@@ -136,38 +290,29 @@ async def update_hospital(
     
     await db.commit()
     await db.refresh(hospital)
+    invalidate(f"hospital:{hospital.id}", "hospitals:list")
+    hospital_geo_index.upsert(hospital)
     
     return hospital
 
 
 @router.delete("/{hospital_id}")
+@query_budget(2)
 async def delete_hospital(
     hospital_id: str,
     current_user: Annotated[User, Depends(require_admin)],
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a hospital. Requires admin/superadmin role."""
-    # Find hospital
-    query = select(Hospital).where(Hospital.deleted_at.is_(None))
-    
-    if hospital_id.isdigit():
-        query = query.where(Hospital.id == int(hospital_id))
-    else:
-        query = query.where(Hospital.uuid == hospital_id)
-    
-    result = await db.execute(query)
-    hospital = result.scalar_one_or_none()
-    
-    if not hospital:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Hospital not found"
-        )
+    hospital = await hospital_resolver.fetch(hospital_id, db)
     
     # Soft delete - set deleted_at timestamp
     from datetime import datetime
     hospital.deleted_at = datetime.utcnow()
     
     await db.commit()
+    hospital_resolver.forget(hospital)
+    invalidate(f"hospital:{hospital.id}", "hospitals:list")
+    hospital_geo_index.remove(hospital.id)
     
     return {"message": "Hospital deleted successfully"}
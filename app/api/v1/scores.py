@@ -1,18 +1,56 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from app.core.db import get_db
+from app.core.fast_json import dumps, json_response
+from app.core.metrics import TimedRoute
+from app.core.query_budget import query_budget
+from app.core.replicas import get_read_db
+from app.services.score_snapshots import ScoreSnapshot, campaign_scores, hospital_scores
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+GENERATED_AT_HEADER = "X-Generated-At"
+
+
+async def serve_snapshot(
+    snapshot: ScoreSnapshot, request: Request, response: Response,
+    skip: int, limit: int, db: AsyncSession
+):
+    """Serve a page of a score snapshot with ETag / If-None-Match support.
+
+    Each row carries the snapshot's ``generated_at`` so clients reading only
+    the body can tell how old the scores are.
+    """
+    if not snapshot.loaded:
+        await snapshot.refresh(db)
+    
+    etag = f'"{snapshot.version}-{skip}-{limit}"'
+    generated_at = snapshot.generated_at.isoformat()
+    headers = {"ETag": etag, GENERATED_AT_HEADER: generated_at}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    rows = [{**row, "generated_at": generated_at} for row in snapshot.page(skip, limit)]
+    return json_response(dumps(rows), response)
 
 @router.get("/campaigns")
-async def campaign_scores(db: AsyncSession = Depends(get_db)):
-    sql = text("SELECT * FROM vw_campaign_priority_scores ORDER BY weighted_score DESC LIMIT 100")
-    rows = (await db.execute(sql)).mappings().all()
-    return rows
+@query_budget(0)
+async def campaign_scores_list(
+    request: Request,
+    response: Response,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await serve_snapshot(campaign_scores, request, response, skip, limit, db)
 
 @router.get("/hospitals")
-async def hospital_scores(db: AsyncSession = Depends(get_db)):
-    sql = text("SELECT * FROM vw_hospital_priority_scores ORDER BY priority_score DESC")
-    rows = (await db.execute(sql)).mappings().all()
-    return rows
+@query_budget(0)
+async def hospital_scores_list(
+    request: Request,
+    response: Response,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await serve_snapshot(hospital_scores, request, response, skip, limit, db)
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.db import get_db
+from app.core.query_budget import query_budget
+from app.core.replicas import get_read_db
+from app.core.response_cache import CachedRoute, cache_response
 from app.models.role import Role
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 @router.get("/roles")
-async def list_roles(db: AsyncSession = Depends(get_db)):
+@cache_response(ttl=3600, tags=lambda request: ["roles"])
+@query_budget(1)
+async def list_roles(db: AsyncSession = Depends(get_read_db)):
     res = await db.execute(select(Role))
     return [{"id": r.id, "name": r.name} for r in res.scalars().all()]
@@ -0,0 +1,267 @@
+import asyncio
+import math
+import time
+from typing import Optional, Sequence
+
+from starlette.responses import JSONResponse
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS, Histogram, histogram_lines
+
+
+class AdmissionClass:
+    """Concurrency limit with a bounded wait queue for one class of routes.
+
+    Up to ``limit`` requests run at once; up to ``max_queue`` more wait at
+    most ``queue_timeout`` seconds for a slot. Anything beyond that is shed
+    so a saturated class cannot starve the rest of the service.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.wait_seconds = Histogram(LATENCY_BUCKETS)
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> Optional[str]:
+        """Take a slot, waiting in the queue if needed; return the shed reason on failure."""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.shed_queue_full += 1
+                return "queue_full"
+            self.waiting += 1
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.shed_timeout += 1
+                return "timeout"
+            finally:
+                self.waiting -= 1
+                self.wait_seconds.observe(time.perf_counter() - start)
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+        return None
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "shed": {"queue_full": self.shed_queue_full, "timeout": self.shed_timeout},
+            "queue_wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets refilling at ``rate_per_minute`` up to ``burst``.
+
+    Buckets live in a bounded LRU and expire once they would be full again,
+    so idle clients cost nothing.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_clients: int):
+        self.name = name
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.limited = 0
+        self._buckets = TTLCache(max_clients, ttl=burst / self.rate)
+
+    def take(self, client: str) -> float:
+        """Spend a token for ``client``; return 0, or the seconds until one is available."""
+        now = time.monotonic()
+        bucket = self._buckets.peek(client)
+        if bucket is None:
+            tokens = float(self.burst)
+        else:
+            tokens = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+        if tokens < 1:
+            self.limited += 1
+            self._buckets.set(client, (tokens, now))
+            return (1 - tokens) / self.rate
+        self._buckets.set(client, (tokens - 1, now))
+        return 0.0
+
+    def stats(self) -> dict:
+        return {
+            "rate_per_minute": round(self.rate * 60, 3),
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "limited": self.limited,
+        }
+
+
+class AdmissionController:
+    """Maps requests to admission classes and rate limiters.
+
+    Rules are ``(method, path, name)`` tuples matched exactly against the
+    request, so the path doubles as the route's metrics label. Paths
+    without a class are admitted untouched, so cheap reads such as
+    ``/health`` never queue.
+    """
+
+    def __init__(
+        self,
+        classes: Sequence[AdmissionClass],
+        class_rules: Sequence[tuple[str, str, str]],
+        limiters: Sequence[TokenBucketLimiter] = (),
+        limiter_rules: Sequence[tuple[str, str, str]] = (),
+        retry_after: int = 1,
+    ):
+        self.classes = {admission.name: admission for admission in classes}
+        self.limiters = {limiter.name: limiter for limiter in limiters}
+        self.class_rules = {(method, path): name for method, path, name in class_rules if name in self.classes}
+        self.limiter_rules = {(method, path): name for method, path, name in limiter_rules if name in self.limiters}
+        self.retry_after = retry_after
+
+    def class_for(self, method: str, path: str) -> Optional[AdmissionClass]:
+        name = self.class_rules.get((method, path))
+        return self.classes[name] if name else None
+
+    def limiter_for(self, method: str, path: str) -> Optional[TokenBucketLimiter]:
+        name = self.limiter_rules.get((method, path))
+        return self.limiters[name] if name else None
+
+    def stats(self) -> dict:
+        return {
+            "classes": {name: admission.stats() for name, admission in self.classes.items()},
+            "rate_limits": {name: limiter.stats() for name, limiter in self.limiters.items()},
+        }
+
+    def prometheus_lines(self) -> list[str]:
+        lines = []
+        gauges = (
+            ("admission_active", "gauge", lambda a: a.active),
+            ("admission_queue_depth", "gauge", lambda a: a.waiting),
+            ("admission_admitted_total", "counter", lambda a: a.admitted),
+        )
+        for name, kind, value in gauges:
+            lines.append(f"# TYPE {name} {kind}")
+            for class_name, admission in sorted(self.classes.items()):
+                lines.append(f'{name}{{class="{class_name}"}} {value(admission)}')
+        lines.append("# TYPE admission_shed_total counter")
+        for class_name, admission in sorted(self.classes.items()):
+            for reason, count in (("queue_full", admission.shed_queue_full), ("timeout", admission.shed_timeout)):
+                lines.append(f'admission_shed_total{{class="{class_name}",reason="{reason}"}} {count}')
+        lines.append("# TYPE admission_queue_wait_seconds histogram")
+        for class_name, admission in sorted(self.classes.items()):
+            lines.extend(histogram_lines("admission_queue_wait_seconds", admission.wait_seconds, **{"class": class_name}))
+        lines.append("# TYPE rate_limited_total counter")
+        for limiter_name, limiter in sorted(self.limiters.items()):
+            lines.append(f'rate_limited_total{{limiter="{limiter_name}"}} {limiter.limited}')
+        return lines
+
+
+def _build_controller() -> AdmissionController:
+    prefix = settings.api_v1_prefix
+    classes = []
+    if settings.admission_auth_concurrency > 0:
+        classes.append(AdmissionClass(
+            "auth", settings.admission_auth_concurrency,
+            settings.admission_auth_max_queue, settings.admission_auth_queue_timeout_seconds,
+        ))
+    if settings.admission_heavy_concurrency > 0:
+        classes.append(AdmissionClass(
+            "heavy", settings.admission_heavy_concurrency,
+            settings.admission_heavy_max_queue, settings.admission_heavy_queue_timeout_seconds,
+        ))
+    class_rules = (
+        # bcrypt
+        ("POST", f"{prefix}/auth/login", "auth"),
+        ("POST", f"{prefix}/auth/register", "auth"),
+        # Long scans, streams and bulk writes
+        ("GET", f"{prefix}/donations/export", "heavy"),
+        ("POST", f"{prefix}/hospitals/import", "heavy"),
+        ("POST", f"{prefix}/campaigns/bulk", "heavy"),
+        ("POST", f"{prefix}/admin/donations/rollups/rebuild", "heavy"),
+        ("GET", f"{prefix}/admin/donations/rollups/check", "heavy"),
+        ("POST", f"{prefix}/admin/search/rebuild", "heavy"),
+    )
+    limiters = []
+    if settings.auth_rate_limit_per_minute > 0:
+        limiters.append(TokenBucketLimiter(
+            "auth", settings.auth_rate_limit_per_minute,
+            max(1, settings.auth_rate_limit_burst), settings.rate_limit_max_clients,
+        ))
+    limiter_rules = (
+        ("POST", f"{prefix}/auth/login", "auth"),
+        ("POST", f"{prefix}/auth/register", "auth"),
+    )
+    return AdmissionController(
+        classes, class_rules, limiters, limiter_rules,
+        retry_after=settings.admission_retry_after_seconds,
+    )
+
+
+admission = _build_controller()
+
+
+def _client_key(scope) -> str:
+    # With uvicorn --proxy-headers this is the X-Forwarded-For address
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying rate limits and per-class admission control.
+
+    Rate-limited clients get 429 and saturated classes 503, both with
+    ``Retry-After``. Rejected requests never reach routing, so they set
+    ``scope["route_template"]`` for ``MetricsMiddleware`` to count them under
+    their route. A slot is held until the response has been sent, so
+    streamed responses count against their class for their whole length.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method, path = scope["method"], scope["path"]
+        limiter = self.controller.limiter_for(method, path)
+        if limiter is not None:
+            wait = limiter.take(_client_key(scope))
+            if wait:
+                scope["route_template"] = path
+                response = JSONResponse(
+                    {"detail": "Too many requests, please retry later"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                return await response(scope, receive, send)
+
+        admission_class = self.controller.class_for(method, path)
+        if admission_class is None:
+            return await self.app(scope, receive, send)
+        if await admission_class.acquire() is not None:
+            scope["route_template"] = path
+            response = JSONResponse(
+                {"detail": "Server busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": str(self.controller.retry_after)},
+            )
+            return await response(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_class.release()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -11,15 +13,57 @@ class Settings(BaseSettings):
     db_user: str
     db_password: str
     db_name: str
+    database_url: str | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 280
+    db_pre_ping: Literal["always", "idle", "never"] = "idle"
+    db_pre_ping_idle_seconds: float = 30.0
+    sql_echo_sample_rate: float = 0.0
+    # Comma-separated SQLAlchemy URLs of read replicas; empty reads from the primary
+    db_replica_urls: str = ""
+    read_your_writes_seconds: float = 5.0
+    replica_check_interval_seconds: float = 5.0
+    replica_check_timeout_seconds: float = 2.0
+    replica_max_lag_seconds: float = 0.0
 
     jwt_secret: str = "replace_me"
     jwt_alg: str = "HS256"
     access_token_expire_minutes: int = 60
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: int = 60
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    # Per-class admission control; concurrency 0 turns a class off
+    admission_auth_concurrency: int = 8
+    admission_auth_max_queue: int = 32
+    admission_auth_queue_timeout_seconds: float = 2.0
+    admission_heavy_concurrency: int = 4
+    admission_heavy_max_queue: int = 16
+    admission_heavy_queue_timeout_seconds: float = 5.0
+    admission_retry_after_seconds: int = 1
+    auth_rate_limit_per_minute: float = 10.0
+    auth_rate_limit_burst: int = 5
+    rate_limit_max_clients: int = 50000
+    resolver_cache_size: int = 50000
+    resolver_cache_ttl_seconds: int = 300
+    donation_flush_interval_seconds: float = 2.0
+    score_refresh_interval_seconds: float = 60.0
+    leaderboard_reload_interval_seconds: float = 300.0
+    search_reload_interval_seconds: float = 300.0
+    hospital_geo_reload_interval_seconds: float = 300.0
+    score_full_refresh_every: int = 10
+    response_cache_enabled: bool = True
+    response_cache_size: int = 2048
+    metrics_token: str | None = None
 
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
 
     @property
     def sqlalchemy_async_url(self) -> str:
+        if self.database_url:
+            return self.database_url
         # using aiomysql (pure Python)
         return (
             f"mysql+aiomysql://{self.db_user}:{self.db_password}"
@@ -1,14 +1,59 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import logging
+import random
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.pool_metrics import MeteredQueuePool, pool_metrics
+
+sql_logger = logging.getLogger("app.sql")
+
+
+def make_engine(url: str, poolclass=AsyncAdaptedQueuePool) -> AsyncEngine:
+    """Async engine with the configured pool settings, idle pre-ping and SQL sampling."""
+    engine = create_async_engine(
+        url,
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pre_ping == "always",
+    )
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _mark_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
 
-engine = create_async_engine(
-    settings.sqlalchemy_async_url,
-    pool_pre_ping=True,
-    pool_recycle=280,
-    echo=settings.debug,
-)
+    if settings.db_pre_ping == "idle":
+        @event.listens_for(engine.sync_engine, "checkout")
+        def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+            # Only connections that sat idle may have been dropped by MySQL or a proxy
+            checked_in_at = connection_record.info.get("checked_in_at")
+            if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_pre_ping_idle_seconds:
+                return
+            try:
+                engine.dialect.do_ping(dbapi_connection)
+            except Exception as e:
+                # The pool discards this connection and retries with a fresh one
+                raise exc.DisconnectionError() from e
+
+    if settings.sql_echo_sample_rate > 0:
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _sample_sql(conn, cursor, statement, parameters, context, executemany):
+            if random.random() < settings.sql_echo_sample_rate:
+                sql_logger.info("%s%s", statement, " [executemany]" if executemany else "")
+
+    return engine
+
+
+engine = make_engine(settings.sqlalchemy_async_url, poolclass=MeteredQueuePool)
 SessionLocal = async_sessionmaker(engine, autoflush=False, autocommit=False, expire_on_commit=False)
+pool_metrics.attach(engine.sync_engine)
+
 
 class Base(DeclarativeBase):
     pass
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Annotated, Optional
 from uuid import uuid4
@@ -9,8 +10,11 @@ from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.db import get_db
+from app.core.hashing import PasswordHashPool
+from app.core.roles import role_registry
 from app.models.user import User
 
 # Password hashing
@@ -19,6 +23,17 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # JWT token security
 security = HTTPBearer()
 
+# Verified principals by user uuid; an entry never outlives the token that loaded it
+principal_cache = TTLCache(settings.principal_cache_size, ttl=settings.principal_cache_ttl_seconds)
+
+def invalidate_principal(user_uuid: str) -> None:
+    """Drop a cached principal, e.g. after a role change or soft delete."""
+    principal_cache.pop(user_uuid)
+
+def clear_principals() -> None:
+    """Drop every cached principal."""
+    principal_cache.clear()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -27,6 +42,17 @@ def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
 
+# bcrypt runs here so a login burst cannot stall the event loop
+password_pool = PasswordHashPool(settings.password_hash_workers, settings.password_hash_max_pending)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password worker pool."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password worker pool."""
+    return await password_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -58,13 +84,24 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
+    user = principal_cache.get(user_uuid)
+    if user is not None:
+        return user
+    
     # Get user from database
-    result = await db.execute(select(User).where(User.uuid == user_uuid))
+    result = await db.execute(
+        select(User).where(User.uuid == user_uuid, User.deleted_at.is_(None))
+    )
     user = result.scalar_one_or_none()
     
     if user is None:
         raise credentials_exception
     
+    ttl = settings.principal_cache_ttl_seconds
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
+    principal_cache.set(user_uuid, user, ttl=ttl)
+    
     return user
 
 async def get_current_active_user(current_user: Annotated[User, Depends(get_current_user)]) -> User:
@@ -77,12 +114,10 @@ def require_roles(*allowed_roles: str):
         current_user: Annotated[User, Depends(get_current_active_user)],
         db: AsyncSession = Depends(get_db)
     ) -> User:
-        # Get user's role name
-        from app.models.role import Role
-        result = await db.execute(select(Role).where(Role.id == current_user.role_id))
-        role = result.scalar_one_or_none()
+        # Role names come from the in-memory registry, not a per-request query
+        role_name = await role_registry.resolve(current_user.role_id, db)
         
-        if not role or role.name not in allowed_roles:
+        if role_name not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Operation not permitted"
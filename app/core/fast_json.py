@@ -0,0 +1,134 @@
+import json
+import types
+import typing
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from fastapi import Query, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+
+def _default(value: Any):
+    # Same output as FastAPI's jsonable_encoder for these types
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default)
+else:
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _converter(annotation) -> Optional[Callable[[Any], Any]]:
+    """How a raw column value becomes the JSON value the schema would emit."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+    if annotation is bool:
+        return bool
+    if annotation is float:
+        return float
+    if annotation is Decimal:
+        # Pydantic serializes Decimal as a string to keep its precision
+        return str
+    return None
+
+
+class RowEncoder:
+    """Serialize row tuples straight to JSON, as ``response_model=List[schema]`` would.
+
+    Select ``encoder.columns(Model)`` so each row holds the schema's fields
+    in order; ``encode`` then builds the JSON in one pass without creating
+    ORM objects or validating every row into the schema. ``fields`` limits
+    the output to a subset of the schema.
+    """
+
+    def __init__(self, schema: type[BaseModel], fields: Optional[Sequence[str]] = None):
+        self.fields = tuple(fields or schema.model_fields)
+        self._converters = [
+            (name, converter)
+            for name in self.fields
+            if (converter := _converter(schema.model_fields[name].annotation)) is not None
+        ]
+
+    def columns(self, model, *extra: str) -> list:
+        """The columns to select; ``extra`` ones (e.g. cursor keys) are fetched but not emitted."""
+        names = self.fields + tuple(name for name in extra if name not in self.fields)
+        return [getattr(model, name) for name in names]
+
+    def rows(self, rows: Iterable[Sequence]) -> list[dict]:
+        fields, converters = self.fields, self._converters
+        items = []
+        for row in rows:
+            item = dict(zip(fields, row))
+            for name, converter in converters:
+                value = item[name]
+                if value is not None:
+                    item[name] = converter(value)
+            items.append(item)
+        return items
+
+    def encode(self, rows: Iterable[Sequence]) -> bytes:
+        return dumps(self.rows(rows))
+
+    def encode_one(self, row: Sequence) -> bytes:
+        return dumps(self.rows((row,))[0])
+
+
+class FieldSelection:
+    """Dependency parsing a ``fields=a,b,c`` query parameter into a ``RowEncoder``.
+
+    Fields may be any of ``schema``'s; without the parameter the endpoint's
+    usual ``default`` schema is returned. Unknown fields fail validation
+    with a 422, like any other bad query parameter.
+    """
+
+    MAX_CACHED = 256
+
+    def __init__(self, schema: type[BaseModel], default: Optional[type[BaseModel]] = None):
+        self.schema = schema
+        self.default = RowEncoder(default or schema)
+        self._encoders: dict[tuple[str, ...], RowEncoder] = {}
+
+    def __call__(
+        self, fields: Optional[str] = Query(default=None, description="Comma-separated fields to return")
+    ) -> RowEncoder:
+        if fields is None:
+            return self.default
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.schema.model_fields]
+        if unknown or not names:
+            raise RequestValidationError([{
+                "type": "value_error",
+                "loc": ("query", "fields"),
+                "msg": f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested",
+                "input": fields,
+            }])
+        encoder = self._encoders.get(names)
+        if encoder is None:
+            encoder = RowEncoder(self.schema, names)
+            if len(self._encoders) < self.MAX_CACHED:
+                self._encoders[names] = encoder
+        return encoder
+
+
+def json_response(body: bytes, response: Optional[Response] = None) -> Response:
+    """Wrap encoded JSON, keeping headers set on the handler's injected ``response``."""
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,252 @@
+import bisect
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Optional, Sequence
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+STATUS_CLASSES = ("0xx", "1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``bounds`` are inclusive upper bucket edges."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound, Prometheus style."""
+        buckets, running = {}, 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            running += count
+            buckets["+Inf" if bound == float("inf") else bound] = running
+        return {"count": self.count, "sum": round(self.sum, 3), "buckets": buckets}
+
+
+class RequestTimer:
+    """Per-request accumulator the DB events and route handler write into."""
+
+    __slots__ = ("db_seconds", "queries", "endpoint_done", "serialize_seconds")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.endpoint_done = 0.0
+        self.serialize_seconds = 0.0
+
+
+current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("current_timer", default=None)
+
+
+class RouteStats:
+    __slots__ = ("statuses", "latency", "db_time", "queries", "serialization")
+
+    def __init__(self):
+        self.statuses: dict[str, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.db_time = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.serialization = Histogram(LATENCY_BUCKETS)
+
+
+class RequestMetrics:
+    """Per-process request metrics keyed by method and route template."""
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+
+    def record(self, method: str, route: str, status_code: int, seconds: float, timer: RequestTimer) -> None:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats()
+        status_class = STATUS_CLASSES[status_code // 100] if status_code < 600 else "5xx"
+        stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+        stats.latency.observe(seconds)
+        stats.db_time.observe(timer.db_seconds)
+        stats.queries.observe(timer.queries)
+        stats.serialization.observe(timer.serialize_seconds)
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(scope) -> str:
+    """Full path template of the matched route, e.g. ``/api/v1/campaigns/{campaign_id}``.
+
+    Depending on the FastAPI version ``path_format`` of a route in an
+    included router may lack the router prefixes, so the prefix is taken
+    from the concrete path instead. Middleware that answers before routing
+    runs can name the route in ``scope["route_template"]``.
+    """
+    template = scope.get("route_template")
+    if template:
+        return template
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return "<unmatched>"
+    path = scope["path"]
+    if "{" not in path_format:
+        concrete = path_format
+    else:
+        try:
+            concrete = path_format.format(**scope.get("path_params", {}))
+        except (KeyError, IndexError):
+            return path_format
+    if concrete and path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + path_format
+    return path_format
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status, DB time and queries per route.
+
+    The route template comes from ``scope["route"]`` once routing has run,
+    so ``/campaigns/42`` and ``/campaigns/43`` share one series.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timer = RequestTimer()
+        token = current_timer.set(timer)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_timer.reset(token)
+            self.metrics.record(scope["method"], route_template(scope), status_code, elapsed, timer)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timer = current_timer.get()
+    if timer is not None and context is not None:
+        timer.db_seconds += time.perf_counter() - context._metrics_started
+        timer.queries += 1
+
+
+def _timed_endpoint(endpoint):
+    """Wrap an endpoint to stamp when it returned, so serialization can be timed."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timer = current_timer.get()
+                if timer is not None:
+                    timer.endpoint_done = time.perf_counter()
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                timer = current_timer.get()
+                if timer is not None:
+                    timer.endpoint_done = time.perf_counter()
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that attributes response validation and encoding time to serialization."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timer = current_timer.get()
+            if timer is not None and timer.endpoint_done:
+                timer.serialize_seconds += time.perf_counter() - timer.endpoint_done
+            return response
+
+        return timed_handler
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def histogram_lines(name: str, histogram: Histogram, **labels) -> list[str]:
+    lines, running = [], 0
+    for bound, count in zip((*histogram.bounds, "+Inf"), histogram.counts):
+        running += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {running}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+HISTOGRAMS = (
+    ("http_request_duration_seconds", "latency", "Request latency, first byte in to last byte out."),
+    ("http_request_db_seconds", "db_time", "Time spent executing SQL statements per request."),
+    ("http_request_db_queries", "queries", "SQL statements executed per request."),
+    ("http_response_serialization_seconds", "serialization", "Response validation and encoding time."),
+)
+
+
+def render_prometheus(metrics: RequestMetrics = request_metrics, extra: Sequence[str] = ()) -> str:
+    """Render request metrics in the Prometheus text exposition format."""
+    routes = sorted(metrics.routes.items())
+    lines = [
+        "# HELP http_requests_total Requests by route template and status class.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route), stats in routes:
+        for status_class, count in sorted(stats.statuses.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status_class)} {count}")
+    for name, attr, help_text in HISTOGRAMS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (method, route), stats in routes:
+            lines.extend(histogram_lines(name, getattr(stats, attr), method=method, route=route))
+    lines.extend(extra)
+    return "\n".join(lines) + "\n"
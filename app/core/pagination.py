@@ -0,0 +1,80 @@
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _sign(payload: bytes) -> str:
+    digest = hmac.new(settings.jwt_secret.encode(), payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def encode_cursor(scope: str, *values: Any) -> str:
+    """Encode sort-key values into an opaque, signed cursor token."""
+    keys = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    payload = json.dumps([scope, keys], separators=(",", ":")).encode()
+    body = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{body}.{_sign(payload)}"
+
+
+def decode_cursor(scope: str, token: str) -> list:
+    """Decode a cursor token issued for the given scope."""
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+    try:
+        body, signature = token.split(".", 1)
+        payload = _b64decode(body)
+        cursor_scope, keys = json.loads(payload)
+    except (ValueError, TypeError):
+        raise invalid
+    if not hmac.compare_digest(signature, _sign(payload)) or cursor_scope != scope:
+        raise invalid
+    return keys
+
+
+def keyset_after(sort_col, id_col, keys: Sequence[Any], descending: bool = True, nullable: bool = False):
+    """Build the WHERE clause selecting rows after the cursor position.
+
+    Rows are ordered by ``sort_col`` then ``id_col``. The leading range on
+    ``sort_col`` keeps the predicate index-friendly; for ``nullable`` sort
+    columns NULL keys come last in descending order, as MySQL orders them.
+    """
+    sort_value, last_id = keys
+    if isinstance(sort_value, str):
+        sort_value = datetime.fromisoformat(sort_value)
+
+    if sort_value is None:
+        return and_(sort_col.is_(None), id_col < last_id if descending else id_col > last_id)
+
+    if descending:
+        clause = and_(sort_col <= sort_value, or_(sort_col < sort_value, id_col < last_id))
+    else:
+        clause = and_(sort_col >= sort_value, or_(sort_col > sort_value, id_col > last_id))
+    if nullable and descending:
+        clause = or_(clause, sort_col.is_(None))
+    return clause
+
+
+def set_next_cursor(response: Response, scope: str, rows: Sequence[Any], limit: int, *attrs: str) -> Optional[str]:
+    """Set the next-page cursor header when a full page was returned."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    token = encode_cursor(scope, *(getattr(last, a) if not isinstance(last, dict) else last[a] for a in attrs))
+    response.headers[NEXT_CURSOR_HEADER] = token
+    return token
@@ -0,0 +1,98 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.metrics import Histogram, histogram_lines
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Connection pool counters fed by SQLAlchemy pool events.
+
+    Checkout wait time is measured by ``MeteredQueuePool`` and covers
+    waiting for a free connection, opening an overflow one and pre-ping.
+    """
+
+    def __init__(self):
+        self.wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.opened = 0
+        self.closed = 0
+        self.invalidated = 0
+        self.started_at = time.monotonic()
+
+    def attach(self, target) -> None:
+        """Listen on an engine's (or a pool's) pool events."""
+        event.listen(target, "connect", self._on_connect)
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "close", self._on_close)
+        event.listen(target, "close_detached", self._on_close)
+        event.listen(target, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+
+    def _on_close(self, dbapi_connection, connection_record=None) -> None:
+        self.closed += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidated += 1
+
+    def stats(self, pool: Pool) -> dict:
+        uptime = time.monotonic() - self.started_at
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "max_connections": pool.size() + max(0, pool._max_overflow),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow_in_use": max(0, pool.overflow()),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "checkout_wait_ms": self.wait_ms.snapshot(),
+            "connections_opened": self.opened,
+            "connections_closed": self.closed,
+            "connections_invalidated": self.invalidated,
+            "churn_per_minute": round((self.opened + self.closed) / uptime * 60, 3) if uptime else 0.0,
+        }
+
+    def prometheus_lines(self, pool: Pool) -> list[str]:
+        lines = []
+        gauges = (
+            ("db_pool_checked_out", "gauge", pool.checkedout()),
+            ("db_pool_idle", "gauge", pool.checkedin()),
+            ("db_pool_overflow_in_use", "gauge", max(0, pool.overflow())),
+            ("db_pool_checkouts_total", "counter", self.checkouts),
+            ("db_pool_timeouts_total", "counter", self.timeouts),
+            ("db_pool_connections_opened_total", "counter", self.opened),
+            ("db_pool_connections_closed_total", "counter", self.closed),
+            ("db_pool_connections_invalidated_total", "counter", self.invalidated),
+        )
+        for name, kind, value in gauges:
+            lines.extend((f"# TYPE {name} {kind}", f"{name} {value}"))
+        lines.append("# TYPE db_pool_checkout_wait_milliseconds histogram")
+        lines.extend(histogram_lines("db_pool_checkout_wait_milliseconds", self.wait_ms))
+        return lines
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records checkout wait time and timeouts."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
@@ -0,0 +1,11 @@
+def query_budget(max_queries: int):
+    """Declare how many SQL statements one request to this endpoint may execute.
+
+    Counted from the start of the request, dependencies included, with the
+    per-process caches warm. Nothing is checked while serving requests;
+    ``scripts/check_query_budgets.py`` and the test suite enforce budgets.
+    """
+    def decorator(endpoint):
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
@@ -0,0 +1,193 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import SessionLocal, make_engine
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Errors that mean the replica itself is unreachable, not that the query was bad
+CONNECTION_ERRORS = (exc.OperationalError, exc.InterfaceError, OSError, asyncio.TimeoutError)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = make_engine(url)
+        self.sessions = async_sessionmaker(self.engine, autoflush=False, autocommit=False, expire_on_commit=False)
+        # Optimistic until the first check, so reads work without the lifespan
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    def mark_down(self, error: str) -> None:
+        if self.healthy:
+            logger.warning("Read replica %s is unavailable, reading from the primary: %s", self.name, error)
+        self.healthy = False
+        self.last_error = error
+
+
+class ReplicaSet:
+    """Read replicas with periodic health checks.
+
+    Healthy replicas are used round robin; when none is healthy reads go to
+    the primary. A replica is taken out on a failed check or a connection
+    error during a request, and put back by the next passing check.
+    """
+
+    def __init__(self, urls: list[str], interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.interval = interval
+        self._next = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    def session(self, primary: bool = False) -> AsyncSession:
+        """A session on a healthy replica, or on the primary if there is none or ``primary`` is set."""
+        replica = None if primary else self.pick()
+        return replica.sessions() if replica is not None else SessionLocal()
+
+    async def _probe(self, replica: Replica) -> Optional[float]:
+        async with replica.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            if settings.replica_max_lag_seconds <= 0 or replica.engine.dialect.name != "mysql":
+                return None
+            status = (await conn.exec_driver_sql("SHOW REPLICA STATUS")).mappings().first()
+        if status is None:
+            return None
+        lag = status.get("Seconds_Behind_Source")
+        if lag is None:
+            raise RuntimeError("replication is not running")
+        return float(lag)
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            replica.checked_at = time.time()
+            try:
+                lag = await asyncio.wait_for(self._probe(replica), settings.replica_check_timeout_seconds)
+            except Exception as e:
+                replica.mark_down(str(e) or type(e).__name__)
+                continue
+            replica.lag_seconds = lag
+            if lag is not None and lag > settings.replica_max_lag_seconds:
+                replica.mark_down(f"{lag:.0f}s behind the primary")
+                continue
+            if not replica.healthy:
+                logger.info("Read replica %s is back", replica.name)
+            replica.healthy = True
+            replica.last_error = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Replica health check failed")
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "last_error": replica.last_error,
+                "checked_at": replica.checked_at,
+            }
+            for replica in self.replicas
+        ]
+
+
+replicas = ReplicaSet(
+    [url.strip() for url in settings.db_replica_urls.split(",") if url.strip()],
+    settings.replica_check_interval_seconds,
+)
+
+
+def reads_pinned(request: Request) -> bool:
+    """Whether this request must read from the primary (it writes, or its client wrote recently)."""
+    if request.method not in SAFE_METHODS:
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """Session for read-only handlers: a healthy replica unless reads are pinned to the primary."""
+    replica = None if reads_pinned(request) else replicas.pick()
+    if replica is None:
+        async with SessionLocal() as session:
+            yield session
+        return
+    # Lets the response cache tell replica reads from primary reads
+    request.state.read_replica = replica.name
+    async with replica.sessions() as session:
+        try:
+            yield session
+        except CONNECTION_ERRORS as e:
+            replica.mark_down(str(e) or type(e).__name__)
+            raise
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client's reads to the primary for a while after it writes.
+
+    Successful non-GET responses set a cookie holding the time until which
+    ``get_read_db`` ignores the replicas, so the client does not read data
+    older than its own write from a lagging replica.
+    """
+
+    def __init__(self, app, window: float = settings.read_your_writes_seconds):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={int(self.window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,126 @@
+import re
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.db import get_db
+from app.core.replicas import get_read_db
+from app.models.campaign import Campaign
+from app.models.hospital import Hospital
+
+UUID_RE = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+
+class IdResolver:
+    """Turn an id, uuid or slug path reference into a numeric primary key.
+
+    uuid/slug -> id mappings never change, so they are kept in an LRU cache
+    and a cached reference resolves without touching the database. Keys are
+    prefixed with the reference kind (``id:``, ``uuid:``, ``slug:``) so
+    references of different kinds never collide. Entries are dropped on
+    soft delete; the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, model, label: str, aliases: tuple[str, ...]):
+        self.model = model
+        self.label = label
+        self.aliases = aliases
+        self.cache = TTLCache(settings.resolver_cache_size, ttl=settings.resolver_cache_ttl_seconds)
+
+    def _kind(self, ref: str) -> str:
+        if ref.isdigit():
+            return "id"
+        if UUID_RE.match(ref) or "slug" not in self.aliases:
+            return "uuid"
+        return "slug"
+
+    def _criterion(self, ref: str):
+        kind = self._kind(ref)
+        return getattr(self.model, kind) == (int(ref) if kind == "id" else ref)
+
+    def _key(self, ref: str) -> str:
+        return f"{self._kind(ref)}:{ref}"
+
+    def _not_found(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{self.label} not found"
+        )
+
+    def _keys(self, row) -> list[str]:
+        keys = [f"id:{row.id}"]
+        keys.extend(f"{alias}:{getattr(row, alias)}" for alias in self.aliases if getattr(row, alias, None))
+        return keys
+
+    def peek(self, ref: str, default=None):
+        """The cached id for ``ref`` without touching its LRU position, or ``default``."""
+        return self.cache.peek(self._key(ref), default)
+
+    def remember(self, row) -> None:
+        for key in self._keys(row):
+            self.cache.set(key, row.id)
+
+    def forget(self, row) -> None:
+        for key in self._keys(row):
+            self.cache.pop(key)
+
+    async def resolve(self, ref: str, db: AsyncSession) -> int:
+        """Return the numeric id for a live row, with at most one indexed query."""
+        pk = self.cache.get(self._key(ref))
+        if pk is not None:
+            return pk
+        columns = [self.model.id] + [getattr(self.model, alias) for alias in self.aliases]
+        result = await db.execute(
+            select(*columns).where(self._criterion(ref), self.model.deleted_at.is_(None))
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise self._not_found()
+        self.remember(row)
+        return row.id
+
+    async def fetch(self, ref: str, db: AsyncSession):
+        """Load the full live row in one query, by primary key when the ref is cached."""
+        pk = self.cache.get(self._key(ref))
+        criterion = self.model.id == pk if pk is not None else self._criterion(ref)
+        result = await db.execute(
+            select(self.model).where(criterion, self.model.deleted_at.is_(None))
+        )
+        row = result.scalar_one_or_none()
+        if row is None:
+            self.cache.pop(self._key(ref))
+            raise self._not_found()
+        self.remember(row)
+        return row
+
+    async def fetch_columns(self, ref: str, db: AsyncSession, columns: list):
+        """``fetch`` for a column projection; ``columns`` must include the id."""
+        pk = self.cache.get(self._key(ref))
+        criterion = self.model.id == pk if pk is not None else self._criterion(ref)
+        result = await db.execute(
+            select(*columns).where(criterion, self.model.deleted_at.is_(None))
+        )
+        row = result.one_or_none()
+        if row is None:
+            self.cache.pop(self._key(ref))
+            raise self._not_found()
+        self.remember(row)
+        return row
+
+
+campaign_resolver = IdResolver(Campaign, "Campaign", ("uuid", "slug"))
+hospital_resolver = IdResolver(Hospital, "Hospital", ("uuid",))
+
+
+async def resolve_campaign_id(campaign_id: str, db: AsyncSession = Depends(get_db)) -> int:
+    """Dependency resolving the ``campaign_id`` path parameter to a numeric id."""
+    return await campaign_resolver.resolve(campaign_id, db)
+
+
+async def read_campaign_id(campaign_id: str, db: AsyncSession = Depends(get_read_db)) -> int:
+    """``resolve_campaign_id`` for read-only handlers, sharing their replica session."""
+    return await campaign_resolver.resolve(campaign_id, db)
+
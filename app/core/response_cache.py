@@ -0,0 +1,158 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Protocol
+
+from fastapi import Request, Response, status
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import TimedRoute
+from app.core.replicas import reads_pinned
+
+TagsFunc = Callable[[Request], Iterable[str]]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    status_code: int
+    headers: dict[str, str]
+    etag: str
+
+
+class CacheBackend(Protocol):
+    """Storage for cached responses; swap in a shared backend for multi-worker setups."""
+
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    def set(self, key: str, entry: CachedResponse, ttl: float, tags: Iterable[str]) -> None: ...
+
+    def invalidate(self, *tags: str) -> int: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class InMemoryLRUBackend:
+    """Per-process LRU backend with tag-based invalidation."""
+
+    def __init__(self, maxsize: int):
+        self._entries = TTLCache(maxsize)
+        self._tags: dict[str, set[str]] = {}
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CachedResponse, ttl: float, tags: Iterable[str]) -> None:
+        self._entries.set(key, entry, ttl=ttl)
+        for tag in tags:
+            keys = self._tags.setdefault(tag, set())
+            keys.add(key)
+            if len(keys) > 2 * self._entries.maxsize:
+                # drop keys the LRU already evicted
+                self._tags[tag] = {k for k in keys if self._entries.peek(k) is not None}
+
+    def invalidate(self, *tags: str) -> int:
+        dropped = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if self._entries.pop(key) is not None:
+                    dropped += 1
+        self.invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "tags": len(self._tags), "invalidations": self.invalidations}
+
+
+response_cache: CacheBackend = InMemoryLRUBackend(settings.response_cache_size)
+# Tags invalidated within the replica lag bound; a replica may not have the write yet
+recently_invalidated = TTLCache(settings.response_cache_size, ttl=settings.read_your_writes_seconds)
+
+
+def cache_response(ttl: float, tags: TagsFunc):
+    """Mark a GET endpoint as cacheable for ``ttl`` seconds under the given tags.
+
+    Only takes effect on routers created with ``route_class=CachedRoute``.
+    """
+    def decorator(endpoint):
+        endpoint.__cache_config__ = (ttl, tags)
+        return endpoint
+    return decorator
+
+
+def invalidate(*tags: str) -> int:
+    """Drop every cached response carrying any of ``tags``."""
+    for tag in tags:
+        recently_invalidated.set(tag, True)
+    return response_cache.invalidate(*tags)
+
+
+def _may_be_stale(request: Request, tags: list[str]) -> bool:
+    """Whether a response read from a replica could predate a recent invalidation."""
+    if getattr(request.state, "read_replica", None) is None:
+        return False
+    return any(recently_invalidated.peek(tag) for tag in tags)
+
+
+def _cache_key(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    return request.headers.get("if-none-match") == etag
+
+
+class CachedRoute(TimedRoute):
+    """Route class serving ``@cache_response`` endpoints from ``response_cache``.
+
+    Cached bodies carry a strong ETag (SHA-256 of the body) and a matching
+    ``If-None-Match`` is answered with 304. Requests pinned to the primary
+    bypass the cache, and a replica read is not stored while its tags were
+    invalidated less than ``READ_YOUR_WRITES_SECONDS`` ago, so a lagging
+    replica cannot put a pre-write body back in the cache.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        config = getattr(self.endpoint, "__cache_config__", None)
+        if config is None or not settings.response_cache_enabled:
+            return handler
+        ttl, tags = config
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET" or reads_pinned(request):
+                return await handler(request)
+
+            key = _cache_key(request)
+            entry = response_cache.get(key)
+            if entry is None:
+                response = await handler(request)
+                body = getattr(response, "body", None)
+                if response.status_code != status.HTTP_200_OK or body is None:
+                    return response
+                etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+                headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+                headers["etag"] = etag
+                entry = CachedResponse(body, response.status_code, headers, etag)
+                entry_tags = list(tags(request))
+                if not _may_be_stale(request, entry_tags):
+                    response_cache.set(key, entry, ttl, entry_tags)
+                cache_status = "MISS"
+            else:
+                cache_status = "HIT"
+
+            if _not_modified(request, entry.etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry.etag})
+            response = Response(content=entry.body, status_code=entry.status_code, headers=entry.headers)
+            response.headers["X-Cache"] = cache_status
+            return response
+
+        return cached_handler
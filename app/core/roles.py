@@ -0,0 +1,40 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.role import Role
+
+
+class RoleRegistry:
+    """In-memory copy of the roles table, loaded at startup.
+
+    The table is tiny and rarely changes, so role names are resolved from
+    memory; an unknown id triggers a single reload before giving up.
+    """
+
+    def __init__(self):
+        self._names: dict[int, str] = {}
+        self.loaded = False
+
+    async def load(self, db: AsyncSession) -> None:
+        result = await db.execute(select(Role.id, Role.name))
+        self._names = {row.id: row.name for row in result}
+        self.loaded = True
+
+    def name(self, role_id: int) -> Optional[str]:
+        return self._names.get(role_id)
+
+    async def resolve(self, role_id: int, db: AsyncSession) -> Optional[str]:
+        """Return the role name, reloading the registry once on a miss."""
+        name = self._names.get(role_id)
+        if name is None:
+            await self.load(db)
+            name = self._names.get(role_id)
+        return name
+
+    def all(self) -> list[dict]:
+        return [{"id": role_id, "name": name} for role_id, name in sorted(self._names.items())]
+
+
+role_registry = RoleRegistry()
@@ -1,9 +1,13 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, BigInteger, Enum, DECIMAL, TIMESTAMP
+from sqlalchemy import String, BigInteger, Enum, DECIMAL, TIMESTAMP, Index
 from app.core.db import Base
 
 class Campaign(Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        # keyset pagination: published_at DESC, id DESC
+        Index("ix_campaigns_published", "published_at", "id"),
+    )
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     uuid: Mapped[str] = mapped_column(String(36), unique=True, nullable=False)
     slug: Mapped[str | None] = mapped_column(String(255), unique=True)
@@ -18,6 +22,7 @@ class Campaign(Base):
     cost_estimate: Mapped[float] = mapped_column(DECIMAL(14,2), default=0)
     target_amount: Mapped[float] = mapped_column(DECIMAL(14,2), default=0)
     amount_raised: Mapped[float] = mapped_column(DECIMAL(14,2), default=0)
+    follower_count: Mapped[int] = mapped_column(default=0, server_default="0")  # maintained by follow/unfollow
     verified: Mapped[int] = mapped_column(default=0)
     status: Mapped[str] = mapped_column(
         Enum('draft','pending_review','published','paused','funded','rejected'), default='draft'
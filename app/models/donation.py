@@ -1,9 +1,16 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, BigInteger, DECIMAL, TIMESTAMP, TEXT
+from sqlalchemy import String, BigInteger, DECIMAL, TIMESTAMP, TEXT, Enum, Index, UniqueConstraint
 from app.core.db import Base
 
 class Donation(Base):
     __tablename__ = "donations"
+    __table_args__ = (
+        # keyset pagination: (filter, created_at DESC, id DESC)
+        Index("ix_donations_campaign_created", "campaign_id", "created_at", "id"),
+        Index("ix_donations_user_created", "user_id", "created_at", "id"),
+        # reconciliation of completed donations not yet added to amount_raised
+        Index("ix_donations_status_applied", "status", "applied_at"),
+    )
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     uuid: Mapped[str] = mapped_column(String(36), unique=True, nullable=False)
     campaign_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -15,6 +22,7 @@ class Donation(Base):
     payment_method: Mapped[str | None] = mapped_column(String(50))
     payment_reference: Mapped[str | None] = mapped_column(String(255))
     status: Mapped[str] = mapped_column(String(50), default='pending')  # pending, completed, failed, refunded
+    applied_at: Mapped[str | None] = mapped_column(TIMESTAMP)  # when amount was added to campaigns.amount_raised
     created_at: Mapped[str | None] = mapped_column(TIMESTAMP)
     updated_at: Mapped[str | None] = mapped_column(TIMESTAMP)
 
@@ -38,7 +46,38 @@ class CampaignDocument(Base):
 
 class CampaignFollower(Base):
     __tablename__ = "campaign_followers"
+    __table_args__ = (
+        # one row per follower; lets follow be an idempotent insert-ignore
+        UniqueConstraint("campaign_id", "user_id", name="uq_campaign_followers_campaign_user"),
+        # keyset pagination of a campaign's followers by id
+        Index("ix_campaign_followers_campaign_id", "campaign_id", "id"),
+    )
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     campaign_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
-    followed_at: Mapped[str | None] = mapped_column(TIMESTAMP)
\ No newline at end of file
+    followed_at: Mapped[str | None] = mapped_column(TIMESTAMP)
+
+class CampaignDonationRollup(Base):
+    """Applied donations per campaign and hour/day bucket, maintained incrementally."""
+    __tablename__ = "campaign_donation_rollups"
+    campaign_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    bucket: Mapped[str] = mapped_column(Enum('hour','day'), primary_key=True)
+    bucket_start: Mapped[str] = mapped_column(TIMESTAMP, primary_key=True)  # UTC
+    amount: Mapped[float] = mapped_column(DECIMAL(16,2), nullable=False, default=0)
+    donations: Mapped[int] = mapped_column(nullable=False, default=0)
+    donors: Mapped[int] = mapped_column(nullable=False, default=0)
+
+class CampaignDonationRollupDonor(Base):
+    """Donations per donor in a rollup bucket; its rows per bucket are the unique donors."""
+    __tablename__ = "campaign_donation_rollup_donors"
+    campaign_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    bucket: Mapped[str] = mapped_column(Enum('hour','day'), primary_key=True)
+    bucket_start: Mapped[str] = mapped_column(TIMESTAMP, primary_key=True)
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    donations: Mapped[int] = mapped_column(nullable=False, default=0)
+
+class CampaignDonationRollupLock(Base):
+    """Sentinel row whose row lock serializes rollup writers across processes."""
+    __tablename__ = "campaign_donation_rollup_locks"
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    locked_at: Mapped[str | None] = mapped_column(TIMESTAMP)
@@ -1,8 +1,10 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from decimal import Decimal
 
+from app.schemas.donation import DonationList
+
 
 class CampaignBase(BaseModel):
     title: str
@@ -21,6 +23,10 @@ class CampaignCreate(CampaignBase):
     pass
 
 
+class CampaignBulkCreate(BaseModel):
+    campaigns: List[CampaignCreate] = Field(min_length=1, max_length=500)
+
+
 class CampaignUpdate(BaseModel):
     title: Optional[str] = None
     short_description: Optional[str] = None
@@ -40,6 +46,7 @@ class CampaignInDBBase(CampaignBase):
     uuid: str
     slug: Optional[str] = None
     amount_raised: Decimal
+    follower_count: int = 0
     verified: int
     status: str
     published_at: Optional[datetime] = None
@@ -64,6 +71,7 @@ class CampaignList(BaseModel):
     urgency: str
     target_amount: Decimal
     amount_raised: Decimal
+    follower_count: int = 0
     verified: int
     status: str
     published_at: Optional[datetime] = None
@@ -118,4 +126,27 @@ class CampaignFollower(BaseModel):
 
 
 class CampaignFollowerCreate(BaseModel):
-    pass  # user_id will come from authentication
\ No newline at end of file
+    pass  # user_id will come from authentication
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    id: int
+    slug: Optional[str] = None
+    title: str
+    urgency: str
+    target_amount: float
+    amount_raised: float
+    raised_today: float
+
+
+class CampaignLeaderboardRanks(BaseModel):
+    closest_to_goal: Optional[int] = None
+    most_funded_today: Optional[int] = None
+    most_urgent_underfunded: Optional[int] = None
+
+
+class CampaignFull(BaseModel):
+    campaign: Campaign
+    images: List[CampaignImage]
+    documents: List[CampaignDocument]
+    recent_donations: List[DonationList]
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
 from decimal import Decimal
 
 
@@ -14,6 +14,12 @@ class DonationBase(BaseModel):
 
 class DonationCreate(DonationBase):
     campaign_id: int
+    amount: Decimal = Field(gt=0, max_digits=14, decimal_places=2)
+    payment_reference: Optional[str] = None
+
+
+class DonationStatusUpdate(BaseModel):
+    status: Literal["pending", "completed", "failed", "refunded"]
 
 
 class DonationInDBBase(DonationBase):
@@ -44,4 +50,11 @@ class DonationList(BaseModel):
     created_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class DonationBucket(BaseModel):
+    bucket_start: datetime
+    amount: Decimal
+    donations: int
+    donors: int
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from decimal import Decimal
 
@@ -56,4 +56,22 @@ class HospitalList(BaseModel):
     verification_status: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class HospitalNearby(HospitalList):
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+class HospitalImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class HospitalImportReport(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[HospitalImportError]
+    errors_omitted: int = 0
@@ -0,0 +1,220 @@
+import asyncio
+import bisect
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.replicas import replicas
+from app.models.campaign import Campaign
+from app.models.donation import CampaignDonationRollup
+
+logger = logging.getLogger(__name__)
+
+BOARDS = ("closest_to_goal", "most_funded_today", "most_urgent_underfunded")
+URGENCY_RANK = {"critical": 3, "high": 2, "medium": 1, "low": 0}
+
+
+class RankedSet:
+    """Ids kept in sort-key order, best (lowest key) first.
+
+    Keys live in one list maintained with ``bisect``: the rank of an id and
+    the start of a page are found in O(log n). Inserting or removing a key
+    also shifts the list's tail, a memmove that is cheap next to sorting
+    every campaign per request.
+    """
+
+    def __init__(self):
+        self._keys: list[tuple] = []
+        self._key_of: dict[int, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set(self, item_id: int, key: Optional[tuple]) -> None:
+        """Place ``item_id`` at ``key``, or take it out when ``key`` is None."""
+        old = self._key_of.pop(item_id, None)
+        if old is not None:
+            del self._keys[bisect.bisect_left(self._keys, old)]
+        if key is not None:
+            # The id breaks ties, so every key is unique and found exactly
+            key = (*key, item_id)
+            bisect.insort(self._keys, key)
+            self._key_of[item_id] = key
+
+    def rank(self, item_id: int) -> Optional[int]:
+        key = self._key_of.get(item_id)
+        return None if key is None else bisect.bisect_left(self._keys, key) + 1
+
+    def page(self, skip: int, limit: int) -> list[int]:
+        return [key[-1] for key in self._keys[skip:skip + limit]]
+
+
+def _progress(entry: dict) -> float:
+    return float(entry["amount_raised"] / entry["target_amount"])
+
+
+def _board_keys(entry: dict) -> dict[str, Optional[tuple]]:
+    """Sort key of a campaign on each board, None where it does not take part."""
+    underfunded = entry["target_amount"] > 0 and entry["amount_raised"] < entry["target_amount"]
+    return {
+        "closest_to_goal": (-_progress(entry),) if underfunded else None,
+        "most_funded_today": (-entry["raised_today"],) if entry["raised_today"] > 0 else None,
+        "most_urgent_underfunded": (
+            (-URGENCY_RANK.get(entry["urgency"], 0), _progress(entry)) if underfunded else None
+        ),
+    }
+
+
+class CampaignLeaderboards:
+    """In-memory funding leaderboards over published campaigns.
+
+    ``closest_to_goal`` ranks underfunded campaigns by the share of their
+    target raised; ``most_funded_today`` by the amount applied since UTC
+    midnight; ``most_urgent_underfunded`` by urgency, then least funded.
+    Loaded in one streamed query, kept in sync by the campaign write
+    handlers and the donation aggregator, and reloaded every
+    ``interval`` seconds to pick up changes made by other workers.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.loaded = False
+        self.loaded_at: Optional[datetime] = None
+        self._entries: dict[int, dict] = {}
+        self._boards = {name: RankedSet() for name in BOARDS}
+        self._day = datetime.utcnow().date()
+        self._task: asyncio.Task | None = None
+
+    def _place(self, entry: dict) -> None:
+        for name, key in _board_keys(entry).items():
+            self._boards[name].set(entry["id"], key)
+
+    def _roll_day(self) -> None:
+        today = datetime.utcnow().date()
+        if today == self._day:
+            return
+        self._day = today
+        self._boards["most_funded_today"] = RankedSet()
+        for entry in self._entries.values():
+            entry["raised_today"] = Decimal(0)
+
+    def upsert(self, campaign) -> None:
+        """Add, re-rank or drop a campaign (ORM object or row) after it was written."""
+        if campaign.status != "published" or getattr(campaign, "deleted_at", None) is not None:
+            self.remove(campaign.id)
+            return
+        raised_today = getattr(campaign, "raised_today", None)
+        if raised_today is None:
+            # Write handlers pass the campaign alone; today's total is only known here
+            previous = self._entries.get(campaign.id)
+            raised_today = previous["raised_today"] if previous is not None else 0
+        entry = {
+            "id": campaign.id,
+            "slug": campaign.slug,
+            "title": campaign.title,
+            "urgency": campaign.urgency,
+            "target_amount": Decimal(campaign.target_amount or 0),
+            "amount_raised": Decimal(campaign.amount_raised or 0),
+            "raised_today": Decimal(raised_today),
+        }
+        self._entries[campaign.id] = entry
+        self._place(entry)
+
+    def remove(self, campaign_id: int) -> None:
+        if self._entries.pop(campaign_id, None) is None:
+            return
+        for board in self._boards.values():
+            board.set(campaign_id, None)
+
+    def record_donations(self, rows: Iterable, sign: int = 1) -> None:
+        """Apply donations (``campaign_id``, ``amount``, ``created_at``) added to or taken out of amount_raised."""
+        self._roll_day()
+        for row in rows:
+            entry = self._entries.get(row.campaign_id)
+            if entry is None:
+                continue
+            amount = sign * Decimal(row.amount)
+            entry["amount_raised"] += amount
+            if row.created_at is not None and row.created_at.date() == self._day:
+                entry["raised_today"] += amount
+            self._place(entry)
+
+    async def load(self, db: AsyncSession) -> None:
+        """Rebuild every board from one streamed query over campaigns and today's rollups."""
+        day = datetime.utcnow().date()
+        today = (
+            select(CampaignDonationRollup.campaign_id, CampaignDonationRollup.amount)
+            .where(
+                CampaignDonationRollup.bucket == "day",
+                CampaignDonationRollup.bucket_start == datetime.combine(day, datetime.min.time()),
+            )
+            .subquery()
+        )
+        result = await db.stream(
+            select(
+                Campaign.id, Campaign.slug, Campaign.title, Campaign.urgency, Campaign.status,
+                Campaign.target_amount, Campaign.amount_raised,
+                func.coalesce(today.c.amount, 0).label("raised_today"),
+            )
+            .outerjoin(today, today.c.campaign_id == Campaign.id)
+            .where(Campaign.deleted_at.is_(None), Campaign.status == "published")
+            .execution_options(yield_per=1000)
+        )
+        fresh = CampaignLeaderboards(self.session_factory, self.interval)
+        async for row in result:
+            fresh.upsert(row)
+        # Swap in one step so readers never see half-built boards
+        self._entries, self._boards, self._day = fresh._entries, fresh._boards, day
+        self.loaded = True
+        self.loaded_at = datetime.utcnow()
+
+    def page(self, board: str, skip: int, limit: int) -> list[dict]:
+        self._roll_day()
+        ids = self._boards[board].page(skip, limit)
+        return [
+            {"rank": skip + i + 1, **self._entries[campaign_id]}
+            for i, campaign_id in enumerate(ids)
+        ]
+
+    def ranks(self, campaign_id: int) -> dict[str, Optional[int]]:
+        self._roll_day()
+        return {name: board.rank(campaign_id) for name, board in self._boards.items()}
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with self.session_factory() as db:
+                    await self.load(db)
+            except Exception:
+                logger.exception("Leaderboard reload failed")
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "campaigns": len(self._entries),
+            "boards": {name: len(board) for name, board in self._boards.items()},
+            "loaded_at": self.loaded_at,
+            "interval_seconds": self.interval,
+        }
+
+
+campaign_leaderboards = CampaignLeaderboards(replicas.session, settings.leaderboard_reload_interval_seconds)
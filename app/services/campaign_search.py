@@ -0,0 +1,316 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+import re
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.replicas import replicas
+from app.models.campaign import Campaign
+
+logger = logging.getLogger(__name__)
+
+# \w alone splits Sinhala and Tamil words at their vowel signs and zero-width joiners
+TOKEN_RE = re.compile(r"[\w\u0b80-\u0bff\u0d80-\u0dff\u200c\u200d]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+FIELD_WEIGHTS = (("title", 3.0), ("short_description", 2.0), ("full_description", 1.0))
+INDEX_COLUMNS = (
+    Campaign.id, Campaign.title, Campaign.short_description, Campaign.full_description,
+    Campaign.status, Campaign.urgency, Campaign.city,
+)
+MIN_PREFIX = 2
+MAX_PREFIX_EXPANSIONS = 50
+# Words in more documents than this are searched in impact order with early termination
+RANKED_THRESHOLD = 2000
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class CampaignSearchIndex:
+    """In-memory inverted index over campaign text, ranked with BM25.
+
+    Title, short and full description are indexed with per-field weights
+    (BM25F-style weighted term frequencies). Every query word must match;
+    the last one also matches as a prefix so partially typed words find
+    results. Status, urgency and city are kept per document for filtering.
+    Kept in sync by the campaign write handlers, and reloaded every
+    ``interval`` seconds to pick up changes made by other workers.
+
+    Postings of common words are also kept ordered by impact (a small LRU)
+    so that top-k queries on them need not score every matching document.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, session_factory: Optional[async_sessionmaker] = None, interval: float = 0):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.loaded = False
+        self.loaded_at: Optional[datetime] = None
+        self._task: asyncio.Task | None = None
+        self._postings: dict[str, dict[int, float]] = {}
+        self._vocab: list[str] = []
+        self._docs: dict[int, tuple[tuple[str, ...], float, tuple]] = {}
+        self._total_length = 0.0
+        self._ranked = TTLCache(256)
+        self._ranked_avgdl: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def upsert(self, campaign) -> None:
+        """Index or re-index a campaign (ORM object or row with the index columns)."""
+        self.remove(campaign.id)
+        frequencies: dict[str, float] = {}
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(getattr(campaign, field)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+        facets = (campaign.status, campaign.urgency, (campaign.city or "").lower())
+        self._docs[campaign.id] = (tuple(frequencies), length, facets)
+        self._total_length += length
+        for term, tf in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocab, term)
+            postings[campaign.id] = tf
+            ranked = self._ranked.peek(term)
+            if ranked is not None:
+                bisect.insort(ranked, campaign.id, key=self._rank_key(term))
+
+    def remove(self, campaign_id: int) -> None:
+        doc = self._docs.get(campaign_id)
+        if doc is None:
+            return
+        terms, length, _ = doc
+        for term in terms:
+            ranked = self._ranked.peek(term)
+            if ranked is not None:
+                key = self._rank_key(term)
+                del ranked[bisect.bisect_left(ranked, key(campaign_id), key=key)]
+            postings = self._postings[term]
+            del postings[campaign_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocab[bisect.bisect_left(self._vocab, term)]
+        del self._docs[campaign_id]
+        self._total_length -= length
+
+    async def load(self, db: AsyncSession) -> None:
+        """Rebuild the index from the campaigns table in one streamed pass."""
+        fresh = CampaignSearchIndex()
+        result = await db.stream(
+            select(*INDEX_COLUMNS)
+            .where(Campaign.deleted_at.is_(None))
+            .execution_options(yield_per=1000)
+        )
+        async for row in result:
+            fresh.upsert(row)
+        # Swap in one step so searches never see a half-built index
+        self._postings, self._vocab = fresh._postings, fresh._vocab
+        self._docs, self._total_length = fresh._docs, fresh._total_length
+        self._ranked.clear()
+        self._ranked_avgdl = None
+        self.loaded = True
+        self.loaded_at = datetime.utcnow()
+
+    def _expand(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._vocab, prefix)
+        terms = []
+        for term in self._vocab[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _term_groups(self, query: str) -> Optional[list[list[str]]]:
+        """Index terms per query word (several for the prefix word); None if a word has no match."""
+        words = list(dict.fromkeys(tokenize(query)))
+        groups = []
+        for i, word in enumerate(words):
+            if i == len(words) - 1 and len(word) >= MIN_PREFIX:
+                terms = self._expand(word)
+            else:
+                terms = [word] if word in self._postings else []
+            if not terms:
+                return None
+            groups.append(terms)
+        return groups
+
+    def _avgdl(self) -> float:
+        # Impact orderings depend on the average length; rebuild them once it drifts by 1%
+        n = len(self._docs)
+        current = self._total_length / n if n else 1.0
+        if self._ranked_avgdl is None or abs(current - self._ranked_avgdl) > 0.01 * self._ranked_avgdl:
+            self._ranked.clear()
+            self._ranked_avgdl = current
+        return self._ranked_avgdl
+
+    def _impact(self, tf: float, length: float, avgdl: float) -> float:
+        return tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avgdl))
+
+    def _rank_key(self, term: str):
+        postings, docs, avgdl = self._postings[term], self._docs, self._ranked_avgdl
+        return lambda doc: (self._impact(postings[doc], docs[doc][1], avgdl), doc)
+
+    def _by_impact(self, term: str) -> list[int]:
+        """Doc ids of a term's postings ordered by their BM25 term impact, lowest first.
+
+        Built on first use and then kept ordered by ``upsert``/``remove``.
+        """
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            ranked = sorted(self._postings[term], key=self._rank_key(term))
+            self._ranked.set(term, ranked)
+        return ranked
+
+    def search(
+        self,
+        query: str,
+        status: Optional[str] = None,
+        urgency: Optional[str] = None,
+        city: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[int]:
+        """Campaign ids matching ``query`` and the filters, best match first.
+
+        A document scores the sum over query words of the BM25 weight of the
+        word (the best-matching expansion for the prefix word).
+        """
+        groups = self._term_groups(query)
+        if not groups:
+            return []
+
+        n = len(self._docs)
+        avgdl = self._avgdl()
+        weighted = []
+        for group in groups:
+            entries = []
+            for term in group:
+                postings = self._postings[term]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                entries.append((term, postings, idf))
+            weighted.append(entries)
+        # Drive from the rarest word so the candidate set stays small
+        weighted.sort(key=lambda group: sum(len(postings) for _, postings, _ in group))
+        driving, rest = weighted[0], weighted[1:]
+        city = city.lower() if city else None
+        docs = self._docs
+
+        def accepts(doc: int) -> bool:
+            _, _, (doc_status, doc_urgency, doc_city) = docs[doc]
+            if (status and doc_status != status) or (urgency and doc_urgency != urgency) or (city and doc_city != city):
+                return False
+            return all(any(doc in postings for _, postings, _ in group) for group in rest)
+
+        k1, b = self.k1, self.b
+
+        def score(doc: int, groups) -> float:
+            # Inlined _impact(): this runs once per candidate
+            norm = k1 * (1 - b + b * docs[doc][1] / avgdl)
+            total = 0.0
+            for group in groups:
+                best = 0.0
+                for _, postings, idf in group:
+                    tf = postings.get(doc)
+                    if tf:
+                        weight = idf * (tf * (k1 + 1) / (tf + norm))
+                        if weight > best:
+                            best = weight
+                total += best
+            return total
+
+        wanted = offset + limit
+        if sum(len(postings) for _, postings, _ in driving) <= RANKED_THRESHOLD:
+            best: dict[int, float] = {}
+            for _, postings, idf in driving:
+                for doc, tf in postings.items():
+                    weight = idf * self._impact(tf, docs[doc][1], avgdl)
+                    if weight > best.get(doc, 0.0):
+                        best[doc] = weight
+            top = heapq.nlargest(
+                wanted, ((weight + score(doc, rest), doc) for doc, weight in best.items() if accepts(doc))
+            )
+            return [doc for _, doc in top[offset:]]
+
+        # Common words: walk postings in impact order and stop once no unseen
+        # document can beat the current top ``wanted`` (MaxScore-style).
+        def contributions(term, postings, idf):
+            for doc in reversed(self._by_impact(term)):
+                yield idf * self._impact(postings[doc], docs[doc][1], avgdl), doc
+
+        rest_bound = 0.0
+        for group in rest:
+            rest_bound += max(
+                idf * self._impact(postings[top_doc], docs[top_doc][1], avgdl)
+                for term, postings, idf in group
+                for top_doc in self._by_impact(term)[-1:]
+            )
+        heap: list[tuple[float, int]] = []
+        seen: set[int] = set()
+        for bound, doc in heapq.merge(*(contributions(*entry) for entry in driving), reverse=True):
+            if len(heap) == wanted and bound + rest_bound < heap[0][0]:
+                break
+            if doc in seen:
+                continue
+            seen.add(doc)
+            if not accepts(doc):
+                continue
+            entry = (score(doc, weighted), doc)
+            if len(heap) < wanted:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        top = sorted(heap, reverse=True)
+        return [doc for _, doc in top[offset:]]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with self.session_factory() as db:
+                    await self.load(db)
+            except Exception:
+                logger.exception("Campaign search index reload failed")
+
+    def start(self) -> None:
+        if self._task is None and self.session_factory is not None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._vocab),
+            "loaded": self.loaded,
+            "loaded_at": self.loaded_at,
+            "interval_seconds": self.interval,
+        }
+
+
+campaign_search = CampaignSearchIndex(replicas.session, settings.search_reload_interval_seconds)
@@ -0,0 +1,94 @@
+import re
+from typing import Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import generate_uuid
+from app.models.campaign import Campaign
+
+SLUG_ATTEMPTS = 5
+SLUG_MAX_LENGTH = 240  # leaves room for a "-<n>" suffix within String(255)
+# A duplicate on the slug unique key, as MySQL (5.7 and 8) and SQLite report it
+_SLUG_CONFLICT = re.compile(
+    r"Duplicate entry .* for key '(?:campaigns\.)?slug'|UNIQUE constraint failed: campaigns\.slug"
+)
+
+
+def slugify(title: str) -> str:
+    slug = re.sub(r'[^a-zA-Z0-9\s]', '', title.lower())
+    slug = re.sub(r'\s+', '-', slug.strip())
+    slug = slug[:SLUG_MAX_LENGTH].strip("-") or "campaign"
+    # An all-digit slug would be read as a numeric id in paths
+    return f"campaign-{slug}" if slug.isdigit() else slug
+
+
+async def allocate_slugs(db: AsyncSession, titles: Sequence[str]) -> list[str]:
+    """Pick a free slug for every title with one prefix query.
+
+    A base slug that is taken gets the lowest free ``-<n>`` suffix. Soft
+    deleted campaigns keep their slug, so they count as taken, exactly as
+    the unique index sees them.
+    """
+    bases = [slugify(title) for title in titles]
+    distinct = set(bases)
+    result = await db.execute(
+        select(Campaign.slug).where(
+            or_(*(or_(Campaign.slug == base, Campaign.slug.like(f"{base}-%")) for base in distinct))
+        )
+    )
+    taken: dict[str, set[int]] = {base: set() for base in distinct}
+    for (slug,) in result:
+        if slug in taken:
+            taken[slug].add(0)
+        base, _, suffix = slug.rpartition("-")
+        if base in taken and suffix.isdigit():
+            taken[base].add(int(suffix))
+
+    slugs = []
+    for base in bases:
+        used = taken[base]
+        n = 0
+        while n in used:
+            n += 1
+        used.add(n)
+        slugs.append(f"{base}-{n}" if n else base)
+    return slugs
+
+
+async def insert_campaigns(db: AsyncSession, rows: list[dict]) -> list[Campaign]:
+    """Insert campaigns with freshly allocated slugs in one transaction.
+
+    The unique index on ``slug`` is the source of truth: if a concurrent
+    create takes one of the chosen slugs, the batch is rolled back and the
+    slugs are allocated again. Any other integrity error rejects the batch
+    with 400 and the database's reason.
+    """
+    for row in rows:
+        row["uuid"] = generate_uuid()
+    for _ in range(SLUG_ATTEMPTS):
+        for row, slug in zip(rows, await allocate_slugs(db, [row["title"] for row in rows])):
+            row["slug"] = slug
+        try:
+            await db.execute(insert(Campaign), rows)
+            await db.commit()
+            break
+        except IntegrityError as exc:
+            await db.rollback()
+            if not _SLUG_CONFLICT.search(str(exc.orig)):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Campaign rejected by the database: {exc.orig}"
+                )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Could not allocate a unique slug, please retry"
+        )
+
+    uuids = [row["uuid"] for row in rows]
+    result = await db.execute(select(Campaign).where(Campaign.uuid.in_(uuids)))
+    by_uuid = {campaign.uuid: campaign for campaign in result.scalars()}
+    return [by_uuid[uuid] for uuid in uuids]
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.response_cache import invalidate
+from app.models.campaign import Campaign
+from app.models.donation import Donation
+from app.services import donation_rollups
+from app.services.campaign_leaderboards import campaign_leaderboards
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+# Campaigns per transaction when rebuilding or checking rollups
+ROLLUP_CAMPAIGN_CHUNK = 200
+
+_campaigns = Campaign.__table__
+_increment_raised = (
+    update(_campaigns)
+    .where(_campaigns.c.id == bindparam("campaign_pk"))
+    .values(amount_raised=_campaigns.c.amount_raised + bindparam("delta"))
+)
+
+
+class DonationAggregator:
+    """Write-behind aggregator for ``Campaign.amount_raised`` and the donation rollups.
+
+    Donation rows are committed by the request; only their ids are queued
+    here. Every flush re-reads the queued rows that are still completed and
+    un-applied, adds one ``amount_raised = amount_raised + ?`` per campaign,
+    adds them to the hour/day rollups and stamps ``applied_at`` in the same
+    transaction. Nothing is lost on a crash: ``reconcile()`` requeues every
+    completed, un-applied donation.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.flushes = 0
+        self.applied = 0
+        self._pending: set[int] = set()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def add(self, donation_id: int) -> None:
+        self._pending.add(donation_id)
+
+    def discard(self, donation_id: int) -> None:
+        self._pending.discard(donation_id)
+
+    async def flush(self) -> dict[int, Decimal]:
+        """Apply every queued donation; return the per-campaign deltas applied."""
+        async with self._lock:
+            if not self._pending:
+                return {}
+            ids, self._pending = self._pending, set()
+            try:
+                async with self.session_factory() as db:
+                    deltas = await self._apply(db, sorted(ids))
+            except Exception:
+                self._pending |= ids
+                raise
+            self.flushes += 1
+            invalidate(*(f"campaign:{cid}" for cid in deltas))
+            return deltas
+
+    async def _apply(self, db: AsyncSession, ids: list[int]) -> dict[int, Decimal]:
+        totals: dict[int, Decimal] = defaultdict(Decimal)
+        applied_rows = []
+        await donation_rollups.lock(db)
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            rows = (await db.execute(
+                select(Donation.id, Donation.campaign_id, Donation.user_id, Donation.amount, Donation.created_at)
+                .where(
+                    Donation.id.in_(chunk),
+                    Donation.status == "completed",
+                    Donation.applied_at.is_(None),
+                )
+                .with_for_update()
+            )).all()
+            if not rows:
+                continue
+
+            deltas: dict[int, Decimal] = defaultdict(Decimal)
+            for row in rows:
+                deltas[row.campaign_id] += Decimal(row.amount)
+            await db.execute(
+                _increment_raised,
+                [{"campaign_pk": cid, "delta": delta} for cid, delta in sorted(deltas.items())],
+            )
+            await donation_rollups.apply(db, rows)
+            await db.execute(
+                update(Donation)
+                .where(Donation.id.in_([row.id for row in rows]))
+                .values(applied_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            for cid, delta in deltas.items():
+                totals[cid] += delta
+            applied_rows.extend(rows)
+        await db.commit()
+        self.applied += len(applied_rows)
+        campaign_leaderboards.record_donations(applied_rows)
+        return dict(totals)
+
+    async def reconcile(self) -> int:
+        """Queue completed donations that were never applied (e.g. after a crash)."""
+        async with self.session_factory() as db:
+            result = await db.stream_scalars(
+                select(Donation.id)
+                .where(Donation.status == "completed", Donation.applied_at.is_(None))
+                .execution_options(yield_per=CHUNK_SIZE)
+            )
+            count = 0
+            async for donation_id in result:
+                self._pending.add(donation_id)
+                count += 1
+        await self.flush()
+        return count
+
+    async def _campaign_chunks(self, campaign_id: int | None):
+        if campaign_id is not None:
+            yield [campaign_id]
+            return
+        last = 0
+        while True:
+            async with self.session_factory() as db:
+                ids = (await db.execute(
+                    select(Campaign.id).where(Campaign.id > last).order_by(Campaign.id).limit(ROLLUP_CAMPAIGN_CHUNK)
+                )).scalars().all()
+            if not ids:
+                return
+            yield list(ids)
+            last = ids[-1]
+
+    async def rebuild_rollups(self, campaign_id: int | None = None) -> dict:
+        """Rebuild the donation rollups from applied donations, a chunk of campaigns per transaction.
+
+        Every chunk holds the database rollup lock that flushes also take,
+        so flushes in any process wait while it is rebuilt and no donation is
+        counted twice or missed.
+        """
+        campaigns = buckets = 0
+        async for ids in self._campaign_chunks(campaign_id):
+            async with self._lock, self.session_factory() as db:
+                await donation_rollups.lock(db)
+                buckets += await donation_rollups.replace(db, ids)
+                await db.commit()
+            campaigns += len(ids)
+            invalidate(*(f"campaign:{cid}" for cid in ids))
+        return {"campaigns": campaigns, "buckets": buckets}
+
+    async def check_rollups(self, campaign_id: int | None = None, limit: int = 100) -> dict:
+        """Compare the stored rollups with the raw donations; report up to ``limit`` mismatches."""
+        campaigns = buckets = mismatched = 0
+        mismatches = []
+        async for ids in self._campaign_chunks(campaign_id):
+            async with self._lock, self.session_factory() as db:
+                await donation_rollups.lock(db)
+                expected = await donation_rollups.compute(db, ids)
+                actual = await donation_rollups.stored(db, ids)
+                await db.rollback()
+            campaigns += len(ids)
+            buckets += len(expected)
+            for key in sorted(expected.keys() | actual.keys()):
+                if expected.get(key) == actual.get(key):
+                    continue
+                mismatched += 1
+                if len(mismatches) < limit:
+                    mismatches.append({
+                        "campaign_id": key[0],
+                        "bucket": key[1],
+                        "bucket_start": key[2],
+                        "expected": expected.get(key),
+                        "stored": actual.get(key),
+                    })
+        return {"campaigns": campaigns, "buckets": buckets, "mismatched": mismatched, "mismatches": mismatches}
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("amount_raised flush failed; will retry")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "applied": self.applied,
+            "interval_seconds": self.interval,
+        }
+
+
+donation_aggregator = DonationAggregator(SessionLocal, settings.donation_flush_interval_seconds)
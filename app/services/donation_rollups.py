@@ -0,0 +1,194 @@
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.donation import (
+    CampaignDonationRollup,
+    CampaignDonationRollupDonor,
+    CampaignDonationRollupLock,
+    Donation,
+)
+
+BUCKETS = ("hour", "day")
+
+_rollups = CampaignDonationRollup.__table__
+_donors = CampaignDonationRollupDonor.__table__
+_locks = CampaignDonationRollupLock.__table__
+LOCK_NAME = "donation_rollups"
+_BUCKET_KEY = ("campaign_id", "bucket", "bucket_start")
+_recount_donors = (
+    update(_rollups)
+    .where(
+        _rollups.c.campaign_id == bindparam("campaign_pk"),
+        _rollups.c.bucket == bindparam("bucket_name"),
+        _rollups.c.bucket_start == bindparam("start"),
+    )
+    .values(donors=(
+        select(func.count())
+        .select_from(_donors)
+        .where(
+            _donors.c.campaign_id == bindparam("campaign_pk"),
+            _donors.c.bucket == bindparam("bucket_name"),
+            _donors.c.bucket_start == bindparam("start"),
+        )
+        .scalar_subquery()
+    ))
+)
+
+# Donations that count: the same ones already added to amount_raised
+APPLIED = (Donation.status == "completed", Donation.applied_at.is_not(None))
+
+
+def bucket_start(moment: datetime, bucket: str) -> datetime:
+    if bucket == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def accumulate(rows: Iterable, sign: int = 1) -> tuple[dict, dict]:
+    """Per-bucket ``[amount, donations]`` and per-bucket-donor donation deltas of ``rows``.
+
+    Rows need ``campaign_id``, ``user_id``, ``amount`` and ``created_at``.
+    """
+    buckets: dict[tuple, list] = defaultdict(lambda: [Decimal(0), 0])
+    donors: dict[tuple, int] = defaultdict(int)
+    for row in rows:
+        if row.created_at is None:
+            continue
+        for bucket in BUCKETS:
+            key = (row.campaign_id, bucket, bucket_start(row.created_at, bucket))
+            totals = buckets[key]
+            totals[0] += sign * Decimal(row.amount)
+            totals[1] += sign
+            if row.user_id is not None:
+                donors[(*key, row.user_id)] += sign
+    return buckets, donors
+
+
+def _increment(db: AsyncSession, table, keys: tuple[str, ...], columns: tuple[str, ...]):
+    """``INSERT ... ON DUPLICATE KEY UPDATE column = column + new`` for this session's dialect."""
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in columns})
+    stmt = sqlite.insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys), set_={c: table.c[c] + stmt.excluded[c] for c in columns}
+    )
+
+
+async def lock(db: AsyncSession) -> None:
+    """Hold the rollup writer lock until the caller's transaction ends.
+
+    Upserts a sentinel row: MySQL keeps its row lock, SQLite its database
+    write lock, until commit or rollback, so every process that calls this
+    first thing in a transaction reads and writes the rollups in turn.
+    """
+    values = {"name": LOCK_NAME, "locked_at": datetime.utcnow()}
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql.insert(_locks).values(values)
+        stmt = stmt.on_duplicate_key_update(locked_at=stmt.inserted.locked_at)
+    else:
+        stmt = sqlite.insert(_locks).values(values)
+        stmt = stmt.on_conflict_do_update(index_elements=["name"], set_={"locked_at": stmt.excluded.locked_at})
+    await db.execute(stmt)
+
+
+async def apply(db: AsyncSession, rows: Iterable, sign: int = 1) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) donations from the rollups, in the caller's transaction."""
+    buckets, donors = accumulate(rows, sign)
+    if not buckets:
+        return
+    await db.execute(
+        _increment(db, _rollups, _BUCKET_KEY, ("amount", "donations")),
+        [
+            {"campaign_id": c, "bucket": b, "bucket_start": s, "amount": amount, "donations": count, "donors": 0}
+            for (c, b, s), (amount, count) in sorted(buckets.items())
+        ],
+    )
+    if not donors:
+        return
+    await db.execute(
+        _increment(db, _donors, (*_BUCKET_KEY, "user_id"), ("donations",)),
+        [
+            {"campaign_id": c, "bucket": b, "bucket_start": s, "user_id": u, "donations": count}
+            for (c, b, s, u), count in sorted(donors.items())
+        ],
+    )
+    if sign < 0:
+        await db.execute(
+            delete(_donors).where(
+                tuple_(*(_donors.c[name] for name in (*_BUCKET_KEY, "user_id"))).in_(list(donors)),
+                _donors.c.donations <= 0,
+            )
+        )
+    touched = sorted({key[:3] for key in donors})
+    await db.execute(
+        _recount_donors,
+        [{"campaign_pk": c, "bucket_name": b, "start": s} for c, b, s in touched],
+    )
+
+
+async def _scan(db: AsyncSession, campaign_ids: list[int]) -> tuple[dict, dict]:
+    """``accumulate`` over the applied donations of ``campaign_ids``, streamed in batches."""
+    result = await db.stream(
+        select(Donation.campaign_id, Donation.user_id, Donation.amount, Donation.created_at)
+        .where(Donation.campaign_id.in_(campaign_ids), *APPLIED)
+        .execution_options(yield_per=10_000)
+    )
+    buckets: dict[tuple, list] = defaultdict(lambda: [Decimal(0), 0])
+    donors: dict[tuple, int] = defaultdict(int)
+    async for batch in result.partitions():
+        batch_buckets, batch_donors = accumulate(batch)
+        for key, (amount, count) in batch_buckets.items():
+            totals = buckets[key]
+            totals[0] += amount
+            totals[1] += count
+        for key, count in batch_donors.items():
+            donors[key] += count
+    return buckets, donors
+
+
+def _with_donors(buckets: dict, donors: dict) -> dict[tuple, tuple]:
+    unique: dict[tuple, int] = defaultdict(int)
+    for key in donors:
+        unique[key[:3]] += 1
+    return {key: (amount, count, unique[key]) for key, (amount, count) in buckets.items()}
+
+
+async def compute(db: AsyncSession, campaign_ids: list[int]) -> dict[tuple, tuple]:
+    """``(amount, donations, donors)`` per bucket of ``campaign_ids``, from the raw donations."""
+    return _with_donors(*await _scan(db, campaign_ids))
+
+
+async def stored(db: AsyncSession, campaign_ids: list[int]) -> dict[tuple, tuple]:
+    """``(amount, donations, donors)`` per bucket of ``campaign_ids`` as stored, non-empty buckets only."""
+    result = await db.execute(
+        select(_rollups).where(_rollups.c.campaign_id.in_(campaign_ids), _rollups.c.donations != 0)
+    )
+    return {
+        (row.campaign_id, row.bucket, row.bucket_start): (Decimal(row.amount), row.donations, row.donors)
+        for row in result
+    }
+
+
+async def replace(db: AsyncSession, campaign_ids: list[int]) -> int:
+    """Rebuild the rollups of ``campaign_ids`` from the raw donations; returns the buckets written."""
+    buckets, donors = await _scan(db, campaign_ids)
+    await db.execute(delete(_donors).where(_donors.c.campaign_id.in_(campaign_ids)))
+    await db.execute(delete(_rollups).where(_rollups.c.campaign_id.in_(campaign_ids)))
+    if buckets:
+        await db.execute(insert(_rollups), [
+            {"campaign_id": c, "bucket": b, "bucket_start": s, "amount": amount, "donations": count, "donors": unique}
+            for (c, b, s), (amount, count, unique) in sorted(_with_donors(buckets, donors).items())
+        ])
+    if donors:
+        await db.execute(insert(_donors), [
+            {"campaign_id": c, "bucket": b, "bucket_start": s, "user_id": u, "donations": count}
+            for (c, b, s, u), count in sorted(donors.items())
+        ])
+    return len(buckets)
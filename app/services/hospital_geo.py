@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.replicas import replicas
+from app.models.hospital import Hospital
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+SUMMARY_COLUMNS = (
+    Hospital.id, Hospital.uuid, Hospital.name, Hospital.city, Hospital.district,
+    Hospital.verification_status, Hospital.latitude, Hospital.longitude,
+)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class HospitalGeoIndex:
+    """In-memory lat/lng grid over non-deleted hospitals.
+
+    Points are bucketed into ``cell_deg``-sized cells. A radius query only
+    visits the cells of the circle's bounding box and checks candidates with
+    the haversine formula; k-NN widens a radius query until it holds k
+    points. Kept in sync by the hospital write handlers, and reloaded every
+    ``interval`` seconds to pick up changes made by other workers.
+    """
+
+    def __init__(
+        self,
+        cell_deg: float = 0.05,
+        session_factory: Optional[async_sessionmaker] = None,
+        interval: float = 0,
+    ):
+        self.cell_deg = cell_deg
+        self.rows = math.ceil(180 / cell_deg)
+        self.cols = math.ceil(360 / cell_deg)
+        self.session_factory = session_factory
+        self.interval = interval
+        self.loaded = False
+        self.loaded_at: Optional[datetime] = None
+        self._task: asyncio.Task | None = None
+        self._points: dict[int, dict] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        row = min(self.rows - 1, int((lat + 90) // self.cell_deg))
+        col = int((lng + 180) // self.cell_deg) % self.cols
+        return row, col
+
+    def upsert(self, hospital) -> None:
+        """Add or move a hospital (ORM object or row with the summary columns)."""
+        self.remove(hospital.id)
+        point = {column.key: getattr(hospital, column.key) for column in SUMMARY_COLUMNS}
+        point["latitude"] = float(point["latitude"])
+        point["longitude"] = float(point["longitude"])
+        self._points[hospital.id] = point
+        self._cells.setdefault(self._cell(point["latitude"], point["longitude"]), set()).add(hospital.id)
+
+    def remove(self, hospital_id: int) -> None:
+        point = self._points.pop(hospital_id, None)
+        if point is None:
+            return
+        cell = self._cell(point["latitude"], point["longitude"])
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(hospital_id)
+            if not members:
+                del self._cells[cell]
+
+    async def load(self, db: AsyncSession) -> None:
+        """Rebuild the index from the hospitals table in one streamed pass."""
+        fresh = HospitalGeoIndex(self.cell_deg)
+        result = await db.stream(
+            select(*SUMMARY_COLUMNS)
+            .where(Hospital.deleted_at.is_(None))
+            .execution_options(yield_per=1000)
+        )
+        async for row in result:
+            fresh.upsert(row)
+        # Swap in one step so queries never see a half-built index
+        self._points, self._cells = fresh._points, fresh._cells
+        self.loaded = True
+        self.loaded_at = datetime.utcnow()
+
+    def _candidate_cells(self, lat: float, lng: float, radius_km: float):
+        # Bounding box of the circle (Matuschek, "Finding Points Within a Distance")
+        delta = radius_km / EARTH_RADIUS_KM
+        phi = math.radians(lat)
+        lat_min, lat_max = math.degrees(phi - delta), math.degrees(phi + delta)
+        if lat_min <= -90 or lat_max >= 90 or math.sin(delta) >= math.cos(phi):
+            first, span = 0, self.cols
+        else:
+            dlng = math.degrees(math.asin(math.sin(delta) / math.cos(phi)))
+            first = int((lng - dlng + 180) // self.cell_deg)
+            span = min(self.cols, int((lng + dlng + 180) // self.cell_deg) - first + 1)
+        row_first = self._cell(max(-90.0, lat_min), 0)[0]
+        row_last = self._cell(min(90.0, lat_max), 0)[0]
+
+        if (row_last - row_first + 1) * span > len(self._cells):
+            # Box covers more cells than are occupied: filter the occupied ones instead
+            for (row, col), members in self._cells.items():
+                if row_first <= row <= row_last and (col - first) % self.cols < span:
+                    yield members
+            return
+        for row in range(row_first, row_last + 1):
+            for col in range(first, first + span):
+                members = self._cells.get((row, col % self.cols))
+                if members:
+                    yield members
+
+    def within(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> list[tuple[float, dict]]:
+        """Hospitals within ``radius_km``, nearest first, as ``(distance_km, summary)``."""
+        hits = []
+        for members in self._candidate_cells(lat, lng, radius_km):
+            for hospital_id in members:
+                point = self._points[hospital_id]
+                distance = haversine_km(lat, lng, point["latitude"], point["longitude"])
+                if distance <= radius_km:
+                    hits.append((distance, point))
+        hits.sort(key=lambda hit: (hit[0], hit[1]["id"]))
+        return hits[:limit] if limit is not None else hits
+
+    def nearest(self, lat: float, lng: float, k: int) -> list[tuple[float, dict]]:
+        """The ``k`` hospitals nearest to a point, nearest first."""
+        radius = self.cell_deg * 111.0
+        while True:
+            hits = self.within(lat, lng, radius)
+            if len(hits) >= k or radius >= MAX_DISTANCE_KM:
+                return hits[:k]
+            radius = min(MAX_DISTANCE_KM, radius * 2)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with self.session_factory() as db:
+                    await self.load(db)
+            except Exception:
+                logger.exception("Hospital spatial index reload failed")
+
+    def start(self) -> None:
+        if self._task is None and self.session_factory is not None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "hospitals": len(self._points),
+            "cells": len(self._cells),
+            "loaded": self.loaded,
+            "loaded_at": self.loaded_at,
+            "interval_seconds": self.interval,
+        }
+
+
+hospital_geo_index = HospitalGeoIndex(
+    session_factory=replicas.session, interval=settings.hospital_geo_reload_interval_seconds
+)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Optional
+from uuid import uuid4
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.replicas import replicas
+
+logger = logging.getLogger(__name__)
+
+# Distinguishes snapshot versions built by different worker processes
+_PROCESS_TAG = uuid4().hex[:8]
+
+
+class ScoreSnapshot:
+    """In-memory copy of a priority-score view, ordered by score.
+
+    ``refresh()`` reloads the whole view; ``refresh_touched()`` re-reads only
+    the rows whose ids ``touched_sql`` reports as changed since the last run.
+    Snapshot times come from the application's UTC clock, the same clock the
+    app uses to stamp the rows ``touched_sql`` compares against.
+    """
+
+    def __init__(self, view: str, key: str, score: str, touched_sql: Optional[str] = None):
+        self.view = view
+        self.key = key
+        self.score = score
+        self.touched_sql = touched_sql
+        self.rows: list[dict] = []
+        self.generated_at: Optional[datetime] = None
+        self.version = ""
+        self._by_key: dict = {}
+        self._generation = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.generated_at is not None
+
+    def _publish(self, generated_at: datetime, changed: bool) -> None:
+        # The version (and so the ETag) only moves when the content does
+        if changed or not self.version:
+            self.rows = sorted(
+                self._by_key.values(),
+                key=lambda r: (r[self.score] is None, -(r[self.score] or 0), r[self.key]),
+            )
+            self._generation += 1
+            self.version = f"{_PROCESS_TAG}{self._generation:x}"
+        self.generated_at = generated_at
+
+    async def refresh(self, db: AsyncSession) -> None:
+        now = datetime.utcnow()
+        result = await db.execute(text(f"SELECT * FROM {self.view}"))
+        fresh = {row[self.key]: dict(row) for row in result.mappings()}
+        changed = fresh != self._by_key
+        self._by_key = fresh
+        self._publish(now, changed)
+
+    async def refresh_touched(self, db: AsyncSession) -> int:
+        """Recompute rows touched since the previous run; return how many."""
+        if not self.loaded or self.touched_sql is None:
+            await self.refresh(db)
+            return len(self._by_key)
+        now = datetime.utcnow()
+        touched = (await db.execute(text(self.touched_sql), {"since": self.generated_at})).scalars().all()
+        changed = False
+        if touched:
+            stmt = text(f"SELECT * FROM {self.view} WHERE {self.key} IN :keys").bindparams(
+                bindparam("keys", expanding=True)
+            )
+            for start in range(0, len(touched), 1000):
+                chunk = touched[start:start + 1000]
+                fresh = {row[self.key]: dict(row) for row in (await db.execute(stmt, {"keys": chunk})).mappings()}
+                for key in chunk:
+                    row = fresh.get(key)
+                    if row != self._by_key.get(key):
+                        changed = True
+                        if row is None:
+                            del self._by_key[key]
+                        else:
+                            self._by_key[key] = row
+        self._publish(now, changed)
+        return len(touched)
+
+    def page(self, skip: int, limit: int) -> list[dict]:
+        return self.rows[skip:skip + limit]
+
+
+campaign_scores = ScoreSnapshot(
+    "vw_campaign_priority_scores",
+    key="campaign_id",
+    score="weighted_score",
+    touched_sql="""
+        SELECT id FROM campaigns WHERE updated_at >= :since
+        UNION
+        SELECT DISTINCT campaign_id FROM donations
+        WHERE created_at >= :since OR updated_at >= :since OR applied_at >= :since
+    """,
+)
+hospital_scores = ScoreSnapshot("vw_hospital_priority_scores", key="hospital_id", score="priority_score")
+
+
+class ScoreRefresher:
+    """Background task keeping the score snapshots fresh.
+
+    Campaign scores are recomputed incrementally every run with a full
+    reload every ``full_every`` runs (scores also age with time); hospital
+    scores are always reloaded in full.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], interval: float, full_every: int):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.full_every = max(1, full_every)
+        self.runs = 0
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> None:
+        async with self.session_factory() as db:
+            if self.runs % self.full_every == 0:
+                await campaign_scores.refresh(db)
+            else:
+                await campaign_scores.refresh_touched(db)
+            await hospital_scores.refresh(db)
+        self.runs += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Score snapshot refresh failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+score_refresher = ScoreRefresher(
+    replicas.session, settings.score_refresh_interval_seconds, settings.score_full_refresh_every
+)
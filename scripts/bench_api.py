@@ -0,0 +1,440 @@
+"""Load-benchmark every API router in process and compare runs across commits.
+
+Seeds a SQLite database (requires ``aiosqlite``) with realistic volumes,
+runs the app with its lifespan, and drives each endpoint through an ASGI
+client at a fixed concurrency. Reports throughput, p50/p95/p99 latency and
+SQL statements per request, and writes them as JSON:
+
+    python scripts/bench_api.py --db /tmp/bench.db --output results.json
+    python scripts/bench_api.py --db /tmp/bench.db --baseline main.json --threshold 0.15
+    python scripts/bench_api.py --results results.json --baseline main.json
+
+Seeding 1M donations takes a few minutes; ``--db`` keeps the seeded file
+and reuses it while the volumes match. Exits 1 when ``--baseline`` is given
+and an endpoint regressed: p95 or throughput worse by more than
+``--threshold``, or any extra statement per request.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from sqlite_standin import create_schema, use_sqlite
+
+ROOT = Path(__file__).parent.parent
+VOLUMES = ("users", "hospitals", "campaigns", "donations")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, help="SQLite file to seed or reuse (default: a temporary file)")
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--hospitals", type=int, default=5_000)
+    parser.add_argument("--campaigns", type=int, default=100_000)
+    parser.add_argument("--donations", type=int, default=1_000_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per endpoint")
+    parser.add_argument("--only", action="append", help="run endpoints whose name starts with this (repeatable)")
+    parser.add_argument("--no-response-cache", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--results", type=Path, help="skip the run and load results from this file")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative p95/throughput regression")
+    return parser.parse_args()
+
+
+args = parse_args()
+use_sqlite(args.db or Path(tempfile.mkdtemp()) / "bench.db")
+# Every request comes from one client address
+os.environ["AUTH_RATE_LIMIT_PER_MINUTE"] = "0"
+if args.no_response_cache:
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, text  # noqa: E402
+
+from app.core.db import engine  # noqa: E402
+from app.core.deps import create_access_token, get_password_hash  # noqa: E402
+from app.core.metrics import request_metrics  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.campaign import Campaign  # noqa: E402
+from app.models.donation import CampaignFollower, CampaignImage, Donation  # noqa: E402
+from app.models.hospital import Hospital  # noqa: E402
+from app.models.role import Role  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.donation_aggregator import donation_aggregator  # noqa: E402
+from bench_campaign_search import CITIES, URGENCIES, make_vocabulary, sentence  # noqa: E402
+
+BATCH = 10_000
+PASSWORD = "bench-password"
+CAMPAIGN_STATUSES = ["published"] * 7 + ["draft", "paused", "funded"]
+DONATION_STATUSES = ["completed"] * 9 + ["pending"]
+# Sri Lanka
+LAT_RANGE, LNG_RANGE = (5.9, 9.8), (79.7, 81.9)
+START = datetime(2025, 1, 1)
+
+
+def zipf_weights(size: int) -> list[float]:
+    cum_weights, total = [], 0.0
+    for rank in range(1, size + 1):
+        total += 1 / rank
+        cum_weights.append(total)
+    return cum_weights
+
+
+class Dataset:
+    """Deterministic synthetic data; shared by seeding and request generation."""
+
+    def __init__(self, volumes: dict, seed: int):
+        self.volumes = volumes
+        self.rng = random.Random(seed)
+        self.vocabulary = make_vocabulary(20_000, self.rng)
+        self.word_weights = zipf_weights(len(self.vocabulary))
+        # A few campaigns get most donations and traffic
+        self.campaign_weights = zipf_weights(volumes["campaigns"])
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128)))
+
+    def moment(self) -> datetime:
+        return START + timedelta(seconds=self.rng.randrange(365 * 86400))
+
+    def popular_campaign(self) -> int:
+        return self.rng.choices(range(1, self.volumes["campaigns"] + 1), cum_weights=self.campaign_weights)[0]
+
+
+async def insert_batches(conn, model, rows) -> None:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH:
+            await conn.execute(insert(model), batch)
+            batch.clear()
+    if batch:
+        await conn.execute(insert(model), batch)
+
+
+async def seeded_volumes(conn) -> Optional[dict]:
+    await conn.execute(text("CREATE TABLE IF NOT EXISTS bench_meta (volumes TEXT NOT NULL)"))
+    row = (await conn.execute(text("SELECT volumes FROM bench_meta"))).first()
+    return json.loads(row[0]) if row else None
+
+
+async def seed(data: Dataset) -> None:
+    volumes, rng = data.volumes, data.rng
+    await create_schema(engine)
+    async with engine.begin() as conn:
+        existing = await seeded_volumes(conn)
+        if existing == volumes:
+            print("reusing seeded database")
+            return
+        if existing is not None:
+            sys.exit(f"--db was seeded with {existing}; use another file for {volumes}")
+        await conn.execute(text("PRAGMA journal_mode=WAL"))
+
+        t0 = time.perf_counter()
+        await conn.execute(insert(Role), [
+            {"id": 1, "name": "admin"}, {"id": 2, "name": "superadmin"},
+            {"id": 3, "name": "hospital_contact"}, {"id": 4, "name": "donor"},
+        ])
+        password_hash = get_password_hash(PASSWORD)
+        await insert_batches(conn, User, (
+            {
+                "id": i, "uuid": f"user-{i}", "role_id": 1 if i == 1 else 4, "name": f"User {i}",
+                "email": f"user{i}@example.com", "password_hash": password_hash,
+            }
+            for i in range(1, volumes["users"] + 1)
+        ))
+        await insert_batches(conn, Hospital, (
+            {
+                "id": i, "uuid": data.uuid(), "name": f"{rng.choice(CITIES)} Hospital {i}",
+                "city": rng.choice(CITIES),
+                "latitude": round(rng.uniform(*LAT_RANGE), 6), "longitude": round(rng.uniform(*LNG_RANGE), 6),
+                "verification_status": rng.choice(("unverified", "verified")),
+            }
+            for i in range(1, volumes["hospitals"] + 1)
+        ))
+
+        def campaign(i: int) -> dict:
+            title = sentence(data.vocabulary, data.word_weights, rng, rng.randint(3, 8))
+            status = rng.choice(CAMPAIGN_STATUSES)
+            return {
+                "id": i, "uuid": data.uuid(), "slug": f"{title.replace(' ', '-')[:200]}-{i}", "title": title,
+                "short_description": sentence(data.vocabulary, data.word_weights, rng, rng.randint(10, 25)),
+                "full_description": sentence(data.vocabulary, data.word_weights, rng, rng.randint(40, 120)),
+                "hospital_id": rng.randint(1, volumes["hospitals"]), "city": rng.choice(CITIES),
+                "urgency": rng.choice(URGENCIES), "target_amount": rng.randint(10, 1000) * 1000,
+                "status": status, "published_at": data.moment() if status != "draft" else None,
+                "created_at": START,
+            }
+
+        await insert_batches(conn, Campaign, (campaign(i) for i in range(1, volumes["campaigns"] + 1)))
+        await insert_batches(conn, CampaignImage, (
+            {"campaign_id": i, "url": f"https://cdn.example.com/campaigns/{i}.jpg", "is_primary": 1}
+            for i in range(1, volumes["campaigns"] + 1)
+        ))
+        follows = {(data.popular_campaign(), rng.randint(1, volumes["users"])) for _ in range(volumes["campaigns"])}
+        await insert_batches(conn, CampaignFollower, (
+            {"campaign_id": campaign_id, "user_id": user_id, "followed_at": data.moment()}
+            for campaign_id, user_id in sorted(follows)
+        ))
+        follower_counts: dict[int, int] = {}
+        for campaign_id, _ in follows:
+            follower_counts[campaign_id] = follower_counts.get(campaign_id, 0) + 1
+        await conn.execute(
+            text("UPDATE campaigns SET follower_count = :followers WHERE id = :id"),
+            [{"id": campaign_id, "followers": count} for campaign_id, count in follower_counts.items()],
+        )
+        print(f"seeded users, hospitals and campaigns in {time.perf_counter() - t0:.0f}s")
+
+        t0 = time.perf_counter()
+        campaign_ids = range(1, volumes["campaigns"] + 1)
+        raised: dict[int, int] = {}
+
+        def donations():
+            for start in range(1, volumes["donations"] + 1, BATCH):
+                count = min(BATCH, volumes["donations"] + 1 - start)
+                targets = rng.choices(campaign_ids, cum_weights=data.campaign_weights, k=count)
+                for offset, campaign_id in enumerate(targets):
+                    created_at = data.moment()
+                    status = rng.choice(DONATION_STATUSES)
+                    amount = rng.randint(1, 200) * 50
+                    if status == "completed":
+                        raised[campaign_id] = raised.get(campaign_id, 0) + amount
+                    yield {
+                        "id": start + offset, "uuid": data.uuid(), "campaign_id": campaign_id,
+                        "user_id": rng.randint(1, volumes["users"]), "amount": amount,
+                        "status": status, "payment_method": "card",
+                        # Already counted in amount_raised below, so startup reconcile has nothing to do
+                        "applied_at": created_at if status == "completed" else None,
+                        "created_at": created_at,
+                    }
+
+        await insert_batches(conn, Donation, donations())
+        await conn.execute(
+            text("UPDATE campaigns SET amount_raised = :raised WHERE id = :id"),
+            [{"id": campaign_id, "raised": amount} for campaign_id, amount in raised.items()],
+        )
+        await conn.execute(text("INSERT INTO bench_meta (volumes) VALUES (:volumes)"), {"volumes": json.dumps(volumes)})
+        print(f"seeded {volumes['donations']} donations in {time.perf_counter() - t0:.0f}s")
+
+    t0 = time.perf_counter()
+    await donation_aggregator.rebuild_rollups()
+    print(f"built donation rollups in {time.perf_counter() - t0:.0f}s")
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    # Returns (path, json body) for one request
+    make: Callable[[Dataset], tuple[str, Optional[dict]]]
+    user: Optional[str] = None
+    # Fraction of --requests to send, for deliberately slow endpoints
+    share: float = 1.0
+
+
+def lat_lng(data: Dataset) -> str:
+    return f"lat={data.rng.uniform(*LAT_RANGE):.4f}&lng={data.rng.uniform(*LNG_RANGE):.4f}"
+
+
+def search_words(data: Dataset) -> str:
+    words = data.rng.choices(data.vocabulary, cum_weights=data.word_weights, k=data.rng.randint(1, 2))
+    return "+".join(words)
+
+
+ENDPOINTS = [
+    Endpoint("health", "GET", lambda d: ("/health/", None)),
+    Endpoint("users.roles", "GET", lambda d: ("/users/roles", None)),
+    Endpoint("auth.login", "POST", lambda d: ("/auth/login", {
+        "email": f"user{d.rng.randint(2, d.volumes['users'])}@example.com", "password": PASSWORD,
+    }), share=0.1),
+    Endpoint("auth.me", "GET", lambda d: ("/auth/me", None), user="donor"),
+    Endpoint("campaigns.list", "GET", lambda d: (f"/campaigns/?limit=20&skip={d.rng.randrange(0, 200, 20)}", None)),
+    Endpoint("campaigns.list_filtered", "GET", lambda d: (
+        f"/campaigns/?limit=20&status=published&urgency={d.rng.choice(URGENCIES)}&city={d.rng.choice(CITIES)}", None,
+    )),
+    Endpoint("campaigns.search", "GET", lambda d: (f"/campaigns/?q={search_words(d)}&limit=20", None)),
+    Endpoint("campaigns.get", "GET", lambda d: (f"/campaigns/{d.popular_campaign()}", None)),
+    Endpoint("campaigns.full", "GET", lambda d: (f"/campaigns/{d.popular_campaign()}/full", None)),
+    Endpoint("campaigns.images", "GET", lambda d: (f"/campaigns/{d.popular_campaign()}/images", None)),
+    Endpoint("campaigns.donation_stats", "GET", lambda d: (
+        f"/campaigns/{d.popular_campaign()}/donations/stats?bucket={d.rng.choice(('hour', 'day'))}", None,
+    )),
+    Endpoint("campaigns.leaderboard", "GET", lambda d: (
+        f"/campaigns/leaderboards/{d.rng.choice(('closest_to_goal', 'most_funded_today', 'most_urgent_underfunded'))}"
+        f"?limit=20", None,
+    )),
+    Endpoint("campaigns.leaderboard_ranks", "GET", lambda d: (f"/campaigns/{d.popular_campaign()}/leaderboards", None)),
+    Endpoint("campaigns.followers", "GET", lambda d: (f"/campaigns/{d.popular_campaign()}/followers?limit=50", None)),
+    Endpoint("campaigns.follow", "POST", lambda d: (f"/campaigns/{d.popular_campaign()}/followers", None), user="donor"),
+    Endpoint("hospitals.list", "GET", lambda d: (f"/hospitals/?limit=20&city={d.rng.choice(CITIES)}", None)),
+    Endpoint("hospitals.nearby", "GET", lambda d: (f"/hospitals/nearby?{lat_lng(d)}&radius_km=25", None)),
+    Endpoint("hospitals.get", "GET", lambda d: (f"/hospitals/{d.rng.randint(1, d.volumes['hospitals'])}", None)),
+    Endpoint("donations.by_campaign", "GET", lambda d: (f"/donations/by-campaign/{d.popular_campaign()}?limit=20", None)),
+    Endpoint("donations.by_user", "GET", lambda d: (f"/donations/by-user/{d.rng.randint(2, d.volumes['users'])}?limit=20", None)),
+    Endpoint("donations.create", "POST", lambda d: ("/donations/", {
+        "campaign_id": d.popular_campaign(), "amount": str(d.rng.randint(1, 200) * 50), "payment_method": "card",
+    }), user="donor"),
+    Endpoint("scores.campaigns", "GET", lambda d: (f"/scores/campaigns?limit=50&skip={d.rng.randrange(0, 500, 50)}", None)),
+    Endpoint("scores.hospitals", "GET", lambda d: ("/scores/hospitals?limit=50", None)),
+    Endpoint("admin.caches", "GET", lambda d: ("/admin/caches", None), user="admin"),
+]
+
+
+def percentile(cuts: list[float], p: int) -> float:
+    return round(cuts[p - 1], 3)
+
+
+def query_totals() -> tuple[float, int]:
+    routes = request_metrics.routes.values()
+    return sum(stats.queries.sum for stats in routes), sum(stats.queries.count for stats in routes)
+
+
+async def drive(client: httpx.AsyncClient, endpoint: Endpoint, data: Dataset, tokens: dict, args) -> dict:
+    def prepared(count: int) -> list:
+        requests = []
+        for _ in range(count):
+            path, body = endpoint.make(data)
+            headers = {"Authorization": f"Bearer {data.rng.choice(tokens[endpoint.user])}"} if endpoint.user else {}
+            requests.append((path, body, headers))
+        return requests
+
+    async def run(requests: list, latencies: list, statuses: dict) -> None:
+        pending = iter(requests)
+
+        async def worker():
+            for path, body, headers in pending:
+                t0 = time.perf_counter()
+                response = await client.request(endpoint.method, path, json=body, headers=headers)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    count = max(args.concurrency, int(args.requests * endpoint.share))
+    await run(prepared(max(1, int(args.warmup * endpoint.share))), [], {})
+
+    latencies, statuses = [], {}
+    queries_before, requests_before = query_totals()
+    t0 = time.perf_counter()
+    await run(prepared(count), latencies, statuses)
+    elapsed = time.perf_counter() - t0
+    queries_after, requests_after = query_totals()
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    errors = sum(n for code, n in statuses.items() if code >= 400)
+    return {
+        "requests": count,
+        "errors": errors,
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "throughput_rps": round(count / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": percentile(cuts, 50),
+        "p95_ms": percentile(cuts, 95),
+        "p99_ms": percentile(cuts, 99),
+        "queries_per_request": round((queries_after - queries_before) / max(1, requests_after - requests_before), 2),
+    }
+
+
+def git_revision() -> dict:
+    def git(*command):
+        try:
+            return subprocess.run(["git", *command], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+async def benchmark(args) -> dict:
+    volumes = {name: getattr(args, name) for name in VOLUMES}
+    data = Dataset(volumes, args.seed)
+    await seed(data)
+
+    endpoints = [e for e in ENDPOINTS if not args.only or any(e.name.startswith(prefix) for prefix in args.only)]
+    tokens = {
+        "admin": [create_access_token({"sub": "user-1"})],
+        "donor": [create_access_token({"sub": f"user-{data.rng.randint(2, volumes['users'])}"}) for _ in range(200)],
+    }
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1", timeout=60) as client:
+            for endpoint in endpoints:
+                results[endpoint.name] = result = await drive(client, endpoint, data, tokens, args)
+                print(
+                    f"{endpoint.name:<24} {result['throughput_rps']:>8.1f} rps  p50 {result['p50_ms']:>8.2f}  "
+                    f"p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms  "
+                    f"{result['queries_per_request']:>5.2f} q/req  {result['errors']} errors"
+                )
+    await engine.dispose()
+    return {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "volumes": volumes,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "response_cache": not args.no_response_cache,
+        },
+        "endpoints": results,
+    }
+
+
+def regressions(baseline: dict, current: dict, threshold: float) -> list[str]:
+    found = []
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            found.append(f"{name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            found.append(f"{name}: throughput {before['throughput_rps']} -> {now['throughput_rps']} rps")
+        if now["queries_per_request"] > before["queries_per_request"] + 0.5:
+            found.append(f"{name}: queries/request {before['queries_per_request']} -> {now['queries_per_request']}")
+        if now["errors"] > before["errors"]:
+            found.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return found
+
+
+def main(args) -> int:
+    if args.results:
+        current = json.loads(args.results.read_text())
+    else:
+        current = asyncio.run(benchmark(args))
+        if args.output:
+            args.output.write_text(json.dumps(current, indent=2) + "\n")
+            print(f"wrote {args.output}")
+    if not args.baseline:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["meta"]["volumes"] != current["meta"]["volumes"]:
+        print("warning: baseline was measured with different volumes", file=sys.stderr)
+    found = regressions(baseline, current, args.threshold)
+    for line in found:
+        print(f"REGRESSION {line}")
+    print(f"{len(found)} regression(s) against {baseline['meta'].get('commit') or args.baseline}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(args))
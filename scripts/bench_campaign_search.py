@@ -0,0 +1,103 @@
+"""Measure campaign search index build time and query latency.
+
+Indexes synthetic campaigns whose words follow a Zipf-like distribution
+(like real text, a few words are very common and most are rare) and times
+one-word, two-word, prefix and filtered queries:
+
+    python scripts/bench_campaign_search.py --campaigns 100000 --queries 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent.parent))
+for key in ("DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+    os.environ.setdefault(key, "0" if key == "DB_PORT" else "bench")
+
+from app.services.campaign_search import CampaignSearchIndex  # noqa: E402
+
+CITIES = ["Colombo", "Kandy", "Galle", "Jaffna", "Kurunegala", "Matara", "Batticaloa", "Anuradhapura"]
+STATUSES = ["draft", "pending_review", "published", "paused", "funded"]
+URGENCIES = ["low", "medium", "high", "critical"]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def sentence(vocabulary: list[str], weights: list[float], rng: random.Random, length: int) -> str:
+    return " ".join(rng.choices(vocabulary, cum_weights=weights, k=length))
+
+
+def timed(index: CampaignSearchIndex, queries: list[tuple[str, dict]]) -> list[float]:
+    samples = []
+    for query, filters in queries:
+        t0 = time.perf_counter()
+        index.search(query, limit=20, **filters)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    cum_weights, total = [], 0.0
+    for rank in range(1, len(vocabulary) + 1):
+        total += 1 / rank
+        cum_weights.append(total)
+
+    index = CampaignSearchIndex()
+    t0 = time.perf_counter()
+    for campaign_id in range(1, args.campaigns + 1):
+        index.upsert(SimpleNamespace(
+            id=campaign_id,
+            title=sentence(vocabulary, cum_weights, rng, rng.randint(3, 8)),
+            short_description=sentence(vocabulary, cum_weights, rng, rng.randint(10, 25)),
+            full_description=sentence(vocabulary, cum_weights, rng, rng.randint(40, 120)),
+            status=rng.choice(STATUSES),
+            urgency=rng.choice(URGENCIES),
+            city=rng.choice(CITIES),
+        ))
+    build_s = time.perf_counter() - t0
+
+    def word() -> str:
+        # Query words are drawn from the whole vocabulary, not by frequency
+        return rng.choice(vocabulary)
+
+    suites = {
+        "one word": [(word(), {}) for _ in range(args.queries)],
+        "two words": [(f"{word()} {word()}", {}) for _ in range(args.queries)],
+        "prefix": [(word()[:3], {}) for _ in range(args.queries)],
+        "word+prefix": [(f"{word()} {word()[:4]}", {}) for _ in range(args.queries)],
+        "filtered": [
+            (word(), {"status": "published", "city": rng.choice(CITIES)}) for _ in range(args.queries)
+        ],
+        # The first query on a very common word sorts its postings by impact
+        "common, cold": [(word, {}) for word in vocabulary[:20]],
+        "common, warm": [(vocabulary[rng.randrange(20)], {}) for _ in range(args.queries)],
+    }
+
+    stats = index.stats()
+    print(f"campaigns={args.campaigns} terms={stats['terms']} build={build_s:.1f}s")
+    for name, queries in suites.items():
+        samples = sorted(timed(index, queries))
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{name:>14}: median {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms   max {samples[-1]:7.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=100_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
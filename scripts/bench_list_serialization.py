@@ -0,0 +1,176 @@
+"""Compare list endpoints against ORM + ``response_model`` versions of themselves.
+
+Seeds a SQLite database (requires ``aiosqlite``), then requests each list
+endpoint at ``limit=500`` from the app and from an equivalent handler that
+hydrates ORM objects and lets FastAPI validate them into the response
+model, as the endpoints used to. Checks both return the same JSON and
+reports end-to-end and serialization-only latency:
+
+    python scripts/bench_list_serialization.py --rows 5000 --limit 500 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent))
+from sqlite_standin import create_schema, use_sqlite
+
+use_sqlite(Path(tempfile.mkdtemp()) / "bench.db")
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from fastapi import APIRouter, Depends, FastAPI  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.api.v1.campaigns import campaign_list_json  # noqa: E402
+from app.api.v1.donations import donation_list_json  # noqa: E402
+from app.api.v1.hospitals import hospital_list_json  # noqa: E402
+from app.core import fast_json  # noqa: E402
+from app.core.db import SessionLocal, engine, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.campaign import Campaign  # noqa: E402
+from app.models.donation import Donation  # noqa: E402
+from app.models.hospital import Hospital  # noqa: E402
+from app.schemas.campaign import CampaignList  # noqa: E402
+from app.schemas.donation import DonationList  # noqa: E402
+from app.schemas.hospital import HospitalList  # noqa: E402
+
+legacy = APIRouter()
+
+
+@legacy.get("/campaigns/", response_model=List[CampaignList])
+async def legacy_campaigns(limit: int, db: AsyncSession = Depends(get_db)):
+    stmt = select(Campaign).where(Campaign.deleted_at.is_(None))
+    stmt = stmt.order_by(Campaign.published_at.desc(), Campaign.id.desc()).limit(limit)
+    return (await db.execute(stmt)).scalars().all()
+
+
+@legacy.get("/hospitals/", response_model=List[HospitalList])
+async def legacy_hospitals(limit: int, db: AsyncSession = Depends(get_db)):
+    stmt = select(Hospital).where(Hospital.deleted_at.is_(None)).order_by(Hospital.id).limit(limit)
+    return (await db.execute(stmt)).scalars().all()
+
+
+@legacy.get("/donations/by-campaign/{campaign_id}", response_model=List[DonationList])
+async def legacy_donations(campaign_id: int, limit: int, db: AsyncSession = Depends(get_db)):
+    stmt = select(Donation).where(Donation.campaign_id == campaign_id)
+    stmt = stmt.order_by(Donation.created_at.desc(), Donation.id.desc()).limit(limit)
+    return (await db.execute(stmt)).scalars().all()
+
+
+legacy_app = FastAPI()
+legacy_app.include_router(legacy, prefix="/api/v1")
+
+# (path, model, schema, row encoder, order by)
+SUITES = [
+    ("/campaigns/?limit={limit}", Campaign, CampaignList, campaign_list_json,
+     (Campaign.published_at.desc(), Campaign.id.desc())),
+    ("/hospitals/?limit={limit}", Hospital, HospitalList, hospital_list_json, (Hospital.id,)),
+    ("/donations/by-campaign/1?limit={limit}", Donation, DonationList, donation_list_json,
+     (Donation.created_at.desc(), Donation.id.desc())),
+]
+
+
+async def seed(rows: int) -> None:
+    await create_schema(engine)
+    start = datetime(2025, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(insert(Campaign), [
+            {
+                "id": i, "uuid": f"c-{i}", "slug": f"campaign-{i}", "title": f"Campaign {i}",
+                "short_description": "Help us pay for surgery " * 4, "urgency": random.choice(("low", "high")),
+                "target_amount": random.randint(1000, 99999) + 0.5, "amount_raised": random.randint(0, 999) + 0.25,
+                "verified": i % 2, "status": "published", "published_at": start + timedelta(minutes=i),
+            }
+            for i in range(1, rows + 1)
+        ])
+        await conn.execute(insert(Hospital), [
+            {
+                "id": i, "uuid": f"h-{i}", "name": f"Hospital {i}", "city": "Colombo", "district": None,
+                "latitude": 6.9, "longitude": 79.9, "verification_status": "verified",
+            }
+            for i in range(1, rows + 1)
+        ])
+        await conn.execute(insert(Donation), [
+            {
+                "id": i, "uuid": f"d-{i}", "campaign_id": 1, "user_id": 2, "amount": random.randint(1, 500) + 0.99,
+                "donation_type": "monetary", "is_anonymous": i % 3 == 0, "status": "completed",
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(1, rows + 1)
+        ])
+
+
+async def request_ms(client: httpx.AsyncClient, path: str, repeat: int) -> tuple[list[float], bytes]:
+    samples, body = [], b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        response = await client.get(path)
+        samples.append((time.perf_counter() - t0) * 1000)
+        response.raise_for_status()
+        body = response.content
+    return samples, body
+
+
+async def serialize_ms(model, schema, encoder, order_by, limit: int, repeat: int) -> tuple[list[float], list[float]]:
+    """Time fetch + serialization only, without routing or HTTP."""
+    adapter = TypeAdapter(List[schema])
+    orm, rows = [], []
+    async with SessionLocal() as db:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            objects = (await db.execute(select(model).order_by(*order_by).limit(limit))).scalars().all()
+            adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+            orm.append((time.perf_counter() - t0) * 1000)
+            db.expunge_all()
+
+            t0 = time.perf_counter()
+            tuples = (await db.execute(select(*encoder.columns(model)).order_by(*order_by).limit(limit))).all()
+            encoder.encode(tuples)
+            rows.append((time.perf_counter() - t0) * 1000)
+    return orm, rows
+
+
+async def main(args) -> None:
+    random.seed(args.seed)
+    await seed(args.rows)
+    encoder_name = "orjson" if fast_json.orjson is not None else "json (stdlib)"
+    print(f"rows={args.rows} limit={args.limit} repeat={args.repeat} encoder={encoder_name}")
+
+    new_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench/api/v1")
+    old_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=legacy_app), base_url="http://bench/api/v1")
+    async with new_client, old_client:
+        for template, model, schema, encoder, order_by in SUITES:
+            path = template.format(limit=args.limit)
+            old_ms, old_body = await request_ms(old_client, path, args.repeat)
+            new_ms, new_body = await request_ms(new_client, path, args.repeat)
+            if json.loads(old_body) != json.loads(new_body):
+                sys.exit(f"{path}: fast path returned different JSON")
+            orm_ms, rows_ms = await serialize_ms(model, schema, encoder, order_by, args.limit, args.repeat)
+
+            old, new = statistics.median(old_ms), statistics.median(new_ms)
+            orm, rows = statistics.median(orm_ms), statistics.median(rows_ms)
+            print(f"{path}")
+            print(f"    request:        orm {old:8.2f} ms   rows {new:8.2f} ms   x{old / new:4.1f}")
+            print(f"    fetch+encode:   orm {orm:8.2f} ms   rows {rows:8.2f} ms   x{orm / rows:4.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
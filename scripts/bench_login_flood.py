@@ -0,0 +1,122 @@
+"""Measure /health latency while /auth/login is being flooded.
+
+Runs the app in-process over ASGI against a throwaway SQLite database
+(requires ``aiosqlite`` and ``httpx``) and reports /health percentiles with
+and without a concurrent login flood:
+
+    python scripts/bench_login_flood.py --logins 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+for key in ("DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+    os.environ.setdefault(key, "0" if key == "DB_PORT" else "bench")
+os.environ.setdefault("DEBUG", "false")
+# Measure admission control, not the per-client rate limit the flood would trip
+os.environ.setdefault("AUTH_RATE_LIMIT_PER_MINUTE", "0")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.admission import admission  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.db import Base, get_db  # noqa: E402
+from app.core.deps import get_password_hash, password_pool  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, samples: list[float]) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await client.get(f"{settings.api_v1_prefix}/health/")
+        samples.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def flood_logins(client: httpx.AsyncClient, total: int, concurrency: int) -> dict:
+    statuses: dict[int, int] = {}
+    queue = iter(range(total))
+
+    async def worker():
+        for _ in queue:
+            r = await client.post(
+                f"{settings.api_v1_prefix}/auth/login",
+                json={"email": "bench@example.com", "password": "correct horse"},
+            )
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses
+
+
+async def run_phase(client, seconds: float | None, logins: int, concurrency: int):
+    stop = asyncio.Event()
+    samples: list[float] = []
+    probe = asyncio.create_task(probe_health(client, stop, samples))
+    t0 = time.perf_counter()
+    statuses = {}
+    if logins:
+        statuses = await flood_logins(client, logins, concurrency)
+    else:
+        await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await probe
+    return samples, statuses, elapsed
+
+
+async def main(args) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[User.__table__])
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with Session() as session:
+        await session.execute(insert(User), [{
+            "id": 1, "uuid": "bench-user", "role_id": 4, "email": "bench@example.com",
+            "password_hash": get_password_hash("correct horse"),
+        }])
+        await session.commit()
+
+    async def bench_db():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = bench_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle, _, _ = await run_phase(client, 1.0, 0, 0)
+        busy, statuses, elapsed = await run_phase(client, None, args.logins, args.concurrency)
+    password_pool.shutdown()
+    await engine.dispose()
+
+    print(f"password pool: {password_pool.workers} workers, {password_pool.max_pending} max pending")
+    auth = admission.classes.get("auth")
+    if auth is not None:
+        print(f"auth admission: {auth.limit} concurrent, {auth.max_queue} queued, shed {auth.stats()['shed']}")
+    print(f"logins: {args.logins} at concurrency {args.concurrency} in {elapsed:.2f}s -> {statuses}")
+    for name, samples in (("idle", idle), ("flood", busy)):
+        print(
+            f"/health {name:>5}: n={len(samples):5d} p50 {statistics.median(samples):7.2f} ms"
+            f"  p99 {percentile(samples, 99):7.2f} ms  max {max(samples):7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
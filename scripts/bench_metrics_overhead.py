@@ -0,0 +1,111 @@
+"""Measure the per-request and per-statement cost of metrics recording.
+
+Drives a minimal ASGI app directly (no HTTP, no server) with and without
+``MetricsMiddleware`` and calls the SQLAlchemy cursor hooks in a loop:
+
+    python scripts/bench_metrics_overhead.py --requests 200000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent.parent))
+for key in ("DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+    os.environ.setdefault(key, "0" if key == "DB_PORT" else "bench")
+
+from app.core.metrics import (  # noqa: E402
+    MetricsMiddleware,
+    RequestMetrics,
+    RequestTimer,
+    _after_cursor_execute,
+    _before_cursor_execute,
+    _timed_endpoint,
+    current_timer,
+)
+
+ROUTE = SimpleNamespace(path_format="/{campaign_id}/images")
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b"[]"}
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = ROUTE
+    scope["path_params"] = {"campaign_id": "42"}
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+def scope() -> dict:
+    return {"type": "http", "method": "GET", "path": "/api/v1/campaigns/42/images"}
+
+
+async def per_request_us(app, requests: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(requests):
+        await app(scope(), receive, send)
+    return (time.perf_counter() - t0) / requests * 1e6
+
+
+async def endpoint():
+    return None
+
+
+async def per_call_us(func, calls: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        await func()
+    return (time.perf_counter() - t0) / calls * 1e6
+
+
+def per_statement_us(statements: int, hooked: bool) -> float:
+    context = SimpleNamespace()
+    token = current_timer.set(RequestTimer())
+    t0 = time.perf_counter()
+    for _ in range(statements):
+        if hooked:
+            _before_cursor_execute(None, None, "SELECT 1", (), context, False)
+            _after_cursor_execute(None, None, "SELECT 1", (), context, False)
+    elapsed = time.perf_counter() - t0
+    current_timer.reset(token)
+    return elapsed / statements * 1e6
+
+
+async def main(args) -> None:
+    wrapped = MetricsMiddleware(bare_app, RequestMetrics())
+    timed = _timed_endpoint(endpoint)
+    rows = {"middleware": [], "endpoint wrapper": [], "cursor hooks": []}
+    for _ in range(args.rounds):
+        rows["middleware"].append(
+            await per_request_us(wrapped, args.requests) - await per_request_us(bare_app, args.requests)
+        )
+        rows["endpoint wrapper"].append(
+            await per_call_us(timed, args.requests) - await per_call_us(endpoint, args.requests)
+        )
+        rows["cursor hooks"].append(
+            per_statement_us(args.requests, True) - per_statement_us(args.requests, False)
+        )
+
+    print(f"requests={args.requests} rounds={args.rounds} (median of rounds, added cost)")
+    for name, samples in rows.items():
+        unit = "per statement" if name == "cursor hooks" else "per request"
+        print(f"{name:>17}: {statistics.median(samples):6.2f} us {unit}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
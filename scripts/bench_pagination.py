@@ -0,0 +1,97 @@
+"""Compare page-1000 latency of OFFSET and keyset (cursor) donation listing.
+
+Seeds a throwaway SQLite database (requires ``aiosqlite``) and times the
+statement built by ``donations_page`` in both modes:
+
+    python scripts/bench_pagination.py --rows 200000 --page 1000 --limit 100
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+for key in ("DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+    os.environ.setdefault(key, "0" if key == "DB_PORT" else "bench")
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker  # noqa: E402
+
+from app.api.v1.donations import donations_page  # noqa: E402
+from app.core.db import Base  # noqa: E402
+from app.core.pagination import encode_cursor  # noqa: E402
+from app.models.donation import Donation  # noqa: E402
+
+
+async def seed(session, rows: int, campaign_id: int) -> None:
+    start = datetime(2025, 1, 1)
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "id": i + 1,
+            "uuid": f"00000000-0000-0000-0000-{i:012d}",
+            "campaign_id": campaign_id,
+            "amount": random.randint(1, 500),
+            "status": "completed",
+            "created_at": start + timedelta(seconds=i * 7),
+        })
+        if len(batch) == 10_000:
+            await session.execute(insert(Donation), batch)
+            batch.clear()
+    if batch:
+        await session.execute(insert(Donation), batch)
+    await session.commit()
+
+
+async def timed(session, stmt, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        (await session.execute(stmt)).all()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+async def main(args) -> None:
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Donation.__table__])
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with Session() as session:
+        await seed(session, args.rows, campaign_id=1)
+        skip = (args.page - 1) * args.limit
+        criterion = Donation.campaign_id == 1
+
+        # Position of the cursor at the end of the previous page (setup, not timed).
+        before = (await session.execute(
+            select(Donation.created_at, Donation.id)
+            .where(criterion)
+            .order_by(Donation.created_at.desc(), Donation.id.desc())
+            .offset(skip - 1).limit(1)
+        )).one()
+        cursor = encode_cursor("donations", before.created_at, before.id)
+
+        offset_ms = await timed(session, donations_page(criterion, skip, args.limit, None), args.repeat)
+        keyset_ms = await timed(session, donations_page(criterion, 0, args.limit, cursor), args.repeat)
+
+    await engine.dispose()
+    print(f"rows={args.rows} page={args.page} limit={args.limit} repeat={args.repeat}")
+    for name, samples in (("offset", offset_ms), ("cursor", keyset_ms)):
+        print(f"{name:>7}: median {statistics.median(samples):8.3f} ms   max {max(samples):8.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,232 @@
+"""Check that endpoints stay within their declared ``@query_budget``.
+
+Runs the app in process against a throwaway SQLite database (requires
+``aiosqlite``), seeds a few rows, warms the per-process caches and counts
+the SQL statements of every scenario. The response cache is disabled.
+Exits 1 if a scenario goes over its endpoint's budget, so it can gate CI:
+
+    python scripts/check_query_budgets.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from sqlite_standin import create_schema, use_sqlite
+
+use_sqlite(Path(tempfile.mkdtemp()) / "budgets.db")
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from fastapi.routing import APIRoute  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.api.v1 import admin, auth, campaigns, donations, health, hospitals, scores, users  # noqa: E402
+from app.core.db import engine  # noqa: E402
+from app.core.deps import create_access_token, get_password_hash  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.campaign import Campaign  # noqa: E402
+from app.models.donation import CampaignDocument, CampaignImage, Donation  # noqa: E402
+from app.models.hospital import Hospital  # noqa: E402
+from app.models.role import Role  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.donation_aggregator import donation_aggregator  # noqa: E402
+
+ROUTER_MODULES = (admin, auth, campaigns, donations, health, hospitals, scores, users)
+
+
+statements = 0
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+@dataclass
+class Scenario:
+    endpoint: Callable
+    method: str
+    path: str
+    user: Optional[str] = None
+    json: Optional[dict] = None
+    files: Optional[dict] = None
+    expect: set = field(default_factory=lambda: {200, 201})
+
+
+# Principals, id resolvers, role registry and in-memory indexes
+WARMUP = [
+    ("u-admin", "/auth/me"), ("u-donor", "/auth/me"), ("u-contact", "/auth/me"),
+    (None, "/campaigns/?q=warm"), (None, "/hospitals/nearby?lat=0&lng=0"),
+    (None, "/campaigns/heart-surgery"), (None, "/campaigns/1"), (None, "/campaigns/3"),
+    (None, "/hospitals/1"), (None, "/hospitals/2"),
+    (None, "/scores/campaigns"), (None, "/scores/hospitals"), (None, "/campaigns/leaderboards/closest_to_goal"),
+]
+
+
+SCENARIOS = [
+    Scenario(health.health, "GET", "/health/"),
+    Scenario(users.list_roles, "GET", "/users/roles"),
+    Scenario(
+        auth.register, "POST", "/auth/register",
+        json={"email": "new@example.com", "password": "secret123", "name": "New Donor"},
+    ),
+    Scenario(auth.login, "POST", "/auth/login", json={"email": "donor@example.com", "password": "secret123"}),
+    Scenario(auth.get_current_user_info, "GET", "/auth/me", user="u-donor"),
+    Scenario(campaigns.list_campaigns, "GET", "/campaigns/?limit=10"),
+    Scenario(campaigns.list_campaigns, "GET", "/campaigns/?q=heart&limit=10"),
+    Scenario(campaigns.get_campaign, "GET", "/campaigns/heart-surgery"),
+    Scenario(campaigns.get_campaign_full, "GET", "/campaigns/heart-surgery/full"),
+    Scenario(campaigns.get_leaderboard, "GET", "/campaigns/leaderboards/most_urgent_underfunded"),
+    Scenario(campaigns.get_campaign_leaderboard_ranks, "GET", "/campaigns/heart-surgery/leaderboards"),
+    Scenario(campaigns.get_campaign_donation_stats, "GET", "/campaigns/1/donations/stats?bucket=hour"),
+    Scenario(campaigns.create_campaign, "POST", "/campaigns/", user="u-contact", json={"title": "Heart surgery"}),
+    Scenario(
+        campaigns.bulk_create_campaigns, "POST", "/campaigns/bulk", user="u-contact",
+        json={"campaigns": [{"title": "Eye care"}, {"title": "Eye care"}, {"title": "Dialysis"}]},
+    ),
+    Scenario(campaigns.update_campaign, "PATCH", "/campaigns/1", user="u-contact", json={"city": "Kandy"}),
+    Scenario(campaigns.get_campaign_images, "GET", "/campaigns/heart-surgery/images"),
+    Scenario(
+        campaigns.add_campaign_image, "POST", "/campaigns/1/images", user="u-contact",
+        json={"url": "https://example.com/a.jpg"},
+    ),
+    Scenario(campaigns.get_campaign_documents, "GET", "/campaigns/1/documents"),
+    Scenario(
+        campaigns.add_campaign_document, "POST", "/campaigns/1/documents", user="u-contact",
+        json={"title": "Estimate", "url": "https://example.com/a.pdf"},
+    ),
+    Scenario(campaigns.get_campaign_followers, "GET", "/campaigns/1/followers"),
+    Scenario(campaigns.follow_campaign, "POST", "/campaigns/1/followers", user="u-donor"),
+    Scenario(campaigns.follow_campaign, "POST", "/campaigns/1/followers", user="u-donor"),
+    Scenario(campaigns.unfollow_campaign, "DELETE", "/campaigns/1/followers", user="u-donor"),
+    Scenario(campaigns.delete_campaign, "DELETE", "/campaigns/3", user="u-admin"),
+    Scenario(hospitals.list_hospitals, "GET", "/hospitals/?limit=10"),
+    Scenario(hospitals.nearby_hospitals, "GET", "/hospitals/nearby?lat=6.9&lng=79.9&k=5"),
+    Scenario(hospitals.get_hospital, "GET", "/hospitals/1"),
+    Scenario(
+        hospitals.create_hospital, "POST", "/hospitals/", user="u-contact",
+        json={"name": "General Hospital", "latitude": 7.29, "longitude": 80.63},
+    ),
+    Scenario(hospitals.update_hospital, "PATCH", "/hospitals/1", user="u-contact", json={"city": "Colombo"}),
+    Scenario(
+        hospitals.import_hospitals, "POST", "/hospitals/import?format=csv", user="u-contact",
+        files={"file": ("h.csv", b"name,latitude,longitude\nBase Hospital,7.0,80.0\n", "text/csv")},
+    ),
+    Scenario(hospitals.delete_hospital, "DELETE", "/hospitals/2", user="u-admin"),
+    Scenario(donations.get_donations_by_campaign, "GET", "/donations/by-campaign/1"),
+    Scenario(donations.get_donations_by_user, "GET", "/donations/by-user/2"),
+    Scenario(donations.create_donation, "POST", "/donations/", user="u-donor", json={"campaign_id": 1, "amount": "25.00"}),
+    Scenario(
+        donations.update_donation_status, "PATCH", "/donations/1/status", user="u-admin",
+        json={"status": "refunded"},
+    ),
+    Scenario(scores.campaign_scores_list, "GET", "/scores/campaigns"),
+    Scenario(scores.hospital_scores_list, "GET", "/scores/hospitals"),
+    Scenario(admin.cache_stats, "GET", "/admin/caches", user="u-admin"),
+    Scenario(admin.rebuild_search_index, "POST", "/admin/search/rebuild", user="u-admin"),
+    Scenario(admin.aggregator_stats, "GET", "/admin/donations/aggregator", user="u-admin"),
+    Scenario(admin.flush_aggregator, "POST", "/admin/donations/aggregator/flush", user="u-admin"),
+    Scenario(admin.rebuild_donation_rollups, "POST", "/admin/donations/rollups/rebuild", user="u-admin"),
+    Scenario(admin.check_donation_rollups, "GET", "/admin/donations/rollups/check", user="u-admin"),
+    Scenario(admin.pool_stats, "GET", "/admin/db/pool", user="u-admin"),
+    Scenario(admin.replica_stats, "GET", "/admin/db/replicas", user="u-admin"),
+    Scenario(admin.admission_stats, "GET", "/admin/admission", user="u-admin"),
+    # Drops cached principals, so run it after everything that relies on a warm one
+    Scenario(admin.refresh_roles, "POST", "/admin/roles/refresh", user="u-admin"),
+]
+
+
+async def seed() -> None:
+    await create_schema(engine)
+    async with engine.begin() as conn:
+        await conn.execute(insert(Role), [
+            {"id": 1, "name": "admin"}, {"id": 2, "name": "superadmin"},
+            {"id": 3, "name": "hospital_contact"}, {"id": 4, "name": "donor"},
+        ])
+        password_hash = get_password_hash("secret123")
+        await conn.execute(insert(User), [
+            {"id": 1, "uuid": "u-admin", "role_id": 1, "email": "admin@example.com", "password_hash": password_hash},
+            {"id": 2, "uuid": "u-donor", "role_id": 4, "email": "donor@example.com", "password_hash": password_hash},
+            {"id": 3, "uuid": "u-contact", "role_id": 3, "email": "contact@example.com", "password_hash": password_hash},
+        ])
+        await conn.execute(insert(Hospital), [
+            {"id": i, "uuid": f"h-{i}", "name": f"Hospital {i}", "latitude": 6.9 + i / 100, "longitude": 79.9}
+            for i in range(1, 4)
+        ])
+        await conn.execute(insert(Campaign), [
+            {"id": 1, "uuid": "c-1", "slug": "heart-surgery", "title": "Heart surgery", "status": "published"},
+            {"id": 2, "uuid": "c-2", "slug": "kidney-care", "title": "Kidney care", "status": "published"},
+            {"id": 3, "uuid": "c-3", "slug": "school-books", "title": "School books", "status": "draft"},
+        ])
+        await conn.execute(insert(CampaignImage), [{"campaign_id": 1, "url": "https://example.com/1.jpg"}])
+        await conn.execute(insert(CampaignDocument), [{"campaign_id": 1, "title": "Bill", "url": "https://example.com/1.pdf"}])
+        await conn.execute(insert(Donation), [
+            {
+                "id": i, "uuid": f"d-{i}", "campaign_id": 1, "user_id": 2, "amount": 10, "status": "completed",
+                "applied_at": datetime.utcnow(),
+            }
+            for i in (1, 2)
+        ])
+    await donation_aggregator.rebuild_rollups()
+
+
+def auth_headers(user: Optional[str]) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user})}"} if user else {}
+
+
+async def main() -> int:
+    global statements
+    await seed()
+    failures, exercised = [], set()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget/api/v1") as client:
+        for user, path in WARMUP:
+            await client.get(path, headers=auth_headers(user))
+        for scenario in SCENARIOS:
+            statements = 0
+            response = await client.request(
+                scenario.method, scenario.path, headers=auth_headers(scenario.user),
+                json=scenario.json, files=scenario.files,
+            )
+            used = statements
+            budget = getattr(scenario.endpoint, "__query_budget__", None)
+            exercised.add(scenario.endpoint)
+
+            label = f"{scenario.method} {scenario.path}"
+            verdict = "ok"
+            if response.status_code not in scenario.expect:
+                verdict = f"unexpected status {response.status_code}: {response.text[:200]}"
+                failures.append(label)
+            elif budget is None:
+                verdict = "no budget"
+            elif used > budget:
+                verdict = "OVER BUDGET"
+                failures.append(label)
+            print(f"{used:>3} / {budget if budget is not None else '-':>3}  {verdict:<12} {label}")
+
+    for module in ROUTER_MODULES:
+        for route in module.router.routes:
+            if not isinstance(route, APIRoute):
+                continue
+            endpoint = getattr(route.endpoint, "__wrapped__", route.endpoint)
+            if endpoint not in exercised and hasattr(endpoint, "__query_budget__"):
+                print(f"  not exercised: {module.__name__.rsplit('.', 1)[-1]} {sorted(route.methods)} {route.path}")
+
+    await engine.dispose()
+    if failures:
+        print(f"\n{len(failures)} scenario(s) failed")
+        return 1
+    print("\nall scenarios within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
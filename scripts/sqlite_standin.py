@@ -0,0 +1,53 @@
+"""Run the app against a SQLite file instead of MySQL, for the scripts here.
+
+Call ``use_sqlite`` before anything from ``app`` is imported (settings and
+the engine are created at import time), then ``create_schema`` once the
+engine exists. Requires ``aiosqlite``.
+"""
+import os
+
+from sqlalchemy import BigInteger, text
+from sqlalchemy.ext.compiler import compiles
+
+# MySQL fills these from column defaults that the models do not declare
+TIMESTAMP_DEFAULTS = (
+    ("campaigns", "created_at"),
+    ("donations", "created_at"),
+    ("campaign_followers", "followed_at"),
+)
+
+# Stand-ins for the MySQL score views
+SCORE_VIEWS = (
+    "CREATE VIEW IF NOT EXISTS vw_campaign_priority_scores AS "
+    "SELECT id AS campaign_id, amount_raised AS weighted_score FROM campaigns "
+    "WHERE deleted_at IS NULL AND status = 'published'",
+    "CREATE VIEW IF NOT EXISTS vw_hospital_priority_scores AS "
+    "SELECT id AS hospital_id, 0 AS priority_score FROM hospitals WHERE deleted_at IS NULL",
+)
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY
+    return "INTEGER"
+
+
+def use_sqlite(path) -> None:
+    for key in ("DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+        os.environ.setdefault(key, "0" if key == "DB_PORT" else "bench")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+
+
+async def create_schema(engine) -> None:
+    from app.core.db import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for table, column in TIMESTAMP_DEFAULTS:
+            await conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_{column} AFTER INSERT ON {table} FOR EACH ROW "
+                f"WHEN NEW.{column} IS NULL BEGIN "
+                f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP WHERE rowid = NEW.rowid; END"
+            ))
+        for view in SCORE_VIEWS:
+            await conn.execute(text(view))
@@ -0,0 +1,119 @@
+"""Run the app in process against a throwaway SQLite database.
+
+Settings and the engine are created when ``app`` is first imported, so the
+SQLite stand-in is configured here before anything from ``app`` is loaded.
+Async tests share one session-scoped event loop because the engine's pooled
+connections are bound to the loop that opened them.
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "scripts")]
+from sqlite_standin import create_schema, use_sqlite  # noqa: E402
+
+use_sqlite(Path(tempfile.mkdtemp()) / "tests.db")
+os.environ["AUTH_RATE_LIMIT_PER_MINUTE"] = "0"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.core.db import engine  # noqa: E402
+from app.core.deps import create_access_token, get_password_hash  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.campaign import Campaign  # noqa: E402
+from app.models.donation import Donation  # noqa: E402
+from app.models.hospital import Hospital  # noqa: E402
+from app.models.role import Role  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PASSWORD = "secret123"
+
+
+class StatementCounter:
+    count = 0
+
+
+_counter = StatementCounter()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    _counter.count += 1
+
+
+@contextmanager
+def count_statements():
+    """Yield a counter whose ``count`` is the SQL statements executed inside the block."""
+    counter = StatementCounter()
+    start = _counter.count
+    try:
+        yield counter
+    finally:
+        counter.count = _counter.count - start
+
+
+@contextmanager
+def within_budget(endpoint):
+    """Fail unless the block executes at most ``endpoint``'s ``@query_budget`` statements."""
+    with count_statements() as statements:
+        yield statements
+    budget = endpoint.__query_budget__
+    assert statements.count <= budget, f"{endpoint.__name__} executed {statements.count} statements, budget is {budget}"
+
+
+def auth_headers(user_uuid: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user_uuid})}"}
+
+
+async def seed() -> None:
+    await create_schema(engine)
+    async with engine.begin() as conn:
+        await conn.execute(insert(Role), [
+            {"id": 1, "name": "admin"}, {"id": 2, "name": "superadmin"},
+            {"id": 3, "name": "hospital_contact"}, {"id": 4, "name": "donor"},
+        ])
+        password_hash = get_password_hash(PASSWORD)
+        await conn.execute(insert(User), [
+            {"id": 1, "uuid": "u-admin", "role_id": 1, "email": "admin@example.com", "password_hash": password_hash},
+            {"id": 2, "uuid": "u-donor", "role_id": 4, "email": "donor@example.com", "password_hash": password_hash},
+            {"id": 3, "uuid": "u-contact", "role_id": 3, "email": "contact@example.com", "password_hash": password_hash},
+        ])
+        await conn.execute(insert(Hospital), [
+            {"id": i, "uuid": f"h-{i}", "name": f"Hospital {i}", "latitude": 6.9 + i / 100, "longitude": 79.9}
+            for i in range(1, 4)
+        ])
+        await conn.execute(insert(Campaign), [
+            {"id": 1, "uuid": "c-1", "slug": "heart-surgery", "title": "Heart surgery", "status": "published"},
+            {"id": 2, "uuid": "c-2", "slug": "kidney-care", "title": "Kidney care", "status": "published"},
+            {"id": 3, "uuid": "c-3", "slug": "school-books", "title": "School books", "status": "draft"},
+        ])
+        await conn.execute(insert(Donation), [
+            {"id": i, "uuid": f"d-{i}", "campaign_id": 1, "user_id": 2, "amount": 10 * i, "status": "completed"}
+            for i in (1, 2, 3)
+        ])
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    await seed()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield client
+    await engine.dispose()
+
+
+@pytest.fixture
+def admin_headers():
+    return auth_headers("u-admin")
+
+
+@pytest.fixture
+def contact_headers():
+    return auth_headers("u-contact")
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionClass, TokenBucketLimiter, admission
+from app.core.config import settings
+from app.core.metrics import request_metrics
+
+LOGIN = f"{settings.api_v1_prefix}/auth/login"
+EXPORT = f"{settings.api_v1_prefix}/donations/export"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_class_queues_then_sheds():
+    heavy = AdmissionClass("test", limit=1, max_queue=1, queue_timeout=0.05)
+    assert await heavy.acquire() is None
+    queued = asyncio.create_task(heavy.acquire())
+    await asyncio.sleep(0)
+    assert heavy.waiting == 1
+    assert await heavy.acquire() == "queue_full"
+    assert await queued == "timeout"
+    heavy.release()
+    assert await heavy.acquire() is None
+    assert heavy.stats()["shed"] == {"queue_full": 1, "timeout": 1}
+    assert heavy.stats()["active"] == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_queued_request_gets_released_slot():
+    heavy = AdmissionClass("test", limit=1, max_queue=1, queue_timeout=1)
+    assert await heavy.acquire() is None
+    queued = asyncio.create_task(heavy.acquire())
+    await asyncio.sleep(0)
+    heavy.release()
+    assert await queued is None
+    assert heavy.admitted == 2
+
+
+def test_token_bucket_is_per_client():
+    limiter = TokenBucketLimiter("test", rate_per_minute=60, burst=2, max_clients=10)
+    assert limiter.take("a") == 0 and limiter.take("a") == 0
+    assert 0 < limiter.take("a") <= 1
+    assert limiter.take("b") == 0
+    assert limiter.stats()["limited"] == 1
+
+
+def test_routing_rules():
+    assert admission.class_for("POST", LOGIN).name == "auth"
+    assert admission.class_for("GET", EXPORT).name == "heavy"
+    assert admission.class_for("GET", f"{settings.api_v1_prefix}/scores/campaigns") is None
+    assert admission.class_for("GET", f"{settings.api_v1_prefix}/health/") is None
+
+
+def shed_count(route: str, status_class: str) -> int:
+    stats = request_metrics.routes.get(("GET" if route == EXPORT else "POST", route))
+    return stats.statuses.get(status_class, 0) if stats else 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_saturated_class_sheds_under_route_label(client, admin_headers, monkeypatch):
+    heavy = AdmissionClass("heavy", limit=1, max_queue=0, queue_timeout=0.01)
+    monkeypatch.setitem(admission.classes, "heavy", heavy)
+    before = shed_count(EXPORT, "5xx")
+    await heavy.acquire()
+    try:
+        response = await client.get("/donations/export", headers=admin_headers)
+    finally:
+        heavy.release()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(admission.retry_after)
+    assert shed_count(EXPORT, "5xx") == before + 1
+    assert (await client.get("/donations/export", headers=admin_headers)).status_code == 200
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_rate_limited_login_gets_429_under_route_label(client, monkeypatch):
+    monkeypatch.setattr(admission, "limiters", {"auth": TokenBucketLimiter("auth", 1, 1, 10)})
+    monkeypatch.setattr(admission, "limiter_rules", {("POST", LOGIN): "auth"})
+    before = shed_count(LOGIN, "4xx")
+    credentials = {"email": "donor@example.com", "password": "wrong-password"}
+    assert (await client.post("/auth/login", json=credentials)).status_code == 401
+    response = await client.post("/auth/login", json=credentials)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert shed_count(LOGIN, "4xx") == before + 2
+    assert ("POST", "<unmatched>") not in request_metrics.routes
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_admission_metrics_are_exported(client):
+    lines = (await client.get("http://test/metrics")).text.splitlines()
+    assert 'admission_queue_depth{class="auth"} 0' in lines
+    assert any(line.startswith('admission_shed_total{class="heavy",reason="queue_full"}') for line in lines)
@@ -0,0 +1,40 @@
+import pytest
+
+from conftest import within_budget
+from app.api.v1 import campaigns
+from app.core.deps import principal_cache
+from app.core.resolvers import campaign_resolver
+from app.core.response_cache import response_cache
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.mark.parametrize("ref", ["kidney-care", "2"])
+async def test_fields_limited_read_is_invalidated_by_update(client, contact_headers, ref):
+    # A cold worker whose first sight of the campaign is a fields-limited read
+    campaign_resolver.cache.clear()
+    response_cache.clear()
+    first = await client.get(f"/campaigns/{ref}", params={"fields": "title"})
+    assert first.json() == {"title": "Kidney care"}
+    assert (await client.get(f"/campaigns/{ref}", params={"fields": "title"})).headers["X-Cache"] == "HIT"
+
+    patched = await client.patch("/campaigns/2", json={"title": f"Kidney care via {ref}"}, headers=contact_headers)
+    assert patched.status_code == 200
+
+    again = await client.get(f"/campaigns/{ref}", params={"fields": "title"})
+    assert again.headers["X-Cache"] == "MISS"
+    assert again.json() == {"title": f"Kidney care via {ref}"}
+    await client.patch("/campaigns/2", json={"title": "Kidney care"}, headers=contact_headers)
+
+
+async def test_fields_are_projected(client):
+    response = await client.get("/campaigns/2", params={"fields": "id,title"})
+    assert response.json() == {"id": 2, "title": "Kidney care"}
+
+
+async def test_update_on_cold_worker_stays_within_budget(client, contact_headers):
+    campaign_resolver.cache.clear()
+    principal_cache.clear()
+    with within_budget(campaigns.update_campaign):
+        response = await client.patch("/campaigns/kidney-care", json={"city": "Jaffna"}, headers=contact_headers)
+    assert response.status_code == 200
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import func, select
+
+from conftest import auth_headers
+from app.core.db import SessionLocal
+from app.models.campaign import Campaign
+from app.models.donation import CampaignFollower
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+CAMPAIGN = 2
+USERS = ("u-admin", "u-donor", "u-contact")
+
+
+async def follower_counts() -> tuple[int, int]:
+    """``(follower_count, follower rows)`` of ``CAMPAIGN``."""
+    async with SessionLocal() as db:
+        count = (await db.execute(select(Campaign.follower_count).where(Campaign.id == CAMPAIGN))).scalar_one()
+        rows = (await db.execute(
+            select(func.count()).select_from(CampaignFollower).where(CampaignFollower.campaign_id == CAMPAIGN)
+        )).scalar_one()
+    return count, rows
+
+
+async def test_follow_is_counted_once_and_unfollow_takes_it_back(client):
+    before, _ = await follower_counts()
+    first = await client.post(f"/campaigns/{CAMPAIGN}/followers", headers=auth_headers("u-donor"))
+    assert first.status_code == 200
+    assert await follower_counts() == (before + 1, before + 1)
+
+    again = await client.post("/campaigns/kidney-care/followers", headers=auth_headers("u-donor"))
+    assert again.status_code == 200
+    assert again.json()["id"] == first.json()["id"]
+    assert await follower_counts() == (before + 1, before + 1)
+
+    for _ in range(2):
+        left = await client.delete(f"/campaigns/{CAMPAIGN}/followers", headers=auth_headers("u-donor"))
+        assert left.status_code == 200
+        assert await follower_counts() == (before, before)
+
+
+async def test_followers_are_paged_by_cursor(client):
+    for user in USERS:
+        assert (await client.post(f"/campaigns/{CAMPAIGN}/followers", headers=auth_headers(user))).status_code == 200
+    count, _ = await follower_counts()
+    assert count == len(USERS)
+
+    first = await client.get(f"/campaigns/{CAMPAIGN}/followers", params={"limit": 2})
+    assert [f["user_id"] for f in first.json()] == [1, 2]
+    cursor = first.headers["X-Next-Cursor"]
+
+    rest = await client.get(f"/campaigns/{CAMPAIGN}/followers", params={"limit": 2, "cursor": cursor})
+    assert [f["user_id"] for f in rest.json()] == [3]
+    assert "X-Next-Cursor" not in rest.headers
+
+    skipped = await client.get(f"/campaigns/{CAMPAIGN}/followers", params={"skip": 1, "limit": 5})
+    assert [f["user_id"] for f in skipped.json()] == [2, 3]
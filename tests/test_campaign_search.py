@@ -0,0 +1,154 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.db import SessionLocal
+from app.models.campaign import Campaign
+from app.services import campaign_search as search_module
+from app.services.campaign_search import CampaignSearchIndex, tokenize
+
+
+def campaign(id, title, short_description=None, full_description=None, status="published", urgency="medium", city=None):
+    return SimpleNamespace(
+        id=id, title=title, short_description=short_description, full_description=full_description,
+        status=status, urgency=urgency, city=city,
+    )
+
+
+def build(*campaigns) -> CampaignSearchIndex:
+    index = CampaignSearchIndex()
+    for item in campaigns:
+        index.upsert(item)
+    return index
+
+
+def test_tokenize_drops_stopwords_and_keeps_sinhala():
+    assert tokenize("The surgery for a child") == ["surgery", "child"]
+    assert tokenize("ශල්‍යකර්මය") == ["ශල්‍යකර්මය"]
+
+
+def test_title_outranks_description():
+    index = build(
+        campaign(1, "School books", full_description="Help with heart surgery costs"),
+        campaign(2, "Heart surgery", full_description="Help with school books"),
+    )
+    assert index.search("heart") == [2, 1]
+
+
+def test_rarer_word_weighs_more():
+    index = build(
+        campaign(1, "Dialysis dialysis surgery"),
+        campaign(2, "Dialysis surgery surgery"),
+        campaign(3, "Surgery fund"),
+        campaign(4, "Surgery appeal"),
+    )
+    # Same length and words; the extra occurrence of the rarer word counts for more
+    assert index.search("dialysis surgery") == [1, 2]
+
+
+def test_shorter_document_wins_equal_matches():
+    index = build(
+        campaign(1, "Heart surgery for a young girl from the hill country estates"),
+        campaign(2, "Heart surgery"),
+    )
+    assert index.search("heart") == [2, 1]
+
+
+def test_every_word_must_match_and_last_is_prefix():
+    index = build(campaign(1, "Kidney transplant"), campaign(2, "Kidney dialysis"))
+    assert index.search("kidney trans") == [1]
+    assert sorted(index.search("kidney")) == [1, 2]
+    assert index.search("trans kidney") == []
+    assert index.search("k") == []
+
+
+def test_filters():
+    index = build(
+        campaign(1, "Heart surgery", status="published", urgency="critical", city="Kandy"),
+        campaign(2, "Heart surgery", status="draft", urgency="critical", city="Kandy"),
+        campaign(3, "Heart surgery", status="published", urgency="low", city="Galle"),
+    )
+    assert index.search("heart", status="published", urgency="critical") == [1]
+    assert index.search("heart", city="KANDY", status="draft") == [2]
+
+
+def test_upsert_reindexes_and_remove_forgets():
+    index = build(campaign(1, "Heart surgery"), campaign(2, "Eye care"))
+    index.upsert(campaign(1, "Cancer treatment"))
+    assert index.search("heart") == []
+    assert index.search("cancer") == [1]
+    index.remove(1)
+    assert index.search("cancer") == []
+    assert index.stats()["documents"] == 1
+
+
+def test_ranked_path_matches_exhaustive_scoring(monkeypatch):
+    rng = random.Random(12)
+    words = ["care", "surgery", "heart", "child", "dialysis", "eye", "cancer", "kidney", "urgent", "rural"]
+    docs = [
+        campaign(
+            i, " ".join(rng.choices(words, k=rng.randint(1, 4))),
+            short_description=" ".join(rng.choices(words, k=rng.randint(0, 6))),
+            urgency=rng.choice(["low", "high"]),
+        )
+        for i in range(1, 6001)
+    ]
+    index = build(*docs)
+    queries = ["care", "surgery", "care heart", "child su", "urgent care"]
+    ranked = {q: index.search(q, limit=20, offset=5) for q in queries}
+    ranked_filtered = index.search("care", urgency="high", limit=20)
+    # With a threshold above every postings list, every match is scored
+    monkeypatch.setattr(search_module, "RANKED_THRESHOLD", 10 ** 9)
+    assert ranked == {q: index.search(q, limit=20, offset=5) for q in queries}
+    assert ranked_filtered == index.search("care", urgency="high", limit=20)
+
+
+async def search_ids(client, q: str) -> list[int]:
+    response = await client.get("/campaigns/", params={"q": q, "fields": "id"})
+    assert response.status_code == 200
+    return [row["id"] for row in response.json()]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_index_follows_campaign_writes(client, contact_headers, admin_headers):
+    assert await search_ids(client, "orthopaedic") == []
+    created = await client.post("/campaigns/", json={"title": "Orthopaedic implants"}, headers=contact_headers)
+    assert created.status_code == 200
+    campaign_id = created.json()["id"]
+    assert await search_ids(client, "orthopaedic") == [campaign_id]
+
+    updated = await client.patch(f"/campaigns/{campaign_id}", json={"title": "Prosthetic limbs"}, headers=contact_headers)
+    assert updated.status_code == 200
+    assert await search_ids(client, "orthopaedic") == []
+    assert await search_ids(client, "prosthetic") == [campaign_id]
+
+    deleted = await client.delete(f"/campaigns/{campaign_id}", headers=admin_headers)
+    assert deleted.status_code == 200
+    assert await search_ids(client, "prosthetic") == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_periodic_reload_picks_up_other_workers_writes(client, monkeypatch):
+    index = search_module.campaign_search
+    await search_ids(client, "warm")
+    # Written by another worker: nothing here upserts it
+    async with SessionLocal() as db:
+        await db.execute(insert(Campaign).values(
+            uuid="c-elsewhere", slug="cataract-surgery", title="Cataract surgery", status="published",
+        ))
+        await db.commit()
+    assert index.search("cataract") == []
+
+    monkeypatch.setattr(index, "interval", 0.01)
+    index.start()
+    try:
+        for _ in range(200):
+            if index.search("cataract"):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await index.stop()
+    assert len(index.search("cataract")) == 1
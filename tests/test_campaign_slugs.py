@@ -0,0 +1,62 @@
+import pytest
+
+from app.core.db import SessionLocal
+from app.services import campaign_slugs
+from app.services.campaign_slugs import allocate_slugs
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_allocate_slugs_picks_the_lowest_free_suffix(client):
+    async with SessionLocal() as db:
+        slugs = await allocate_slugs(
+            db, ["Heart surgery", "Heart  Surgery!", "Kidney care", "Eye clinic", "Eye clinic"]
+        )
+    assert slugs == ["heart-surgery-1", "heart-surgery-2", "kidney-care-1", "eye-clinic", "eye-clinic-1"]
+
+
+async def test_bulk_create_allocates_distinct_slugs(client, contact_headers):
+    response = await client.post("/campaigns/bulk", json={"campaigns": [
+        {"title": "Dialysis fund"}, {"title": "Dialysis  fund"}, {"title": "Heart surgery"},
+    ]}, headers=contact_headers)
+    assert response.status_code == 200
+    assert [c["slug"] for c in response.json()] == ["dialysis-fund", "dialysis-fund-1", "heart-surgery-1"]
+
+    again = await client.post(
+        "/campaigns/bulk", json={"campaigns": [{"title": "Dialysis fund"}]}, headers=contact_headers
+    )
+    assert [c["slug"] for c in again.json()] == ["dialysis-fund-2"]
+
+
+async def test_slug_taken_concurrently_is_allocated_again(client, contact_headers, monkeypatch):
+    calls = []
+
+    async def racing_allocate(db, titles):
+        calls.append(titles)
+        if len(calls) == 1:
+            # Another request took the free slug between our read and our insert
+            return ["heart-surgery"]
+        return await allocate_slugs(db, titles)
+
+    monkeypatch.setattr(campaign_slugs, "allocate_slugs", racing_allocate)
+    response = await client.post("/campaigns/", json={"title": "Heart surgery"}, headers=contact_headers)
+    assert response.status_code == 200
+    assert response.json()["slug"].startswith("heart-surgery-")
+    assert len(calls) == 2
+
+
+async def test_other_integrity_errors_are_not_retried(client, contact_headers, monkeypatch):
+    calls = []
+
+    async def counting_allocate(db, titles):
+        calls.append(titles)
+        return await allocate_slugs(db, titles)
+
+    monkeypatch.setattr(campaign_slugs, "allocate_slugs", counting_allocate)
+    monkeypatch.setattr(campaign_slugs, "generate_uuid", lambda: "c-1")
+    response = await client.post(
+        "/campaigns/bulk", json={"campaigns": [{"title": "Fresh title"}]}, headers=contact_headers
+    )
+    assert response.status_code == 400
+    assert "campaigns.uuid" in response.json()["detail"]
+    assert len(calls) == 1
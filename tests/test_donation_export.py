@@ -0,0 +1,33 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_csv_export(client, admin_headers):
+    response = await client.get("/donations/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="donations.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == ["1", "2", "3"]
+
+
+async def test_gzip_export_is_a_gzip_file(client, admin_headers):
+    response = await client.get("/donations/export?format=ndjson&gzip=true", headers=admin_headers)
+    assert response.status_code == 200
+    # A file download, not a transfer encoding clients would silently undo
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="donations.ndjson.gz"' in response.headers["content-disposition"]
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+
+
+async def test_export_resumes_after_id(client, admin_headers):
+    response = await client.get("/donations/export?format=ndjson&after_id=2", headers=admin_headers)
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [3]
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.db import SessionLocal
+from app.models.donation import Donation
+from app.services import donation_rollups
+from app.services.donation_aggregator import DonationAggregator, donation_aggregator
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+CAMPAIGN = 3
+
+
+async def add_donations(rows: list[dict]) -> list[int]:
+    """Insert completed, un-applied donations for ``CAMPAIGN``; return their ids."""
+    async with SessionLocal() as db:
+        result = await db.execute(
+            insert(Donation).returning(Donation.id),
+            [{"uuid": f"roll-{row['created_at']:%j%H%M}-{i}", "campaign_id": CAMPAIGN, "status": "completed", **row}
+             for i, row in enumerate(rows)],
+        )
+        ids = list(result.scalars())
+        await db.commit()
+    return ids
+
+
+async def stored_rollups() -> dict:
+    async with SessionLocal() as db:
+        return await donation_rollups.stored(db, [CAMPAIGN])
+
+
+async def test_rebuild_matches_incrementally_built_rollups(client, admin_headers):
+    start = datetime(2026, 3, 1, 9, 15)
+    ids = await add_donations([
+        {"user_id": 1, "amount": Decimal("5.00"), "created_at": start},
+        {"user_id": 2, "amount": Decimal("7.50"), "created_at": start + timedelta(minutes=20)},
+        {"user_id": 2, "amount": Decimal("2.00"), "created_at": start + timedelta(hours=1)},
+        {"user_id": None, "amount": Decimal("3.00"), "created_at": start + timedelta(hours=2)},
+        {"user_id": 1, "amount": Decimal("11.00"), "created_at": start + timedelta(days=1)},
+    ])
+    # Applied over several flushes, then one taken back out by a refund
+    for chunk in (ids[:2], ids[2:4], ids[4:]):
+        for donation_id in chunk:
+            donation_aggregator.add(donation_id)
+        await donation_aggregator.flush()
+    refunded = await client.patch(f"/donations/{ids[1]}/status", json={"status": "refunded"}, headers=admin_headers)
+    assert refunded.status_code == 200
+
+    incremental = await stored_rollups()
+    assert incremental[(CAMPAIGN, "hour", start.replace(minute=0))] == (Decimal("5.00"), 1, 1)
+    assert incremental[(CAMPAIGN, "day", start.replace(hour=0, minute=0))] == (Decimal("10.00"), 3, 2)
+
+    report = await donation_aggregator.rebuild_rollups(CAMPAIGN)
+    assert report["campaigns"] == 1
+    assert await stored_rollups() == incremental
+    assert (await donation_aggregator.check_rollups(CAMPAIGN))["mismatched"] == 0
+
+
+async def test_flush_waits_for_the_rollup_lock_held_by_another_process(client):
+    (donation_id,) = await add_donations([
+        {"user_id": 2, "amount": Decimal("4.00"), "created_at": datetime(2026, 3, 5, 12, 0)},
+    ])
+    # Its own aggregator and asyncio lock, as in another worker process
+    other = DonationAggregator(SessionLocal, 0)
+    other.add(donation_id)
+    async with SessionLocal() as db:
+        await donation_rollups.lock(db)
+        flush = asyncio.create_task(other.flush())
+        await asyncio.sleep(0.3)
+        assert not flush.done()
+        await db.commit()
+    assert await flush == {CAMPAIGN: Decimal("4.00")}
+    assert (await donation_aggregator.check_rollups(CAMPAIGN))["mismatched"] == 0
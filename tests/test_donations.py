@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from conftest import auth_headers
+from app.core.db import SessionLocal
+from app.models.campaign import Campaign
+from app.services.donation_aggregator import donation_aggregator
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def amount_raised(campaign_id: int) -> Decimal:
+    async with SessionLocal() as db:
+        return (await db.execute(select(Campaign.amount_raised).where(Campaign.id == campaign_id))).scalar_one()
+
+
+async def test_donation_counts_only_once_completed(client, admin_headers):
+    before = await amount_raised(2)
+    created = await client.post(
+        "/donations/", json={"campaign_id": 2, "amount": "40.00"}, headers=auth_headers("u-donor")
+    )
+    assert created.status_code == 201
+    assert created.json()["status"] == "pending"
+    await donation_aggregator.flush()
+    assert await amount_raised(2) == before
+
+    donation_id = created.json()["id"]
+    completed = await client.patch(
+        f"/donations/{donation_id}/status", json={"status": "completed"}, headers=admin_headers
+    )
+    assert completed.status_code == 200
+    await donation_aggregator.flush()
+    assert await amount_raised(2) == before + Decimal("40.00")
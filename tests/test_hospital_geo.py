@@ -0,0 +1,136 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.db import SessionLocal
+from app.models.hospital import Hospital
+from app.services.hospital_geo import MAX_DISTANCE_KM, HospitalGeoIndex, haversine_km, hospital_geo_index
+
+
+def make_points(rng: random.Random) -> list[SimpleNamespace]:
+    coords = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(1500)]
+    # Clusters where grid cells degenerate: near both poles and across the antimeridian
+    coords += [(rng.uniform(88, 90), rng.uniform(-180, 180)) for _ in range(150)]
+    coords += [(rng.uniform(-90, -88), rng.uniform(-180, 180)) for _ in range(150)]
+    coords += [(rng.uniform(-10, 10), rng.choice((-1, 1)) * rng.uniform(179, 180)) for _ in range(200)]
+    coords += [(90.0, 0.0), (-90.0, 45.0), (0.0, 180.0), (0.0, -180.0)]
+    return [
+        SimpleNamespace(
+            id=i, uuid=f"h-{i}", name=f"Hospital {i}", city=None, district=None,
+            verification_status="verified", latitude=lat, longitude=lng,
+        )
+        for i, (lat, lng) in enumerate(coords, start=1)
+    ]
+
+
+def brute_force(points, lat, lng) -> list[tuple[float, int]]:
+    return sorted((haversine_km(lat, lng, p.latitude, p.longitude), p.id) for p in points)
+
+
+QUERIES = [
+    (6.9, 79.9), (0.0, 0.0), (89.9, 10.0), (-89.95, -170.0), (90.0, 0.0), (-90.0, 0.0),
+    (0.0, 179.99), (0.0, -179.99), (5.0, 180.0), (-5.0, -180.0), (60.0, 179.5), (-75.0, -179.5),
+]
+RADII = [1, 25, 150, 800, 3000, 12000, 20000]
+
+
+@pytest.fixture(scope="module")
+def indexed():
+    points = make_points(random.Random(20251016))
+    index = HospitalGeoIndex()
+    for point in points:
+        index.upsert(point)
+    index.loaded = True
+    return index, points
+
+
+@pytest.mark.parametrize("lat,lng", QUERIES)
+def test_within_matches_brute_force(indexed, lat, lng):
+    index, points = indexed
+    expected = brute_force(points, lat, lng)
+    for radius in RADII:
+        hits = index.within(lat, lng, radius)
+        assert [point["id"] for _, point in hits] == [i for d, i in expected if d <= radius], radius
+
+
+@pytest.mark.parametrize("lat,lng", QUERIES)
+def test_nearest_matches_brute_force(indexed, lat, lng):
+    index, points = indexed
+    expected = brute_force(points, lat, lng)
+    for k in (1, 5, 40):
+        hits = index.nearest(lat, lng, k)
+        assert [point["id"] for _, point in hits] == [i for _, i in expected[:k]]
+        assert [round(d, 6) for d, _ in hits] == [round(d, 6) for d, _ in expected[:k]]
+
+
+def test_random_queries_match_brute_force(indexed):
+    index, points = indexed
+    rng = random.Random(7)
+    for _ in range(200):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        radius = rng.choice(RADII)
+        expected = [i for d, i in brute_force(points, lat, lng) if d <= radius]
+        assert [point["id"] for _, point in index.within(lat, lng, radius)] == expected
+
+
+def test_upsert_moves_and_remove_drops():
+    index = HospitalGeoIndex()
+    hospital = SimpleNamespace(
+        id=1, uuid="h-1", name="Moving", city=None, district=None,
+        verification_status="verified", latitude=6.9, longitude=79.9,
+    )
+    index.upsert(hospital)
+    hospital.latitude, hospital.longitude = -33.9, 151.2
+    index.upsert(hospital)
+    assert index.within(6.9, 79.9, 100) == []
+    assert [point["id"] for _, point in index.within(-33.9, 151.2, 1)] == [1]
+    index.remove(1)
+    assert len(index) == 0
+    assert index.nearest(0, 0, 3) == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_nearby_endpoint_loads_index_from_database(client):
+    response = await client.get("/hospitals/nearby?lat=6.9&lng=79.9&k=2")
+    assert response.status_code == 200
+    body = response.json()
+    assert [hospital["id"] for hospital in body] == [1, 2]
+    assert body[0]["distance_km"] == pytest.approx(haversine_km(6.9, 79.9, 6.91, 79.9), abs=1e-3)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_reload_swaps_in_a_complete_index(client):
+    await client.get("/hospitals/nearby?lat=6.9&lng=79.9")
+    expected = len(hospital_geo_index)
+    async with SessionLocal() as db:
+        reload = asyncio.create_task(hospital_geo_index.load(db))
+        sizes = []
+        while not reload.done():
+            sizes.append(len(hospital_geo_index.within(6.9, 79.9, MAX_DISTANCE_KM)))
+            await asyncio.sleep(0)
+        await reload
+    assert sizes and set(sizes) == {expected}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_periodic_reload_picks_up_other_workers_writes(client, monkeypatch):
+    await client.get("/hospitals/nearby?lat=6.9&lng=79.9")
+    # Written by another worker: nothing here upserts it
+    async with SessionLocal() as db:
+        await db.execute(insert(Hospital).values(uuid="h-elsewhere", name="Far North Clinic", latitude=9.66, longitude=80.02))
+        await db.commit()
+    assert hospital_geo_index.within(9.66, 80.02, 1) == []
+
+    monkeypatch.setattr(hospital_geo_index, "interval", 0.01)
+    hospital_geo_index.start()
+    try:
+        for _ in range(200):
+            if hospital_geo_index.within(9.66, 80.02, 1):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await hospital_geo_index.stop()
+    assert [point["name"] for _, point in hospital_geo_index.within(9.66, 80.02, 1)] == ["Far North Clinic"]
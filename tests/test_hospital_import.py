@@ -0,0 +1,66 @@
+import itertools
+
+import pytest
+
+from conftest import count_statements
+from app.api.v1 import hospitals
+from app.core.deps import generate_uuid
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def csv_file(*names: str) -> dict:
+    lines = ["name,city,latitude,longitude", *(f"{name},Colombo,6.9,79.8" for name in names)]
+    return {"file": ("hospitals.csv", "\n".join(lines).encode(), "text/csv")}
+
+
+async def test_import_is_chunked_and_reports_row_errors(client, contact_headers, monkeypatch):
+    monkeypatch.setattr(hospitals, "IMPORT_CHUNK_SIZE", 2)
+    await client.get("/auth/me", headers=contact_headers)
+    with count_statements() as statements:
+        response = await client.post(
+            "/hospitals/import",
+            files=csv_file("Import A", "Import B", "Import A", "Hospital 1", "Import C"),
+            headers=contact_headers,
+        )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 3
+    assert report["failed"] == 2
+    assert [(e["row"], e["errors"]) for e in report["errors"]] == [
+        (4, ["Hospital with this name already exists"]),
+        (5, ["Hospital with this name already exists"]),
+    ]
+    # Three chunks, each at most a duplicate check, an insert and a re-read for the spatial index
+    assert statements.count <= 3 * 3
+
+
+async def test_rejected_chunk_keeps_earlier_chunks(client, contact_headers, monkeypatch):
+    monkeypatch.setattr(hospitals, "IMPORT_CHUNK_SIZE", 2)
+    # The second chunk reuses an existing uuid, so the database rejects it
+    uuids = itertools.chain([generate_uuid(), generate_uuid()], itertools.repeat("h-1"))
+    monkeypatch.setattr(hospitals, "generate_uuid", lambda: next(uuids))
+    response = await client.post(
+        "/hospitals/import", files=csv_file("Chunk A", "Chunk B", "Chunk C"), headers=contact_headers
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 2
+    assert report["failed"] == 1
+    assert report["errors"][0]["row"] == 4
+    assert report["errors"][0]["errors"][0].startswith("rejected by the database")
+    listed = (await client.get("/hospitals/", params={"limit": 1000})).json()
+    assert {"Chunk A", "Chunk B"} <= {h["name"] for h in listed}
+    assert "Chunk C" not in {h["name"] for h in listed}
+
+
+async def test_stored_errors_are_capped(client, contact_headers, monkeypatch):
+    monkeypatch.setattr(hospitals, "IMPORT_MAX_ERRORS", 2)
+    response = await client.post(
+        "/hospitals/import", files=csv_file(*["Hospital 2"] * 5), headers=contact_headers
+    )
+    report = response.json()
+    assert report["inserted"] == 0
+    assert report["failed"] == 5
+    assert len(report["errors"]) == 2
+    assert report["errors_omitted"] == 3
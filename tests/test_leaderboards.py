@@ -0,0 +1,120 @@
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import count_statements, within_budget
+from app.api.v1 import campaigns
+from app.core.resolvers import campaign_resolver
+from app.services.campaign_leaderboards import BOARDS, URGENCY_RANK, CampaignLeaderboards, campaign_leaderboards
+
+
+@pytest.fixture
+def cold_boards():
+    campaign_leaderboards.loaded = False
+    campaign_resolver.cache.clear()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cold_board_load_is_within_budget(client, cold_boards):
+    with within_budget(campaigns.get_leaderboard):
+        response = await client.get("/campaigns/leaderboards/closest_to_goal")
+    assert response.status_code == 200
+    assert campaign_leaderboards.loaded
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cold_ranks_are_within_budget(client, cold_boards):
+    with within_budget(campaigns.get_campaign_leaderboard_ranks):
+        response = await client.get("/campaigns/kidney-care/leaderboards")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_warm_board_needs_no_query(client):
+    await client.get("/campaigns/leaderboards/most_urgent_underfunded")
+    with count_statements() as statements:
+        response = await client.get("/campaigns/leaderboards/most_urgent_underfunded")
+    assert response.status_code == 200
+    assert statements.count == 0
+    # Only published campaigns take part
+    assert {entry["id"] for entry in response.json()} <= {1, 2}
+
+
+def reference_order(campaigns: dict[int, SimpleNamespace], board: str) -> list[int]:
+    """Ids on ``board`` by sorting every published campaign from scratch."""
+    live = [c for c in campaigns.values() if c.status == "published"]
+    underfunded = [c for c in live if 0 < c.target_amount and c.amount_raised < c.target_amount]
+    if board == "closest_to_goal":
+        ranked = sorted(underfunded, key=lambda c: (-(c.amount_raised / c.target_amount), c.id))
+    elif board == "most_funded_today":
+        ranked = sorted((c for c in live if c.raised_today > 0), key=lambda c: (-c.raised_today, c.id))
+    else:
+        ranked = sorted(underfunded, key=lambda c: (
+            -URGENCY_RANK[c.urgency], c.amount_raised / c.target_amount, c.id
+        ))
+    return [c.id for c in ranked]
+
+
+def assert_matches_reference(boards: CampaignLeaderboards, campaigns: dict[int, SimpleNamespace]) -> None:
+    for board in BOARDS:
+        expected = reference_order(campaigns, board)
+        assert [entry["id"] for entry in boards.page(board, 0, len(campaigns))] == expected, board
+        assert [entry["id"] for entry in boards.page(board, 7, 5)] == expected[7:12], board
+        for campaign_id in campaigns:
+            rank = expected.index(campaign_id) + 1 if campaign_id in expected else None
+            assert boards.ranks(campaign_id)[board] == rank, (board, campaign_id)
+
+
+def test_incremental_updates_match_a_sorted_reference():
+    rng = random.Random(20261016)
+    boards = CampaignLeaderboards(None, 0)
+    today = datetime.combine(datetime.utcnow().date(), time(12))
+    campaigns = {}
+    for campaign_id in range(1, 201):
+        campaigns[campaign_id] = campaign = SimpleNamespace(
+            id=campaign_id, slug=f"c-{campaign_id}", title=f"Campaign {campaign_id}",
+            urgency=rng.choice(list(URGENCY_RANK)), status=rng.choice(("published", "published", "draft")),
+            # Round targets and amounts make equal progress, and so ties, common
+            target_amount=Decimal(rng.choice((0, 100, 200, 500, 1000))),
+            amount_raised=Decimal(rng.randrange(0, 60) * 10), raised_today=Decimal(0),
+        )
+        boards.upsert(campaign)
+    assert_matches_reference(boards, campaigns)
+
+    applied = []
+    for _ in range(20):
+        for _ in range(25):
+            campaign = campaigns[rng.randrange(1, 201)]
+            op = rng.random()
+            if op < 0.3:
+                campaign.status = rng.choice(("published", "published", "draft"))
+                campaign.target_amount = Decimal(rng.choice((0, 100, 200, 500, 1000)))
+                campaign.urgency = rng.choice(list(URGENCY_RANK))
+                if campaign.status != "published":
+                    # Off the boards, today's total only comes back with the next reload
+                    campaign.raised_today = Decimal(0)
+                # Write handlers pass the campaign without today's total
+                boards.upsert(SimpleNamespace(**{k: v for k, v in vars(campaign).items() if k != "raised_today"}))
+                continue
+            if op < 0.4 and applied:
+                # A refund takes an applied donation back out
+                donation, sign = applied.pop(rng.randrange(len(applied))), -1
+            elif campaign.status == "published":
+                donation, sign = SimpleNamespace(
+                    campaign_id=campaign.id, amount=Decimal(rng.randrange(1, 30) * 5),
+                    created_at=today if rng.random() < 0.7 else today - timedelta(days=1),
+                ), 1
+                applied.append(donation)
+            else:
+                continue
+            target = campaigns[donation.campaign_id]
+            if target.status != "published":
+                continue
+            boards.record_donations([donation], sign=sign)
+            target.amount_raised += sign * donation.amount
+            if donation.created_at == today:
+                target.raised_today += sign * donation.amount
+        assert_matches_reference(boards, campaigns)
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import PASSWORD
+from app.core import deps
+from app.core.hashing import PasswordHashPool
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def wait_for(predicate, timeout: float = 2) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def test_pool_rejects_beyond_max_pending():
+    pool = PasswordHashPool(workers=1, max_pending=2, retry_after=7)
+    gate = threading.Event()
+    running = [asyncio.create_task(pool.run(gate.wait)) for _ in range(2)]
+    await wait_for(lambda: pool.pending == 2)
+
+    with pytest.raises(HTTPException) as rejected:
+        await pool.run(gate.wait)
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers["Retry-After"] == "7"
+
+    gate.set()
+    assert await asyncio.gather(*running) == [True, True]
+    assert pool.stats() == {"workers": 1, "max_pending": 2, "pending": 0, "rejected": 1}
+    pool.shutdown()
+
+
+async def test_cancelled_caller_keeps_its_slot_until_the_worker_finishes():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    started, gate = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        gate.wait()
+
+    waiter = asyncio.create_task(pool.run(work))
+    await wait_for(started.is_set)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    # The bcrypt call is still running in its thread
+    assert pool.pending == 1
+    with pytest.raises(HTTPException):
+        await pool.run(work)
+
+    gate.set()
+    await wait_for(lambda: pool.pending == 0)
+    assert await pool.run(lambda: "ok") == "ok"
+    pool.shutdown()
+
+
+async def test_login_gets_503_when_the_pool_is_full(client, monkeypatch):
+    credentials = {"email": "donor@example.com", "password": PASSWORD}
+    assert (await client.post("/auth/login", json=credentials)).status_code == 200
+    monkeypatch.setattr(deps.password_pool, "max_pending", 0)
+    response = await client.post("/auth/login", json=credentials)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,33 @@
+import logging
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT, within_budget
+from app.api.v1 import admin
+from app.core.deps import principal_cache
+
+
+def test_every_budgeted_route_stays_within_budget():
+    # Separate process: the checker seeds its own database and imports the app afresh
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "check_query_budgets.py")],
+        capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "OVER BUDGET" not in result.stdout
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_over_budget_request_is_served_but_fails_the_check(client, admin_headers, caplog):
+    # GET /admin/caches is budgeted at 0; a cold principal costs one lookup
+    await client.get("/admin/caches", headers=admin_headers)
+    with within_budget(admin.cache_stats):
+        assert (await client.get("/admin/caches", headers=admin_headers)).status_code == 200
+
+    principal_cache.clear()
+    with caplog.at_level(logging.WARNING), pytest.raises(AssertionError, match="budget is 0"):
+        with within_budget(admin.cache_stats):
+            assert (await client.get("/admin/caches", headers=admin_headers)).status_code == 200
+    assert not caplog.records
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.db import SessionLocal
+from app.core.resolvers import campaign_resolver
+from app.services.campaign_slugs import slugify
+
+
+@pytest.mark.parametrize("title, slug", [
+    ("Heart surgery", "heart-surgery"),
+    ("2025", "campaign-2025"),
+    ("  2025 ", "campaign-2025"),
+    ("Help 4 kids", "help-4-kids"),
+    ("!!!", "campaign"),
+])
+def test_slugify(title, slug):
+    assert slugify(title) == slug
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_references_of_different_kinds_do_not_collide(client):
+    campaign_resolver.cache.clear()
+    # A legacy campaign whose slug reads like another campaign's id
+    campaign_resolver.remember(SimpleNamespace(id=1, uuid="c-1", slug="2"))
+    assert campaign_resolver.peek("2") is None
+    async with SessionLocal() as db:
+        assert await campaign_resolver.resolve("2", db) == 2
+        assert await campaign_resolver.resolve("heart-surgery", db) == 1
+    assert campaign_resolver.peek("2") == 2
+    assert campaign_resolver.peek("heart-surgery") == 1
+
+    campaign_resolver.forget(SimpleNamespace(id=1, uuid="c-1", slug="heart-surgery"))
+    assert campaign_resolver.peek("heart-surgery") is None
+    assert campaign_resolver.peek("1") is None
+    assert campaign_resolver.peek("2") == 2
@@ -0,0 +1,46 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.db import SessionLocal
+from app.core.replicas import PRIMARY_COOKIE, replicas
+from app.core.response_cache import invalidate, recently_invalidated, response_cache
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.fixture
+def lagging_replica(monkeypatch):
+    # Reads the primary's data, but the cache has to treat it as a replica
+    replica = SimpleNamespace(name="replica-1", sessions=SessionLocal)
+    monkeypatch.setattr(replicas, "pick", lambda: replica)
+
+
+async def test_pinned_reads_bypass_the_cache(client):
+    response_cache.clear()
+    pinned = {"Cookie": f"{PRIMARY_COOKIE}={time.time() + 60}"}
+    response = await client.get("/campaigns/1", headers=pinned)
+    assert response.status_code == 200
+    assert "X-Cache" not in response.headers
+    # Nothing was stored for other clients either
+    assert (await client.get("/campaigns/1")).headers["X-Cache"] == "MISS"
+    assert (await client.get("/campaigns/1", headers=pinned)).headers.get("X-Cache") is None
+
+
+async def test_replica_read_is_not_cached_right_after_invalidation(client, lagging_replica):
+    response_cache.clear()
+    invalidate("campaign:1")
+    assert (await client.get("/campaigns/1")).headers["X-Cache"] == "MISS"
+    assert (await client.get("/campaigns/1")).headers["X-Cache"] == "MISS"
+
+    recently_invalidated.clear()
+    assert (await client.get("/campaigns/1")).headers["X-Cache"] == "MISS"
+    assert (await client.get("/campaigns/1")).headers["X-Cache"] == "HIT"
+
+
+async def test_primary_read_is_cached_right_after_invalidation(client):
+    response_cache.clear()
+    invalidate("campaign:1")
+    assert (await client.get("/campaigns/1")).headers["X-Cache"] == "MISS"
+    assert (await client.get("/campaigns/1")).headers["X-Cache"] == "HIT"
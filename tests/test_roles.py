@@ -0,0 +1,47 @@
+import pytest
+
+from conftest import count_statements
+from app.core.db import SessionLocal
+from app.core.deps import principal_cache
+from app.core.roles import role_registry
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_require_roles_resolves_from_registry(client, admin_headers):
+    await client.get("/admin/caches", headers=admin_headers)
+    with count_statements() as statements:
+        response = await client.get("/admin/caches", headers=admin_headers)
+    assert response.status_code == 200
+    assert statements.count == 0
+
+
+async def test_require_roles_rejects_other_roles(client, contact_headers):
+    await client.get("/auth/me", headers=contact_headers)
+    with count_statements() as statements:
+        response = await client.get("/admin/caches", headers=contact_headers)
+    assert response.status_code == 403
+    assert statements.count == 0
+
+
+async def test_unknown_role_reloads_registry_once(client):
+    async with SessionLocal() as db:
+        await role_registry.load(db)
+        with count_statements() as statements:
+            assert await role_registry.resolve(99, db) is None
+    assert statements.count == 1
+
+
+async def test_known_role_needs_no_query(client):
+    async with SessionLocal() as db:
+        await role_registry.load(db)
+        with count_statements() as statements:
+            assert await role_registry.resolve(1, db) == "admin"
+    assert statements.count == 0
+
+
+async def test_refreshing_roles_drops_cached_principals(client, admin_headers, contact_headers):
+    assert (await client.get("/auth/me", headers=contact_headers)).status_code == 200
+    assert principal_cache.peek("u-contact") is not None
+    assert (await client.post("/admin/roles/refresh", headers=admin_headers)).status_code == 200
+    assert principal_cache.peek("u-contact") is None
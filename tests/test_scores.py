@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app.api.v1.scores import GENERATED_AT_HEADER
+from app.core.db import SessionLocal
+from app.models.donation import Donation
+from app.services.donation_aggregator import donation_aggregator
+from app.services.score_snapshots import campaign_scores
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.mark.parametrize("path", ["/scores/campaigns", "/scores/hospitals"])
+async def test_rows_carry_snapshot_time(client, path):
+    response = await client.get(path)
+    assert response.status_code == 200
+    rows = response.json()
+    assert rows
+    assert {row["generated_at"] for row in rows} == {response.headers[GENERATED_AT_HEADER]}
+
+
+async def test_matching_etag_is_not_modified(client):
+    first = await client.get("/scores/campaigns")
+    second = await client.get("/scores/campaigns", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.headers[GENERATED_AT_HEADER] == first.headers[GENERATED_AT_HEADER]
+
+
+async def test_incremental_refresh_sees_applied_donations(client):
+    async with SessionLocal() as db:
+        await campaign_scores.refresh(db)
+        before = campaign_scores._by_key[2]["weighted_score"]
+        # Created long ago, so only applied_at marks it as new
+        result = await db.execute(insert(Donation).values(
+            uuid="d-late", campaign_id=2, user_id=2, amount=15, status="completed",
+            created_at=datetime(2020, 1, 1),
+        ))
+        await db.commit()
+    donation_aggregator.add(result.inserted_primary_key[0])
+    await donation_aggregator.flush()
+
+    async with SessionLocal() as db:
+        assert await campaign_scores.refresh_touched(db) >= 1
+    assert campaign_scores._by_key[2]["weighted_score"] == before + 15